@@ -5,10 +5,10 @@ and integrates CORS for cross-origin requests.
 '''
 
 import os
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 
-from models import storage
+from models import storage, storage_t
 from api.v1.views import app_views
 
 # Create a Flask web application instance
@@ -30,6 +30,14 @@ app.register_blueprint(app_views)
 # This allows requests from any origin (specified by '/*') to be accepted.
 CORS(app, resources={'/*': {'origins': app_host}})
 
+@app.before_request
+def use_primary_for_writes():
+    '''Sends the reads of the requests that may write to the primary
+    database, the GET requests reading from the replicas if any.
+    '''
+    if storage_t == 'db' and request.method not in ('GET', 'HEAD'):
+        storage.use_primary()
+
 @app.teardown_appcontext
 def teardown_flask(exception):
     '''Callback function that is called when the Flask application context ends.
@@ -38,7 +46,9 @@ def teardown_flask(exception):
     '''
     # Uncomment the line below to print exception details (if any) during teardown
     # print(exception)
-    storage.close()
+    # a streamed response closes the storage when it is done
+    if not g.get('streaming'):
+        storage.close()
 
 @app.errorhandler(404)
 def error_404(error):
@@ -1,15 +1,115 @@
 #!/usr/bin/python3
 '''Contains the blueprint for the API.'''
-from flask import Blueprint
+from flask import (Blueprint, Response, current_app, g, jsonify, request,
+                   stream_with_context)
+from werkzeug.exceptions import BadRequest, HTTPException
+
+from models import storage
+from models.engine.cascade import CascadeJob
 
 
 app_views = Blueprint('app_views', __name__, url_prefix='/api/v1')
 '''The blueprint for the AirBnB clone API.'''
+SORTS = {'name': 'name', 'price': 'price_by_night', 'created_at': 'created_at'}
+'''The values of the sort parameters and the attributes they sort by.'''
+
+
+def create_many(items, build):
+    '''Creates the objects built from a list of JSON items with a single
+    save and returns the per-item results with the status of the request:
+    201 if every item was created, 207 otherwise.
+    '''
+    objs = []
+    results = []
+    for data in items:
+        try:
+            obj = build(data)
+        except HTTPException as error:
+            msg = 'Not found' if error.code == 404 else error.description
+            results.append({'status': error.code, 'error': msg})
+            continue
+        objs.append(obj)
+        results.append(obj)
+    storage.save_many(objs)
+    for i, res in enumerate(results):
+        if type(res) is not dict:
+            results[i] = {'status': 201, 'object': res.to_dict()}
+    return results, 201 if len(objs) == len(results) else 207
+
+
+def stream_json(objs, to_dict=lambda obj: obj.to_dict(), batch_size=100):
+    '''Returns a response streaming the JSON array of the dictionaries of
+    objs (an iterable such as storage.iter_all()), batch_size objects per
+    chunk, so that the whole array is never held in memory.
+    '''
+    dumps = current_app.json.dumps
+
+    def generate():
+        '''Yields the chunks of the JSON array.'''
+        chunk = []
+        sep = '['
+        for obj in objs:
+            chunk.append(sep + dumps(to_dict(obj)))
+            sep = ','
+            if len(chunk) >= batch_size:
+                yield ''.join(chunk)
+                chunk = []
+        chunk.append('[]' if sep == '[' else ']')
+        yield ''.join(chunk)
+    response = Response(stream_with_context(generate()),
+                        mimetype='application/json')
+    # the storage is closed when the response is closed, even if its body
+    # was never read, instead of at the teardown of the app context, which
+    # comes first; the sub-requests of a batch share its app context,
+    # which reads their streams and closes the storage after them
+    if not g.get('batch'):
+        g.streaming = True
+        response.call_on_close(storage.close)
+    return response
+
+
+def requested_order(sorts, params=None):
+    '''Returns the order requested by the sort and limit parameters of the
+    query string (or of the dictionary params): (attribute, descending,
+    limit), or None without sort. sort is one of sorts (keys of SORTS),
+    prefixed with '-' for the descending order; limit, optional, is the
+    maximum number of objects to return.
+    '''
+    params = request.args if params is None else params
+    sort = params.get('sort')
+    if sort is None:
+        return None
+    descending = type(sort) is str and sort.startswith('-')
+    if descending:
+        sort = sort[1:]
+    if sort not in sorts:
+        raise BadRequest(description='sort must be one of ' +
+                         ', '.join(sorts))
+    limit = params.get('limit')
+    if type(limit) is str and limit.isdigit():
+        limit = int(limit)
+    if limit is not None and (type(limit) is not int or limit < 0):
+        raise BadRequest(description='limit must be a positive integer')
+    return SORTS[sort], descending, limit
+
+
+def cascade_delete(obj):
+    '''Deletes an object with the objects depending on it and returns the
+    response: {} with 200, or with ?background=true the job running the
+    deletion in the background with 202 (see /jobs/<job_id>).
+    '''
+    if request.args.get('background', '').lower() in ('1', 'true'):
+        job = CascadeJob(obj).start()
+        return jsonify(job.to_dict()), 202
+    storage.cascade_delete(obj)
+    return jsonify({}), 200
 
 
 from api.v1.views.amenities import *
+from api.v1.views.batch import *
 from api.v1.views.cities import *
 from api.v1.views.index import *
+from api.v1.views.jobs import *
 from api.v1.views.places_amenities import *
 from api.v1.views.places import *
 from api.v1.views.places_reviews import *
@@ -7,7 +7,7 @@ amenity resources.
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, MethodNotAllowed, BadRequest
 
-from api.v1.views import app_views
+from api.v1.views import app_views, requested_order, stream_json
 from models import storage
 from models.amenity import Amenity
 
@@ -60,14 +60,15 @@ def get_amenities(amenity_id=None):
     Raises:
         NotFound: If the amenity with the specified id is not found.
     '''
-    all_amenities = storage.all(Amenity).values()
     if amenity_id:
-        res = list(filter(lambda x: x.id == amenity_id, all_amenities))
-        if res:
-            return jsonify(res[0].to_dict())
+        amenity = storage.get(Amenity, amenity_id)
+        if amenity:
+            return jsonify(amenity.to_dict())
         raise NotFound()
-    all_amenities = list(map(lambda x: x.to_dict(), all_amenities))
-    return jsonify(all_amenities)
+    order = requested_order(('name', 'created_at'))
+    if order is not None:
+        return stream_json(storage.ordered(Amenity, *order))
+    return stream_json(storage.iter_all(Amenity))
 
 
 def remove_amenity(amenity_id=None):
@@ -82,10 +83,9 @@ def remove_amenity(amenity_id=None):
     Raises:
         NotFound: If the amenity with the specified id is not found.
     '''
-    all_amenities = storage.all(Amenity).values()
-    res = list(filter(lambda x: x.id == amenity_id, all_amenities))
-    if res:
-        storage.delete(res[0])
+    amenity = storage.get(Amenity, amenity_id)
+    if amenity:
+        storage.delete(amenity)
         storage.save()
         return jsonify({}), 200
     raise NotFound()
@@ -127,13 +127,11 @@ def update_amenity(amenity_id=None):
         BadRequest: If the request body is not JSON.
     '''
     xkeys = ('id', 'created_at', 'updated_at')
-    all_amenities = storage.all(Amenity).values()
-    res = list(filter(lambda x: x.id == amenity_id, all_amenities))
-    if res:
+    old_amenity = storage.get(Amenity, amenity_id)
+    if old_amenity:
         data = request.get_json()
         if type(data) is not dict:
             raise BadRequest(description='Not a JSON')
-        old_amenity = res[0]
         for key, value in data.items():
             if key not in xkeys:
                 setattr(old_amenity, key, value)
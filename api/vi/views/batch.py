@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+'''Contains the batch view for the API.'''
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from flask import current_app, g, jsonify, request
+from werkzeug.exceptions import BadRequest
+
+from api.v1.views import app_views
+from models import storage, storage_t
+
+
+MAX_REQUESTS = 100
+'''The maximum number of sub-requests of a batch.'''
+MAX_WORKERS = 8
+'''The number of threads running the GET sub-requests in parallel.'''
+METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+'''The methods of the sub-requests.'''
+
+
+@app_views.route('/batch', methods=['POST'])
+def run_batch():
+    '''Runs a list of sub-requests in this request and returns the list
+    of their responses. The body is either the list of sub-requests or
+    {"requests": [...], "parallel": true}, a sub-request being
+    {"method": "GET", "path": "/api/v1/status", "body": {...}}.
+    With parallel, consecutive GET sub-requests run concurrently.
+    '''
+    data = request.get_json()
+    parallel = False
+    if type(data) is dict:
+        parallel = data.get('parallel') is True
+        data = data.get('requests')
+    if type(data) is not list:
+        raise BadRequest(description='Missing requests')
+    if len(data) > MAX_REQUESTS:
+        raise BadRequest(description='Too many requests')
+    for sub in data:
+        if type(sub) is not dict or type(sub.get('path')) is not str:
+            raise BadRequest(description='Missing path')
+        method = sub.get('method', 'GET')
+        if type(method) is not str or method.upper() not in METHODS:
+            raise BadRequest(description='Invalid method')
+    # the streamed sub-responses are read by dispatch() (see stream_json)
+    g.batch = True
+    results = []
+    i = 0
+    while i < len(data):
+        j = i + 1
+        if parallel and is_get(data[i]):
+            while j < len(data) and is_get(data[j]):
+                j += 1
+        if j - i > 1:
+            results.extend(dispatch_parallel(data[i:j]))
+        else:
+            results.append(dispatch(data[i]))
+        i = j
+    return jsonify(results)
+
+
+def is_get(sub):
+    '''Tells if a sub-request is a GET.
+    '''
+    return sub.get('method', 'GET').upper() == 'GET'
+
+
+def dispatch(sub):
+    '''Runs a sub-request through the API handlers and returns its
+    status and JSON body. The sub-request shares the application context
+    of the batch, so the storage is closed once, after the batch; a
+    streamed body is read to its end here.
+    '''
+    prefix = app_views.url_prefix
+    path = sub['path']
+    if not path.startswith(prefix + '/'):
+        path = prefix + '/' + path.lstrip('/')
+    if path.split('?')[0].rstrip('/') == prefix + '/batch':
+        return {'status': 400, 'body': {'error': 'Nested batch'}}
+    kwargs = {'method': sub.get('method', 'GET').upper()}
+    if 'body' in sub:
+        kwargs['json'] = sub['body']
+    with current_app.test_request_context(path, **kwargs):
+        try:
+            response = current_app.full_dispatch_request()
+        except Exception:
+            current_app.logger.exception('batch sub-request failed')
+            # drops the changes of the failed sub-request
+            storage.close()
+            return {'status': 500, 'body': {'error': 'Internal error'}}
+        try:
+            return {'status': response.status_code,
+                    'body': response.get_json()}
+        finally:
+            # a streamed body has been read: ends its generator
+            response.close()
+
+
+def dispatch_parallel(subs):
+    '''Runs GET sub-requests concurrently, in the context of the batch.
+    '''
+    # the sessions of the workers read the earlier writes of the batch
+    # from the primary too
+    primary = storage_t == 'db' and storage.uses_primary()
+
+    def run(sub):
+        '''Runs a sub-request in a worker thread.
+        '''
+        try:
+            if primary:
+                storage.use_primary()
+            return dispatch(sub)
+        finally:
+            if storage_t == 'db':
+                # releases the session of the worker thread
+                storage.close()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, run, sub)
+                   for sub in subs]
+        return [future.result() for future in futures]
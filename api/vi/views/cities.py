@@ -3,11 +3,10 @@
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, MethodNotAllowed, BadRequest
 
-from api.v1.views import app_views
-from models import storage, storage_t
+from api.v1.views import (app_views, cascade_delete, create_many,
+                          requested_order)
+from models import storage
 from models.city import City
-from models.place import Place
-from models.review import Review
 from models.state import State
 
 
@@ -30,12 +29,19 @@ def handle_cities(state_id=None, city_id=None):
 
 def get_cities(state_id=None, city_id=None):
     '''Gets the city with the given id or all cities in
-    the state with the given id.
+    the state with the given id, sorted by the sort parameter (name or
+    created_at) if given.
     '''
     if state_id:
         state = storage.get(State, state_id)
         if state:
-            cities = list(map(lambda x: x.to_dict(), state.cities))
+            order = requested_order(('name', 'created_at'))
+            if order is not None:
+                cities = storage.ordered(City, *order,
+                                         related=('state_id', state_id))
+            else:
+                cities = state.cities
+            cities = list(map(lambda x: x.to_dict(), cities))
             return jsonify(cities)
     elif city_id:
         city = storage.get(City, city_id)
@@ -45,39 +51,40 @@ def get_cities(state_id=None, city_id=None):
 
 
 def remove_city(state_id=None, city_id=None):
-    '''Removes a city with the given id.
+    '''Removes a city with the given id with its places and their reviews.
     '''
     if city_id:
         city = storage.get(City, city_id)
         if city:
-            storage.delete(city)
-            if storage_t != "db":
-                for place in storage.all(Place).values():
-                    if place.city_id == city_id:
-                        for review in storage.all(Review).values():
-                            if review.place_id == place.id:
-                                storage.delete(review)
-                        storage.delete(place)
-            storage.save()
-            return jsonify({}), 200
+            return cascade_delete(city)
     raise NotFound()
 
 
 def add_city(state_id=None, city_id=None):
-    '''Adds a new city.
+    '''Adds a new city, or a list of cities.
     '''
     state = storage.get(State, state_id)
     if not state:
         raise NotFound()
     data = request.get_json()
+    if type(data) is list:
+        results, status = create_many(
+            data, lambda item: new_city(state_id, item))
+        return jsonify(results), status
+    city = new_city(state_id, data)
+    city.save()
+    return jsonify(city.to_dict()), 201
+
+
+def new_city(state_id, data):
+    '''Builds a city of the state with the given id from a JSON object.
+    '''
     if type(data) is not dict:
         raise BadRequest(description='Not a JSON')
     if 'name' not in data:
         raise BadRequest(description='Missing name')
     data['state_id'] = state_id
-    city = City(**data)
-    city.save()
-    return jsonify(city.to_dict()), 201
+    return City(**data)
 
 
 def update_city(state_id=None, city_id=None):
@@ -3,7 +3,7 @@
 from flask import jsonify
 
 from api.v1.views import app_views
-from models import storage
+from models import storage, storage_t
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
@@ -11,6 +11,16 @@ from models.review import Review
 from models.state import State
 from models.user import User
 
+# the classes counted by the stats, by name in the response
+STATS = {
+    'amenities': Amenity,
+    'cities': City,
+    'places': Place,
+    'reviews': Review,
+    'states': State,
+    'users': User
+}
+
 
 @app_views.route('/status')
 def get_status():
@@ -21,17 +31,41 @@ def get_status():
 
 @app_views.route('/stats')
 def get_stats():
-    '''Gets the number of objects for each type.
+    '''Gets the number of objects for each type, counted by the database
+    (the aggregates of DBStorage are only recomputed from time to time) or
+    read from the aggregates of FileStorage.
     '''
-    objects = {
-        'amenities': Amenity,
-        'cities': City,
-        'places': Place,
-        'reviews': Review,
-        'states': State,
-        'users': User
-    }
-    for key, value in objects.items():
-        objects[key] = storage.count(value)
+    objects = {}
+    if storage_t == 'db':
+        for key, value in STATS.items():
+            objects[key] = storage.count(value)
+        return jsonify(objects)
+    aggregates = storage.aggregates()
+    for key, value in STATS.items():
+        objects[key] = aggregates.count(value.__name__)
     return jsonify(objects)
 
+
+@app_views.route('/stats/extended')
+def get_extended_stats():
+    '''Gets the number of objects for each type, the number of cities of
+    each state, places of each city and reviews of each place, and the
+    average price by night of the places of each city.
+    '''
+    aggregates = storage.aggregates().to_dict()
+    counts = aggregates.pop('counts')
+    aggregates['counts'] = {key: counts.get(value.__name__, 0)
+                            for key, value in STATS.items()}
+    return jsonify(aggregates)
+
+
+@app_views.route('/stats/cache')
+def get_cache_stats():
+    '''Gets the metrics of the object cache of the storage.
+    '''
+    stats = storage.cache_stats() if storage_t == 'db' else None
+    if stats is None:
+        return jsonify(enabled=False)
+    stats['enabled'] = True
+    return jsonify(stats)
+
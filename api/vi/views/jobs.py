@@ -0,0 +1,17 @@
+#!/usr/bin/python3
+'''Contains the jobs view for the API.'''
+from flask import jsonify
+from werkzeug.exceptions import NotFound
+
+from api.v1.views import app_views
+from models.engine.cascade import CascadeJob
+
+
+@app_views.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    '''Gets the progress of the background job with the given id.
+    '''
+    job = CascadeJob.jobs.get(job_id)
+    if job is None:
+        raise NotFound()
+    return jsonify(job.to_dict())
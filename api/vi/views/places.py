@@ -1,17 +1,26 @@
 #!/usr/bin/python3
 '''Contains the places view for the API.'''
+import itertools
+
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, MethodNotAllowed, BadRequest
 
-from api.v1.views import app_views
+from api.v1.views import (app_views, cascade_delete, requested_order,
+                          stream_json)
 from models import storage, storage_t
 from models.amenity import Amenity
 from models.city import City
+from models.engine.indexes import RANGES, within_bounds
+from models.engine.ordering import order
 from models.place import Place
 from models.state import State
 from models.user import User
 
 
+PLACE_SORTS = ('name', 'price', 'created_at')
+'''The sort parameters of the places.'''
+
+
 @app_views.route('/cities/<city_id>/places', methods=['GET', 'POST'])
 @app_views.route('/places/<place_id>', methods=['GET', 'DELETE', 'PUT'])
 def handle_places(city_id=None, place_id=None):
@@ -31,21 +40,19 @@ def handle_places(city_id=None, place_id=None):
 
 def get_places(city_id=None, place_id=None):
     '''Gets the place with the given id or all places in
-    the city with the given id.
+    the city with the given id, sorted by the sort parameter (name, price
+    or created_at) if given.
     '''
     if city_id:
         city = storage.get(City, city_id)
         if city:
-            all_places = []
-            if storage_t == 'db':
-                all_places = list(city.places)
+            order = requested_order(PLACE_SORTS)
+            if order is not None:
+                places = storage.ordered(Place, *order,
+                                         related=('city_id', city_id))
             else:
-                all_places = list(filter(
-                    lambda x: x.city_id == city_id,
-                    storage.all(Place).values()
-                ))
-            places = list(map(lambda x: x.to_dict(), all_places))
-            return jsonify(places)
+                places = storage.related(Place, 'city_id', city_id)
+            return jsonify(list(map(lambda x: x.to_dict(), places)))
     elif place_id:
         place = storage.get(Place, place_id)
         if place:
@@ -54,14 +61,12 @@ def get_places(city_id=None, place_id=None):
 
 
 def remove_place(city_id=None, place_id=None):
-    '''Removes a place with the given id.
+    '''Removes a place with the given id with its reviews.
     '''
     if place_id:
         place = storage.get(Place, place_id)
         if place:
-            storage.delete(place)
-            storage.save()
-            return jsonify({}), 200
+            return cascade_delete(place)
     raise NotFound()
 
 
@@ -106,14 +111,13 @@ def update_place(city_id=None, place_id=None):
 
 @app_views.route('/places_search', methods=['POST'])
 def find_places():
-    '''Finds places based on a list of State, City, or Amenity ids.
+    '''Finds places based on a list of State, City, or Amenity ids,
+    on a text query (q) matching their name, description or reviews,
+    and on their location (a box, bbox, or a circle, near).
     '''
     data = request.get_json()
     if type(data) is not dict:
         raise BadRequest(description='Not a JSON')
-    all_places = storage.all(Place).values()
-    places = []
-    places_id = []
     keys_status = (
         all([
             'states' in data and type(data['states']) is list,
@@ -128,73 +132,261 @@ def find_places():
             'amenities' in data and len(data['amenities'])
         ])
     )
+    bounds = requested_bounds(data)
+    area = requested_area(data, keys_status, bounds)
+    ordering = requested_order(PLACE_SORTS, data)
+    if 'q' in data:
+        return search_places(data, keys_status, area, bounds, ordering)
+    if area is not None or bounds:
+        # the places of the area (in the ranges), or of the ranges,
+        # filtered by the rest
+        if area is not None:
+            places = [place for place, distance in area.values()]
+        else:
+            places = storage.range_query(Place, bounds)
+        if keys_status[0] or keys_status[1]:
+            city_ids = {city.id
+                        for city in requested_cities(data, keys_status)}
+            places = [place for place in places if place.city_id in city_ids]
+    elif keys_status[0] or keys_status[1]:
+        places = []
+        places_id = set()
+        for city in requested_cities(data, keys_status):
+            for place in storage.related(Place, 'city_id', city.id):
+                if place.id not in places_id:
+                    places_id.add(place.id)
+                    places.append(place)
+    elif ordering is not None and not keys_status[2]:
+        # sorted (and limited) by the storage
+        places = storage.ordered(Place, *ordering)
+        ordering = None
+    else:
+        places = storage.iter_all(Place)
+        if keys_status[2] and storage_t == 'db':
+            # the lazy loads of place.amenities cannot run on the
+            # connection of a streamed query
+            places = list(places)
+    if keys_status[2]:
+        amenity_ids = requested_amenity_ids(data)
+        if amenity_ids:
+            places = filter(
+                lambda x: all(amenity_id in place_amenity_ids(x)
+                              for amenity_id in amenity_ids), places)
+    if 'near' in data and data['near'].get('k') is not None:
+        places = itertools.islice(places, data['near']['k'])
+    if ordering is not None:
+        places = order(places, *ordering)
+    if 'near' not in data:
+        return stream_json(places, place_to_dict)
+
+    def to_dict(place):
+        '''Returns the dictionary of a place with its distance.
+        '''
+        obj = place_to_dict(place)
+        obj['distance'] = area[place.id][1]
+        return obj
+    return stream_json(places, to_dict)
+
+
+def search_places(data, keys_status, area=None, bounds=None, ordering=None):
+    '''Returns a page of the places matching the text query data['q'] and
+    the filters of places_search (area, bounds and ordering are the results
+    of requested_area, requested_bounds and requested_order), the best
+    first unless ordering is given, with their score (and distance, with
+    near).
+    The page starts at data['offset'] (default 0) and holds at most
+    data['limit'] places (default 20); the number of places matching is
+    in the X-Total-Count header.
+    '''
+    query = data['q']
+    limit = data.get('limit', 20)
+    offset = data.get('offset', 0)
+    if type(query) is not str:
+        raise BadRequest(description='q must be a string')
+    for value in (limit, offset):
+        if type(value) is not int or value < 0:
+            raise BadRequest(
+                description='limit and offset must be positive integers')
+    city_ids = None
+    if keys_status[0] or keys_status[1]:
+        city_ids = {city.id for city in requested_cities(data, keys_status)}
+    amenity_ids = requested_amenity_ids(data) if keys_status[2] else []
+    filtered = (city_ids is not None or amenity_ids or area is not None or
+                bounds or ordering is not None)
+    matches = []
+    total = 0
+    for place_id, score in storage.search(query):
+        if not filtered:
+            if offset <= total < offset + limit:
+                matches.append((storage.get(Place, place_id), score))
+            total += 1
+            continue
+        if area is not None and place_id not in area:
+            continue
+        place = storage.get(Place, place_id)
+        if place is None:
+            continue
+        if city_ids is not None and place.city_id not in city_ids:
+            continue
+        if area is None and bounds and not within_bounds(place, bounds):
+            continue
+        if amenity_ids and not all(amenity_id in place_amenity_ids(place)
+                                   for amenity_id in amenity_ids):
+            continue
+        matches.append((place, score))
+    if filtered:
+        k = data['near'].get('k') if 'near' in data else None
+        if k is not None:
+            # the k nearest matches, still ranked by score
+            nearest = sorted(matches, key=lambda m: area[m[0].id][1])[:k]
+            nearest = {place.id for place, score in nearest}
+            matches = [m for m in matches if m[0].id in nearest]
+        if ordering is not None:
+            scores = {place.id: score for place, score in matches}
+            matches = [(place, scores[place.id]) for place in
+                       order([place for place, score in matches],
+                             *ordering[:2])]
+        total = len(matches)
+        matches = matches[offset:offset + limit]
+    results = []
+    for place, score in matches:
+        if place is None:
+            continue
+        obj = place_to_dict(place)
+        obj['score'] = score
+        if 'near' in data:
+            obj['distance'] = area[place.id][1]
+        results.append(obj)
+    response = jsonify(results)
+    response.headers['X-Total-Count'] = str(total)
+    return response
+
+
+def requested_area(data, keys_status, bounds):
+    '''Returns the places in the box data['bbox'], [south, west, north,
+    east] (crossing the antimeridian if west > east), and in the circle
+    data['near'], {"latitude", "longitude", "radius" (in kilometers),
+    "k" (optional, at most the k nearest places)}, of a places_search
+    request: a dictionary mapping their ids to (place, distance in
+    kilometers or None without near), the nearest first, or None if the
+    request has neither.
+    The places are only those in bounds, the ranges of requested_bounds,
+    and k applies after them.
+    '''
+    bbox = data.get('bbox')
+    near = data.get('near')
+    if bbox is None and near is None:
+        return None
+    area = None
+    if near is not None:
+        if type(near) is not dict:
+            raise BadRequest(description='near must be an object')
+        latitude = near.get('latitude')
+        longitude = near.get('longitude')
+        radius = near.get('radius')
+        k = near.get('k')
+        if not (is_number(latitude) and -90 <= latitude <= 90 and
+                is_number(longitude) and -180 <= longitude <= 180):
+            raise BadRequest(description='Invalid near coordinates')
+        if not is_number(radius) or radius <= 0:
+            raise BadRequest(description='Invalid near radius')
+        if k is not None and (type(k) is not int or k <= 0):
+            raise BadRequest(description='Invalid near k')
+        # k applies after the other filters, if any (the ranges are
+        # applied by nearest())
+        alone = bbox is None and 'q' not in data and not any(keys_status)
+        area = {place.id: (place, distance)
+                for place, distance in storage.nearest(
+                    latitude, longitude, radius, k if alone else None,
+                    bounds)}
+    if bbox is not None:
+        if (type(bbox) is not list or len(bbox) != 4 or
+                not all(is_number(value) for value in bbox) or
+                not -90 <= bbox[0] <= bbox[2] <= 90 or
+                not all(-180 <= value <= 180 for value in bbox[1::2])):
+            raise BadRequest(description='Invalid bbox')
+        places = storage.within(*bbox, bounds=bounds)
+        if area is None:
+            area = {place.id: (place, None) for place in places}
+        else:
+            ids = {place.id for place in places}
+            area = {place_id: value for place_id, value in area.items()
+                    if place_id in ids}
+    return area
+
+
+def requested_bounds(data):
+    '''Returns the ranges of the numeric attributes of the places in RANGES
+    requested by a places_search request, each as {"min": x, "max": y}
+    (inclusive, both optional): a dictionary mapping the attributes to
+    (min, max), None for no bound.
+    '''
+    bounds = {}
+    for cls, attr in RANGES:
+        if cls != 'Place' or attr not in data:
+            continue
+        value = data[attr]
+        if type(value) is not dict or not set(value) <= {'min', 'max'}:
+            raise BadRequest(description='Invalid range of ' + attr)
+        low = value.get('min')
+        high = value.get('max')
+        if not all(bound is None or is_number(bound)
+                   for bound in (low, high)):
+            raise BadRequest(description='Invalid range of ' + attr)
+        if low is not None and high is not None and low > high:
+            raise BadRequest(description='Invalid range of ' + attr)
+        bounds[attr] = (low, high)
+    return bounds
+
+
+def is_number(value):
+    '''Tells if a JSON value is a number.
+    '''
+    return type(value) in (int, float)
+
+
+def requested_cities(data, keys_status):
+    '''Returns the cities of the states and the cities of a
+    places_search request.
+    '''
+    cities = []
     if keys_status[0]:
         for state_id in data['states']:
-            if not state_id:
-                continue
-            state = storage.get(State, state_id)
-            if not state:
-                continue
-            for city in state.cities:
-                new_places = []
-                if storage_t == 'db':
-                    new_places = list(
-                        filter(lambda x: x.id not in places_id, city.places)
-                    )
-                else:
-                    new_places = []
-                    for place in all_places:
-                        if place.id in places_id:
-                            continue
-                        if place.city_id == city.id:
-                            new_places.append(place)
-                places.extend(new_places)
-                places_id.extend(list(map(lambda x: x.id, new_places)))
+            state = storage.get(State, state_id) if state_id else None
+            if state:
+                cities.extend(state.cities)
     if keys_status[1]:
         for city_id in data['cities']:
-            if not city_id:
-                continue
-            city = storage.get(City, city_id)
+            city = storage.get(City, city_id) if city_id else None
             if city:
-                new_places = []
-                if storage_t == 'db':
-                    new_places = list(
-                        filter(lambda x: x.id not in places_id, city.places)
-                    )
-                else:
-                    new_places = []
-                    for place in all_places:
-                        if place.id in places_id:
-                            continue
-                        if place.city_id == city.id:
-                            new_places.append(place)
-                places.extend(new_places)
-    del places_id
-    if all([not keys_status[0], not keys_status[1]]) or not data:
-        places = all_places
-    if keys_status[2]:
-        amenity_ids = []
-        for amenity_id in data['amenities']:
-            if not amenity_id:
-                continue
-            amenity = storage.get(Amenity, amenity_id)
-            if amenity and amenity.id not in amenity_ids:
-                amenity_ids.append(amenity.id)
-        del_indices = []
-        for place in places:
-            place_amenities_ids = list(map(lambda x: x.id, place.amenities))
-            if not amenity_ids:
-                continue
-            for amenity_id in amenity_ids:
-                if amenity_id not in place_amenities_ids:
-                    del_indices.append(place.id)
-                    break
-        places = list(filter(lambda x: x.id not in del_indices, places))
-    result = []
-    for place in places:
-        obj = place.to_dict()
-        if 'amenities' in obj:
-            del obj['amenities']
-        result.append(obj)
-    return jsonify(result)
+                cities.append(city)
+    return cities
+
 
+def requested_amenity_ids(data):
+    '''Returns the ids of the existing amenities of a places_search
+    request.
+    '''
+    amenity_ids = []
+    for amenity_id in data['amenities']:
+        if not amenity_id:
+            continue
+        amenity = storage.get(Amenity, amenity_id)
+        if amenity and amenity.id not in amenity_ids:
+            amenity_ids.append(amenity.id)
+    return amenity_ids
+
+
+def place_amenity_ids(place):
+    '''Returns the ids of the amenities of a place.
+    '''
+    return set(map(lambda x: x.id, place.amenities))
+
+
+def place_to_dict(place):
+    '''Returns the dictionary of a place without its amenities.
+    '''
+    obj = place.to_dict()
+    if 'amenities' in obj:
+        del obj['amenities']
+    return obj
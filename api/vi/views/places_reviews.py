@@ -3,7 +3,7 @@
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, MethodNotAllowed, BadRequest
 
-from api.v1.views import app_views
+from api.v1.views import app_views, create_many, requested_order
 from models import storage
 from models.place import Place
 from models.review import Review
@@ -29,15 +29,19 @@ def handle_reviews(place_id=None, review_id=None):
 
 def get_reviews(place_id=None, review_id=None):
     '''Gets the review with the given id or all reviews in
-    the place with the given id.
+    the place with the given id, sorted by the sort parameter (created_at)
+    if given.
     '''
     if place_id:
         place = storage.get(Place, place_id)
         if place:
-            reviews = []
-            for review in place.reviews:
-                reviews.append(review.to_dict())
-            return jsonify(reviews)
+            order = requested_order(('created_at',))
+            if order is not None:
+                reviews = storage.ordered(Review, *order,
+                                          related=('place_id', place_id))
+            else:
+                reviews = place.reviews
+            return jsonify([review.to_dict() for review in reviews])
     elif review_id:
         review = storage.get(Review, review_id)
         if review:
@@ -57,12 +61,24 @@ def remove_review(place_id=None, review_id=None):
 
 
 def add_review(place_id=None, review_id=None):
-    '''Adds a new review.
+    '''Adds a new review, or a list of reviews.
     '''
     place = storage.get(Place, place_id)
     if not place:
         raise NotFound()
     data = request.get_json()
+    if type(data) is list:
+        results, status = create_many(
+            data, lambda item: new_review(place_id, item))
+        return jsonify(results), status
+    review = new_review(place_id, data)
+    review.save()
+    return jsonify(review.to_dict()), 201
+
+
+def new_review(place_id, data):
+    '''Builds a review of the place with the given id from a JSON object.
+    '''
     if type(data) is not dict:
         raise BadRequest(description='Not a JSON')
     if 'user_id' not in data:
@@ -73,9 +89,7 @@ def add_review(place_id=None, review_id=None):
     if 'text' not in data:
         raise BadRequest(description='Missing text')
     data['place_id'] = place_id
-    new_review = Review(**data)
-    new_review.save()
-    return jsonify(new_review.to_dict()), 201
+    return Review(**data)
 
 
 def update_review(place_id=None, review_id=None):
@@ -3,7 +3,8 @@
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, MethodNotAllowed, BadRequest
 
-from api.v1.views import app_views
+from api.v1.views import (app_views, cascade_delete, requested_order,
+                          stream_json)
 from models import storage
 from models.state import State
 
@@ -30,27 +31,26 @@ def handle_states(state_id=None):
 
 
 def get_states(state_id=None):
-    '''Gets the state with the given id or all states.
+    '''Gets the state with the given id or all states, sorted by the
+    sort parameter (name or created_at) if given.
     '''
-    all_states = storage.all(State).values()
     if state_id:
-        res = list(filter(lambda x: x.id == state_id, all_states))
-        if res:
-            return jsonify(res[0].to_dict())
+        state = storage.get(State, state_id)
+        if state:
+            return jsonify(state.to_dict())
         raise NotFound()
-    all_states = list(map(lambda x: x.to_dict(), all_states))
-    return jsonify(all_states)
+    order = requested_order(('name', 'created_at'))
+    if order is not None:
+        return stream_json(storage.ordered(State, *order))
+    return stream_json(storage.iter_all(State))
 
 
 def remove_state(state_id=None):
-    '''Removes a state with the given id.
+    '''Removes a state with the given id with its cities.
     '''
-    all_states = storage.all(State).values()
-    res = list(filter(lambda x: x.id == state_id, all_states))
-    if res:
-        storage.delete(res[0])
-        storage.save()
-        return jsonify({}), 200
+    state = storage.get(State, state_id)
+    if state:
+        return cascade_delete(state)
     raise NotFound()
 
 
@@ -71,13 +71,11 @@ def update_state(state_id=None):
     '''Updates the state with the given id.
     '''
     xkeys = ('id', 'created_at', 'updated_at')
-    all_states = storage.all(State).values()
-    res = list(filter(lambda x: x.id == state_id, all_states))
-    if res:
+    old_state = storage.get(State, state_id)
+    if old_state:
         data = request.get_json()
         if type(data) is not dict:
             raise BadRequest(description='Not a JSON')
-        old_state = res[0]
         for key, value in data.items():
             if key not in xkeys:
                 setattr(old_state, key, value)
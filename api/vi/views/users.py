@@ -3,7 +3,8 @@
 from flask import jsonify, request
 from werkzeug.exceptions import NotFound, BadRequest
 
-from api.v1.views import app_views
+from api.v1.views import (app_views, cascade_delete, requested_order,
+                          stream_json)
 from models import storage
 from models.user import User
 
@@ -11,7 +12,8 @@ from models.user import User
 @app_views.route('/users', methods=['GET'])
 @app_views.route('/users/<user_id>', methods=['GET'])
 def get_users(user_id=None):
-    '''Gets the user with the given id or all users.
+    '''Gets the user with the given id or all users, sorted by the sort
+    parameter (created_at) if given.
     '''
     if user_id:
         user = storage.get(User, user_id)
@@ -23,27 +25,30 @@ def get_users(user_id=None):
                 del obj['reviews']
             return jsonify(obj)
         raise NotFound()
-    all_users = storage.all(User).values()
-    users = []
-    for user in all_users:
-        obj = user.to_dict()
-        if 'places' in obj:
-            del obj['places']
-        if 'reviews' in obj:
-            del obj['reviews']
-        users.append(obj)
-    return jsonify(users)
+    order = requested_order(('created_at',))
+    if order is not None:
+        return stream_json(storage.ordered(User, *order), user_to_dict)
+    return stream_json(storage.iter_all(User), user_to_dict)
+
+
+def user_to_dict(user):
+    '''Returns the dictionary of a user without its relationships.
+    '''
+    obj = user.to_dict()
+    if 'places' in obj:
+        del obj['places']
+    if 'reviews' in obj:
+        del obj['reviews']
+    return obj
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'])
 def remove_user(user_id):
-    '''Removes a user with the given id.
+    '''Removes a user with the given id with their places and reviews.
     '''
     user = storage.get(User, user_id)
     if user:
-        storage.delete(user)
-        storage.save()
-        return jsonify({}), 200
+        return cascade_delete(user)
     raise NotFound()
 
 
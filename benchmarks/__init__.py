@@ -0,0 +1 @@
+"""Benchmarks of the storage engines and of the API"""
@@ -0,0 +1,264 @@
+#!/usr/bin/python3
+"""
+Load test of the api/v1 endpoints with concurrent clients
+
+usage: python3 -m benchmarks.api_load [-s SIZE] [-c CLIENTS] [-n REQUESTS]
+                                      [--http] [-e ENGINE ...] [-o FILE]
+
+A dataset of SIZE objects is loaded in every engine, then CLIENTS threads
+send REQUESTS requests drawn from a mix of stats, places_search, list
+endpoints and writes, either through the Flask test client (in-process)
+or, with --http, to a server on localhost. Throughput and p50/p95/p99
+latencies are reported per endpoint and per engine.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from benchmarks.dataset import Fanout, load
+from benchmarks.runner import (ENGINES, run_engines, child_storage,
+                               git_revision)
+
+
+class Mix:
+    """draws the requests of the workload: (label, method, path, body)"""
+
+    def __init__(self, storage, seed):
+        """picks the ids used by the requests in storage"""
+        from models.amenity import Amenity
+        from models.city import City
+        from models.place import Place
+        from models.state import State
+        from models.user import User
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.ids = {}
+        for cls in (Amenity, City, Place, State, User):
+            ids = sorted(obj.id for obj in storage.all(cls).values())
+            self.ids[cls.__name__] = ids
+        self.weights = (
+            (10, self.stats), (25, self.search), (10, self.list_states),
+            (5, self.list_amenities), (15, self.city_places),
+            (15, self.get_place), (10, self.place_reviews),
+            (10, self.write))
+
+    def pick(self, name):
+        """returns a random id of a class"""
+        return self.rng.choice(self.ids[name])
+
+    def next(self):
+        """returns the next request of the mix"""
+        with self.lock:
+            total = sum(weight for weight, make in self.weights)
+            draw = self.rng.uniform(0, total)
+            for weight, make in self.weights:
+                draw -= weight
+                if draw <= 0:
+                    return make()
+            return self.weights[-1][1]()
+
+    def stats(self):
+        """GET /stats"""
+        return "GET /stats", "GET", "/api/v1/stats", None
+
+    def search(self):
+        """POST /places_search with one of the filters"""
+        filters = self.rng.choice(("none", "states", "cities", "amenities"))
+        body = {}
+        if filters == "states":
+            body["states"] = [self.pick("State")]
+        elif filters == "cities":
+            body["cities"] = [self.pick("City") for i in range(3)]
+        elif filters == "amenities":
+            body["amenities"] = [self.pick("Amenity")]
+        return ("POST /places_search " + filters, "POST",
+                "/api/v1/places_search", body)
+
+    def list_states(self):
+        """GET /states"""
+        return "GET /states", "GET", "/api/v1/states", None
+
+    def list_amenities(self):
+        """GET /amenities"""
+        return "GET /amenities", "GET", "/api/v1/amenities", None
+
+    def city_places(self):
+        """GET /cities/<id>/places"""
+        return ("GET /cities/<id>/places", "GET",
+                "/api/v1/cities/{}/places".format(self.pick("City")), None)
+
+    def get_place(self):
+        """GET /places/<id>"""
+        return ("GET /places/<id>", "GET",
+                "/api/v1/places/{}".format(self.pick("Place")), None)
+
+    def place_reviews(self):
+        """GET /places/<id>/reviews"""
+        return ("GET /places/<id>/reviews", "GET",
+                "/api/v1/places/{}/reviews".format(self.pick("Place")), None)
+
+    def write(self):
+        """POST a review or PUT a place"""
+        if self.rng.random() < 0.5:
+            return ("POST /places/<id>/reviews", "POST",
+                    "/api/v1/places/{}/reviews".format(self.pick("Place")),
+                    {"user_id": self.pick("User"), "text": "load test"})
+        return ("PUT /places/<id>", "PUT",
+                "/api/v1/places/{}".format(self.pick("Place")),
+                {"price_by_night": self.rng.randint(20, 500)})
+
+
+def test_client_sender(app):
+    """returns a function sending a request through the Flask test client
+    of the calling thread"""
+    local = threading.local()
+
+    def send(method, path, body):
+        """sends a request, returns its status"""
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        return local.client.open(path, method=method, json=body).status_code
+    return send
+
+
+def http_sender(port):
+    """returns a function sending a request to localhost:port"""
+    def send(method, path, body):
+        """sends a request, returns its status"""
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        headers = {}
+        data = None
+        if body is not None:
+            data = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            conn.request(method, path, data, headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+    return send
+
+
+def percentile(values, p):
+    """returns the p-th percentile of sorted values"""
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def summarize(samples, elapsed):
+    """returns the statistics of (label, seconds, status) samples"""
+    by_label = {}
+    for label, seconds, status in samples:
+        by_label.setdefault(label, []).append((seconds, status))
+    endpoints = {}
+    for label, values in sorted(by_label.items()):
+        latencies = sorted(seconds for seconds, status in values)
+        endpoints[label] = {
+            "requests": len(values),
+            "errors": sum(1 for seconds, status in values if status >= 500),
+            "throughput": len(values) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+    latencies = sorted(seconds for label, seconds, status in samples)
+    return {"requests": len(samples), "seconds": elapsed,
+            "throughput": len(samples) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "endpoints": endpoints}
+
+
+def run(workdir, size, seed, clients, requests, over_http):
+    """loads the dataset and runs the load test, returns the statistics"""
+    storage = child_storage(workdir)
+    load(storage, Fanout.for_size(size), seed)
+    storage.close()
+    from api.v1.app import app
+    mix = Mix(storage, seed)
+    storage.close()
+    server = None
+    if over_http:
+        from werkzeug.serving import make_server
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        send = http_sender(server.port)
+    else:
+        send = test_client_sender(app)
+    samples = []
+    lock = threading.Lock()
+
+    def client(n):
+        """sends n requests of the mix"""
+        mine = []
+        for i in range(n):
+            label, method, path, body = mix.next()
+            start = time.perf_counter()
+            status = send(method, path, body)
+            mine.append((label, time.perf_counter() - start, status))
+        with lock:
+            samples.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(requests // clients,))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+    return summarize(samples, elapsed)
+
+
+def main():
+    """parses the command line and runs or spawns the load test"""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("-s", "--size", type=int, default=10000)
+    parser.add_argument("-c", "--clients", type=int, default=8)
+    parser.add_argument("-n", "--requests", type=int, default=2000)
+    parser.add_argument("--http", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-e", "--engine", action="append", choices=ENGINES)
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--child")
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(run(args.workdir, args.size, args.seed,
+                             args.clients, args.requests, args.http)))
+        return
+    child_args = ["-s", str(args.size), "-c", str(args.clients),
+                  "-n", str(args.requests), "--seed", str(args.seed)]
+    if args.http:
+        child_args.append("--http")
+    output = {"revision": git_revision(), "size": args.size,
+              "clients": args.clients, "http": args.http,
+              "results": run_engines("benchmarks.api_load", child_args,
+                                     args.engine or ENGINES)}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    for engine, stats in output["results"].items():
+        print("{}: {:.0f} req/s, p50 {:.1f}ms, p95 {:.1f}ms, "
+              "p99 {:.1f}ms".format(engine, stats["throughput"],
+                                    stats["p50_ms"], stats["p95_ms"],
+                                    stats["p99_ms"]))
+        for label, ep in stats["endpoints"].items():
+            print("  {:32} {:6d} {:8.1f}/s {:8.1f} {:8.1f} {:8.1f}ms "
+                  "{:d} errors".format(label, ep["requests"],
+                                       ep["throughput"], ep["p50_ms"],
+                                       ep["p95_ms"], ep["p99_ms"],
+                                       ep["errors"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Compares the ways FileStorage can evaluate the numeric filters of
+places_search on many places: a loop over the objects, the RangeIndex of
+the most selective attribute, and a scan of the PlaceColumns (with numpy
+when it is installed, with array alone otherwise)
+
+usage: python3 -m benchmarks.columns [-n PLACES] [-r REPEAT]
+"""
+
+import argparse
+import json
+import random
+from benchmarks.runner import timed
+
+# name -> bounds, from broad to selective
+FILTERS = {
+    "price": {"price_by_night": (50, 250)},
+    "price_guests": {"price_by_night": (50, 250), "max_guest": (2, 6)},
+    "price_guests_rooms_geo": {"price_by_night": (50, 250),
+                               "max_guest": (2, 6), "number_rooms": (1, 3),
+                               "latitude": (20, 60), "longitude": (-20, 40)},
+    "selective": {"price_by_night": (100, 101), "number_bathrooms": (2, 3)},
+}
+
+
+def places(n, rng):
+    """returns n places with random numeric attributes"""
+    from models.place import Place
+    return {"Place.{}".format(i): Place(
+        id=str(i), price_by_night=rng.randint(10, 500),
+        max_guest=rng.randint(1, 12), number_rooms=rng.randint(0, 6),
+        number_bathrooms=rng.randint(0, 4),
+        latitude=rng.uniform(-90, 90), longitude=rng.uniform(-180, 180))
+        for i in range(n)}
+
+
+def best(func, repeat):
+    """returns the fastest of repeat calls of func, in milliseconds, and
+    the number of places it found"""
+    results = [timed(func) for i in range(repeat)]
+    return (1000 * min(seconds for seconds, found in results),
+            len(results[0][1]))
+
+
+def scan(columns, bounds, objs):
+    """returns a function selecting the places in bounds with columns"""
+    def select():
+        """scans the columns"""
+        return [objs[key] for key in columns.select(bounds)]
+    return select
+
+
+def workload(n, repeat):
+    """times every filter of FILTERS on n places with every path"""
+    from models.engine.columns import PlaceColumns
+    from models.engine.indexes import RANGES, RangeIndex, within_bounds
+    objs = places(n, random.Random(0))
+    indexes = {attr: RangeIndex(cls, attr) for cls, attr in RANGES}
+    columns = {"array": PlaceColumns(vectorized=False)}
+    if PlaceColumns().vectorized:
+        columns["numpy"] = PlaceColumns()
+    results = {"places": n, "build_us_per_place": {}}
+    structures = {name: [structure] for name, structure in columns.items()}
+    structures["range_indexes"] = list(indexes.values())
+    for name, each in structures.items():
+
+        def build():
+            """adds every place to the structures"""
+            for index in each:
+                for key, obj in objs.items():
+                    index.add(key, obj)
+        seconds, _ = timed(build)
+        results["build_us_per_place"][name] = 1e6 * seconds / n
+    for name, bounds in FILTERS.items():
+
+        def loop():
+            """checks every object"""
+            return [obj for obj in objs.values()
+                    if within_bounds(obj, bounds)]
+
+        def range_index():
+            """checks the objects of the most selective range"""
+            index = min((indexes[attr] for attr in bounds
+                         if attr in indexes),
+                        key=lambda i: i.count(*bounds[i.attr]))
+            return [obj for obj in (objs[key] for key in
+                                    index.range(*bounds[index.attr]))
+                    if within_bounds(obj, bounds)]
+        paths = {"object_loop": loop, "range_index": range_index}
+        for kind, structure in columns.items():
+            paths["columns_" + kind] = scan(structure, bounds, objs)
+        timings = {}
+        for path, func in paths.items():
+            milliseconds, found = best(func, repeat)
+            timings[path] = {"ms": milliseconds, "found": found}
+        results[name] = timings
+    return results
+
+
+def main():
+    """parses the command line and runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--places", type=int, default=1000000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(workload(args.places, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
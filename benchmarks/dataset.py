@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Generates a deterministic dataset: states -> cities -> places -> reviews,
+with users and amenities
+
+The same seed and fan-out always give the same ids, names and dates, so
+benchmark results can be compared across commits.
+"""
+
+from datetime import datetime, timedelta
+import random
+import uuid
+
+EPOCH = datetime(2020, 1, 1)
+WORDS = ("cozy", "sunny", "quiet", "modern", "rustic", "spacious", "lake",
+         "beach", "downtown", "garden", "loft", "cabin", "studio", "view",
+         "historic", "family", "charming", "bright", "private", "central")
+
+
+class Fanout:
+    """the shape of a dataset"""
+
+    def __init__(self, states=10, cities=10, places=10, reviews=3,
+                 users=100, amenities=20, place_amenities=3):
+        """cities per state, places per city, reviews and amenities per
+        place, users and amenities overall"""
+        self.states = states
+        self.cities = cities
+        self.places = places
+        self.reviews = reviews
+        self.users = users
+        self.amenities = amenities
+        self.place_amenities = min(place_amenities, amenities)
+
+    @classmethod
+    def for_size(cls, total, **kwargs):
+        """returns the fan-out of a dataset of about `total` objects"""
+        fanout = cls(**kwargs)
+        fanout.users = max(10, total // 100)
+        per_state = 1 + fanout.cities * (
+            1 + fanout.places * (1 + fanout.reviews))
+        rest = total - fanout.users - fanout.amenities
+        fanout.states = max(1, rest // per_state)
+        return fanout
+
+    def total(self):
+        """returns the number of objects of the dataset"""
+        places = self.states * self.cities * self.places
+        return (self.states + self.states * self.cities + places +
+                places * self.reviews + self.users + self.amenities)
+
+
+class Generator:
+    """builds the objects of a dataset from a seed"""
+
+    def __init__(self, fanout, seed=0):
+        """fanout is a Fanout"""
+        self.fanout = fanout
+        self.rng = random.Random(seed)
+        self.tick = 0
+
+    def uuid(self):
+        """returns the next id"""
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def stamps(self):
+        """returns the created_at and updated_at of the next object"""
+        self.tick += 1
+        date = (EPOCH + timedelta(seconds=self.tick)).isoformat()
+        if "." not in date:
+            date += ".000000"
+        return {"id": self.uuid(), "created_at": date, "updated_at": date}
+
+    def words(self, n):
+        """returns n random words"""
+        return " ".join(self.rng.choice(WORDS) for i in range(n))
+
+    def objects(self):
+        """yields the objects, every parent before its children"""
+        import models
+        from models.amenity import Amenity
+        from models.city import City
+        from models.place import Place
+        from models.review import Review
+        from models.state import State
+        from models.user import User
+        fanout = self.fanout
+        amenities = []
+        for i in range(fanout.amenities):
+            amenity = Amenity(name="Amenity {:d}".format(i), **self.stamps())
+            amenities.append(amenity)
+            yield amenity
+        users = []
+        for i in range(fanout.users):
+            user = User(email="user{:d}@hbnb.io".format(i), password="pwd",
+                        first_name="First{:d}".format(i),
+                        last_name="Last{:d}".format(i), **self.stamps())
+            users.append(user.id)
+            yield user
+        for s in range(fanout.states):
+            state = State(name="State {:d}".format(s), **self.stamps())
+            yield state
+            for c in range(fanout.cities):
+                city = City(name="City {:d}-{:d}".format(s, c),
+                            state_id=state.id, **self.stamps())
+                yield city
+                for p in range(fanout.places):
+                    place = Place(
+                        name=self.words(2).title(),
+                        description=self.words(12),
+                        city_id=city.id,
+                        user_id=self.rng.choice(users),
+                        number_rooms=self.rng.randint(1, 6),
+                        number_bathrooms=self.rng.randint(1, 3),
+                        max_guest=self.rng.randint(1, 10),
+                        price_by_night=self.rng.randint(20, 500),
+                        latitude=self.rng.uniform(-60, 70),
+                        longitude=self.rng.uniform(-180, 180),
+                        **self.stamps())
+                    chosen = self.rng.sample(amenities,
+                                             fanout.place_amenities)
+                    if models.storage_t == "db":
+                        place.amenities = chosen
+                    else:
+                        place.amenity_ids = [a.id for a in chosen]
+                    yield place
+                    for r in range(fanout.reviews):
+                        yield Review(text=self.words(20), place_id=place.id,
+                                     user_id=self.rng.choice(users),
+                                     **self.stamps())
+
+
+def load(storage, fanout, seed=0, chunk=10000):
+    """adds the dataset to storage, committing every `chunk` objects to
+    a database (FileStorage writes its file once)"""
+    import models
+    objs = []
+    count = 0
+    for obj in Generator(fanout, seed).objects():
+        objs.append(obj)
+        if len(objs) >= chunk:
+            storage.new_many(objs)
+            if models.storage_t == "db":
+                storage.save()
+            count += len(objs)
+            objs = []
+    storage.new_many(objs)
+    storage.save()
+    return count + len(objs)
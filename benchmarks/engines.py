@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Compares the storage engines (file, sqlite and MySQL db) on a CRUD workload
+
+usage: python3 -m benchmarks.engines [-n OBJECTS] [-e ENGINE ...]
+"""
+
+import argparse
+import json
+from benchmarks.runner import ENGINES, run_engines, child_storage, timed
+
+
+def workload(storage, n):
+    """runs the CRUD workload on storage, returns the timings"""
+    from models.city import City
+    from models.state import State
+    results = {}
+
+    def create():
+        """one save() per object, like the API does"""
+        ids = []
+        for i in range(n):
+            state = State(name="State {}".format(i))
+            state.save()
+            City(name="City {}".format(i), state_id=state.id).save()
+            ids.append(state.id)
+        return ids
+
+    def bulk():
+        """a single save() for n objects"""
+        for i in range(n):
+            storage.new(State(name="Bulk {}".format(i)))
+        storage.save()
+
+    results["create_save_each"], ids = timed(create)
+    results["create_save_once"], _ = timed(bulk)
+    storage.close()
+    results["all"], _ = timed(storage.all)
+    results["all_cls"], _ = timed(storage.all, State)
+    results["count"], _ = timed(storage.count, State)
+    results["get"], _ = timed(lambda: [storage.get(State, i) for i in ids])
+    results["relationship"], _ = timed(
+        lambda: [len(storage.get(State, i).cities) for i in ids[:100]])
+    results["reload"], _ = timed(storage.reload)
+
+    def delete():
+        """deletes the cities then the states, one commit"""
+        for city in list(storage.all(City).values()):
+            storage.delete(city)
+        for state in list(storage.all(State).values()):
+            storage.delete(state)
+        storage.save()
+
+    results["delete"], _ = timed(delete)
+    return {"objects": n, "seconds": results}
+
+
+def main():
+    """parses the command line and runs or spawns the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--objects", type=int, default=1000)
+    parser.add_argument("-e", "--engine", action="append", choices=ENGINES)
+    parser.add_argument("--child")
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+    if args.child:
+        storage = child_storage(args.workdir)
+        print(json.dumps(workload(storage, args.objects)))
+        return
+    results = run_engines("benchmarks.engines", ["-n", str(args.objects)],
+                          args.engine or ENGINES)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
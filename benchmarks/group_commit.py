@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Measures the save() throughput of FileStorage under concurrency,
+with and without group commit (HBNB_GROUP_COMMIT)
+
+usage: python3 -m benchmarks.group_commit [-n SAVES] [-w WINDOW_MS]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+from benchmarks.runner import child_storage, timed
+
+
+def throughput(storage, threads, saves):
+    """returns the saves per second of `threads` concurrent writers"""
+    from models.state import State
+
+    def writer():
+        """creates and saves `saves` states"""
+        for i in range(saves):
+            storage.new(State(name="State {}".format(i)))
+            storage.save()
+
+    workers = [threading.Thread(target=writer) for i in range(threads)]
+
+    def run():
+        """starts the writers and waits for them"""
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    seconds, _ = timed(run)
+    return threads * saves / seconds
+
+
+def main():
+    """runs the benchmark for 1 to 16 writers"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--saves", type=int, default=50)
+    parser.add_argument("-w", "--window", default="2")
+    args = parser.parse_args()
+    os.environ.pop("HBNB_TYPE_STORAGE", None)
+    from models.engine.file_storage import FileStorage
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        child_storage(workdir)
+        for mode in ("sync", "group"):
+            os.environ.pop("HBNB_GROUP_COMMIT", None)
+            if mode == "group":
+                os.environ["HBNB_GROUP_COMMIT"] = args.window
+            storage = FileStorage()
+            results[mode] = {}
+            for threads in (1, 2, 4, 8, 16):
+                FileStorage._FileStorage__objects.clear()
+                results[mode][threads] = throughput(storage, threads,
+                                                    args.saves)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Helpers to run a benchmark once per storage engine
+
+The engine is chosen when the models package is imported, so every
+engine runs in its own python process: the parent calls run_engines()
+and each child calls child_main() then prints its results as JSON.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ENGINES = ("file", "sqlite", "db")
+
+
+def engine_available(engine):
+    """tells if the engine can run here (MySQL needs HBNB_MYSQL_*)"""
+    if engine == "db":
+        return bool(os.getenv("HBNB_MYSQL_HOST"))
+    return engine in ENGINES
+
+
+def engine_env(engine, workdir):
+    """returns the environment of a child process using the engine"""
+    env = dict(os.environ)
+    env["HBNB_ENV"] = "test"
+    env.pop("HBNB_TYPE_STORAGE", None)
+    if engine != "file":
+        env["HBNB_TYPE_STORAGE"] = engine
+    if engine == "sqlite":
+        env["HBNB_SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+    return env
+
+
+def run_engines(module, args=(), engines=ENGINES):
+    """runs `python3 -m module` once per engine, returns their results"""
+    results = {}
+    for engine in engines:
+        if not engine_available(engine):
+            print("skipping engine {}".format(engine), file=sys.stderr)
+            continue
+        with tempfile.TemporaryDirectory() as workdir:
+            cmd = [sys.executable, "-m", module, "--child", engine,
+                   "--workdir", workdir] + list(args)
+            out = subprocess.run(cmd, env=engine_env(engine, workdir),
+                                 stdout=subprocess.PIPE, check=True)
+        results[engine] = json.loads(out.stdout.decode())
+    return results
+
+
+def child_storage(workdir):
+    """returns models.storage, emptied and isolated in workdir"""
+    import models
+    if models.storage_t != "db":
+        from models.engine.file_storage import FileStorage
+        FileStorage._FileStorage__file_path = os.path.join(workdir,
+                                                           "file.json")
+        forget_file_objects(models.storage)
+    return models.storage
+
+
+def forget_file_objects(storage):
+    """empties the objects of a FileStorage and its indexes, so that the
+    next reload() reads and indexes the whole file again"""
+    storage._FileStorage__objects.clear()
+    for index in storage._FileStorage__indexes.values():
+        index.clear()
+    storage._FileStorage__deleted.clear()
+    storage._FileStorage__file_stat = None
+    storage._FileStorage__file_keys = frozenset()
+
+
+def timed(func, *args, **kwargs):
+    """calls func and returns (seconds elapsed, value returned)"""
+    start = time.perf_counter()
+    value = func(*args, **kwargs)
+    return time.perf_counter() - start, value
+
+
+def git_revision():
+    """returns the current commit of the repository, if any"""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL, check=True)
+        return out.stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
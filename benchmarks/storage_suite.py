@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""
+Times the storage methods on generated datasets of increasing size
+
+usage: python3 -m benchmarks.storage_suite [-s SIZE ...] [-e ENGINE ...]
+                                           [--seed N] [-o FILE]
+       python3 -m benchmarks.storage_suite --compare OLD.json NEW.json
+
+The results (seconds per operation, by engine and size) are written as
+JSON with the commit they were measured on; --compare prints the ratio
+new / old of every timing of two result files.
+"""
+
+import argparse
+import json
+import random
+import sys
+from benchmarks.dataset import Fanout, load
+from benchmarks.runner import (ENGINES, run_engines, child_storage, timed,
+                               forget_file_objects, git_revision)
+
+SIZES = (10000, 100000, 1000000)
+SAMPLE = 1000
+
+
+def suite(storage, size, seed):
+    """loads a dataset of `size` objects and times the storage on it"""
+    from models import storage_t
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+    classes = (Amenity, City, Place, Review, State, User)
+    fanout = Fanout.for_size(size)
+    results = {"objects": fanout.total()}
+    results["load"], _ = timed(load, storage, fanout, seed)
+    storage.close()
+    rng = random.Random(seed)
+    ids = {}
+    for cls in (State, Place):
+        keys = sorted(obj.id for obj in storage.all(cls).values())
+        ids[cls] = rng.sample(keys, min(SAMPLE, len(keys)))
+    results["all"], _ = timed(storage.all)
+    for cls in classes:
+        name = cls.__name__
+        results["all_" + name], _ = timed(storage.all, cls)
+        results["count_" + name], _ = timed(storage.count, cls)
+    results["count"], _ = timed(storage.count)
+    results["get"], _ = timed(
+        lambda: [storage.get(Place, i) for i in ids[Place]])
+    places = [storage.get(Place, i) for i in ids[Place][:100]]
+    states = [storage.get(State, i) for i in ids[State][:100]]
+    results["State.cities"], _ = timed(
+        lambda: [len(state.cities) for state in states])
+    results["Place.reviews"], _ = timed(
+        lambda: [len(place.reviews) for place in places])
+    results["save"], _ = timed(storage.save)
+    if storage_t != "db":
+        # reload() reads nothing when the file is the one just written
+        forget_file_objects(storage)
+    results["reload"], _ = timed(storage.reload)
+    return results
+
+
+def compare(old_path, new_path):
+    """prints the ratio new / old of the timings of two result files"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print("{} -> {}".format(old.get("revision"), new.get("revision")))
+    for engine, sizes in new["results"].items():
+        for size, timings in sizes.items():
+            before = old["results"].get(engine, {}).get(size, {})
+            for op, seconds in timings.items():
+                if op == "objects" or not before.get(op):
+                    continue
+                print("{:8} {:>8} {:16} {:10.4f}s {:7.2f}x".format(
+                    engine, size, op, seconds, seconds / before[op]))
+
+
+def main():
+    """parses the command line and runs or spawns the suite"""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("-s", "--size", type=int, action="append")
+    parser.add_argument("-e", "--engine", action="append", choices=ENGINES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--child")
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    sizes = args.size or SIZES
+    if args.child:
+        storage = child_storage(args.workdir)
+        print(json.dumps(suite(storage, sizes[0], args.seed)))
+        return
+    results = {}
+    for size in sizes:
+        # a fresh process and database for every size
+        child_args = ["--seed", str(args.seed), "-s", str(size)]
+        by_engine = run_engines("benchmarks.storage_suite", child_args,
+                                args.engine or ENGINES)
+        for engine, timings in by_engine.items():
+            results.setdefault(engine, {})[str(size)] = timings
+    output = {"revision": git_revision(), "seed": args.seed,
+              "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    json.dump(output, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+"""
+Measures the full-text search of the places on every storage engine: the
+latency of storage.search() and the cost of the text index per object
+written (saving places and reviews one by one like the API, then many at
+once, with then without the index)
+
+usage: python3 -m benchmarks.text_search [-s SIZE] [-w WRITES] [-q QUERIES]
+                                         [-e ENGINE ...]
+"""
+
+import argparse
+import json
+import random
+from benchmarks.dataset import WORDS, Fanout, load
+from benchmarks.runner import ENGINES, run_engines, child_storage, timed
+
+
+def writes(storage, n, rng):
+    """saves n places, each with a review, one save() per object like the
+    API, then n more with a single save(), returns the seconds per object
+    of both"""
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.user import User
+    city = next(storage.iter_all(City))
+    user = next(storage.iter_all(User))
+    city_id, user_id = city.id, user.id
+    storage.close()
+
+    def objects():
+        """yields n places, each followed by a review"""
+        for i in range(n):
+            place = Place(name=" ".join(rng.sample(WORDS, 2)),
+                          description=" ".join(rng.choices(WORDS, k=12)),
+                          city_id=city_id, user_id=user_id)
+            yield place
+            yield Review(text=" ".join(rng.choices(WORDS, k=20)),
+                         place_id=place.id, user_id=user_id)
+
+    def save_each():
+        """saves the objects one by one"""
+        for obj in objects():
+            obj.save()
+
+    def save_once():
+        """adds the objects, then saves once"""
+        storage.new_many(list(objects()))
+        storage.save()
+
+    each, _ = timed(save_each)
+    once, _ = timed(save_once)
+    storage.close()
+    return each / (2 * n), once / (2 * n)
+
+
+def workload(storage, size, n, queries):
+    """loads a dataset of size objects and times the searches and writes"""
+    rng = random.Random(0)
+    load(storage, Fanout.for_size(size))
+    storage.close()
+    results = {"objects": size}
+    latencies = []
+    matches = 0
+    for i in range(queries):
+        query = " ".join(rng.sample(WORDS, rng.randint(1, 2)))
+        seconds, found = timed(storage.search, query)
+        latencies.append(seconds)
+        matches += len(found)
+    latencies.sort()
+    results["search_ms"] = {
+        "mean": 1000 * sum(latencies) / len(latencies),
+        "p50": 1000 * latencies[len(latencies) // 2],
+        "max": 1000 * latencies[-1],
+        "matches": matches // len(latencies)}
+    indexed = writes(storage, n, rng)
+    storage.drop_text_index()
+    plain = writes(storage, n, rng)
+    for i, name in enumerate(("save_each_us", "save_once_us")):
+        results[name] = {"indexed": 1e6 * indexed[i],
+                         "plain": 1e6 * plain[i],
+                         "index_cost": 1e6 * (indexed[i] - plain[i])}
+    return results
+
+
+def main():
+    """parses the command line and runs or spawns the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--size", type=int, default=10000)
+    parser.add_argument("-w", "--writes", type=int, default=200)
+    parser.add_argument("-q", "--queries", type=int, default=50)
+    parser.add_argument("-e", "--engine", action="append", choices=ENGINES)
+    parser.add_argument("--child")
+    parser.add_argument("--workdir")
+    args = parser.parse_args()
+    if args.child:
+        storage = child_storage(args.workdir)
+        print(json.dumps(workload(storage, args.size, args.writes,
+                                  args.queries)))
+        return
+    results = run_engines("benchmarks.text_search",
+                          ["-s", str(args.size), "-w", str(args.writes),
+                           "-q", str(args.queries)],
+                          args.engine or ENGINES)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 #!/usr/bin/python3
 """ console """
 
+import argparse
 import cmd
 from datetime import datetime
+import json
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -12,14 +14,28 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import shlex  # for splitting the line along spaces except in double quotes
+import sys
+import time
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# parents first, so that the foreign keys exist when importing
+export_order = ["Amenity", "BaseModel", "State", "City", "User", "Place",
+                "Review"]
 
 
 class HBNBCommand(cmd.Cmd):
     """ HBNH console """
     prompt = '(hbnb) '
+    # batch mode: None saves after each command, 0 once at the end,
+    # n every n commands
+    commit_every = None
+    # number of changes not saved yet in batch mode
+    pending = 0
+    # number of commands between two progress reports in batch mode
+    progress_every = 1000
+    # number of objects added to the storage at once by import
+    chunk_size = 1000
 
     def do_EOF(self, arg):
         """Exits console"""
@@ -67,7 +83,7 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
             return False
         print(instance.id)
-        instance.save()
+        self._save(instance)
 
     def do_show(self, arg):
         """Prints an instance as a string based on the class and id"""
@@ -77,9 +93,9 @@ class HBNBCommand(cmd.Cmd):
             return False
         if args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    print(models.storage.all()[key])
+                instance = models.storage.get(classes[args[0]], args[1])
+                if instance is not None:
+                    print(instance)
                 else:
                     print("** no instance found **")
             else:
@@ -94,10 +110,10 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                key = args[0] + "." + args[1]
-                if key in models.storage.all():
-                    models.storage.all().pop(key)
-                    models.storage.save()
+                instance = models.storage.get(classes[args[0]], args[1])
+                if instance is not None:
+                    models.storage.delete(instance)
+                    self._changed()
                 else:
                     print("** no instance found **")
             else:
@@ -108,20 +124,154 @@ class HBNBCommand(cmd.Cmd):
     def do_all(self, arg):
         """Prints string representations of instances"""
         args = shlex.split(arg)
-        obj_list = []
         if len(args) == 0:
-            obj_dict = models.storage.all()
+            objs = models.storage.iter_all()
         elif args[0] in classes:
-            obj_dict = models.storage.all(classes[args[0]])
+            objs = models.storage.iter_all(classes[args[0]])
         else:
             print("** class doesn't exist **")
             return False
-        for key in obj_dict:
-            obj_list.append(str(obj_dict[key]))
+        # prints the instances one by one instead of joining them
+        sep = ""
         print("[", end="")
-        print(", ".join(obj_list), end="")
+        for obj in objs:
+            print(sep, obj, sep="", end="")
+            sep = ", "
         print("]")
 
+    def do_count(self, arg):
+        """Prints the number of instances of a class (or of all classes)"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print(models.storage.count())
+        elif args[0] in classes:
+            print(models.storage.count(classes[args[0]]))
+        else:
+            print("** class doesn't exist **")
+
+    def do_upgrade(self, arg):
+        """Creates the tables and indexes missing from the database"""
+        if models.storage_t != "db":
+            print("** no schema to upgrade **")
+            return False
+        created = models.storage.upgrade_schema()
+        for name in created:
+            print("created index {}".format(name))
+        print("{:d} indexes created".format(len(created)))
+
+    def do_import(self, arg):
+        """Loads the objects of a NDJSON file: import <file>"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** file name missing **")
+            return False
+        count = 0
+        skipped = 0
+        chunk = []
+        # the (instance, object it replaced or None) pairs not saved yet
+        staged = []
+        try:
+            with open(args[0]) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    instance = self._from_record(line)
+                    if instance is None:
+                        skipped += 1
+                        continue
+                    chunk.append(instance)
+                    if len(chunk) >= self.chunk_size:
+                        count += self._import_chunk(chunk, staged)
+                        chunk = []
+                count += self._import_chunk(chunk, staged)
+        except OSError:
+            print("** file doesn't exist **")
+            return False
+        except Exception as error:
+            self._rollback(staged)
+            print("** import failed after {:d}: {} **".format(
+                count, str(error).splitlines()[0]))
+            return False
+        if models.storage_t != "db":
+            # a single write of the whole file
+            models.storage.save()
+        print("{:d} imported, {:d} skipped".format(count, skipped))
+
+    def _from_record(self, line):
+        """returns the instance described by a NDJSON line, if valid"""
+        try:
+            record = json.loads(line)
+            cls = classes[record["__class__"]]
+            if models.storage_t == "db" and cls is BaseModel:
+                return None
+            return cls(**record)
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    def _import_chunk(self, chunk, staged):
+        """adds a chunk of instances to the storage, in one transaction
+        with a database, recording them in staged otherwise (see
+        _rollback)"""
+        if chunk:
+            if models.storage_t != "db":
+                staged.extend((instance, models.storage.get(
+                    type(instance), instance.id)) for instance in chunk)
+            models.storage.new_many(chunk)
+            if models.storage_t == "db":
+                models.storage.save()
+        return len(chunk)
+
+    def _rollback(self, staged):
+        """drops the instances of a failed import not saved yet: the chunk
+        being saved with a database, every instance staged otherwise, the
+        objects they replaced being put back"""
+        if models.storage_t == "db":
+            models.storage.close()
+            return
+        # in reverse, so that a line replacing an earlier one of the file
+        # is undone first
+        for instance, previous in reversed(staged):
+            if previous is None:
+                models.storage.delete(instance)
+            else:
+                models.storage.new(previous)
+
+    def do_export(self, arg):
+        """Writes instances as NDJSON: export <class name|all> <file>"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** class name missing **")
+            return False
+        if args[0] == "all":
+            names = export_order
+        elif args[0] in classes:
+            names = [args[0]]
+        else:
+            print("** class doesn't exist **")
+            return False
+        if len(args) == 1:
+            print("** file name missing **")
+            return False
+        count = 0
+        with open(args[1], "w") as f:
+            for name in names:
+                for obj in models.storage.iter_all(classes[name]):
+                    f.write(json.dumps(self._to_record(obj)) + "\n")
+                    count += 1
+        print("{:d} exported".format(count))
+
+    def _to_record(self, obj):
+        """returns the dictionary of obj without its relationships"""
+        def is_json(value):
+            """tells if value is a JSON scalar or a list of them"""
+            if type(value) is list:
+                return all(is_json(item) for item in value)
+            return value is None or type(value) in (str, int, float, bool)
+        record = obj.to_dict()
+        for key in [key for key in record if not is_json(record[key])]:
+            del record[key]
+        return record
+
     def do_update(self, arg):
         """Update an instance based on the class name, id, attribute & value"""
         args = shlex.split(arg)
@@ -132,8 +282,8 @@ class HBNBCommand(cmd.Cmd):
             print("** class name missing **")
         elif args[0] in classes:
             if len(args) > 1:
-                k = args[0] + "." + args[1]
-                if k in models.storage.all():
+                instance = models.storage.get(classes[args[0]], args[1])
+                if instance is not None:
                     if len(args) > 2:
                         if len(args) > 3:
                             if args[0] == "Place":
@@ -147,8 +297,8 @@ class HBNBCommand(cmd.Cmd):
                                         args[3] = float(args[3])
                                     except:
                                         args[3] = 0.0
-                            setattr(models.storage.all()[k], args[2], args[3])
-                            models.storage.all()[k].save()
+                            setattr(instance, args[2], args[3])
+                            self._save(instance)
                         else:
                             print("** value missing **")
                     else:
@@ -160,5 +310,73 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def _save(self, instance):
+        """saves instance, or stages it until the next commit in batch mode"""
+        if self.commit_every is None:
+            instance.save()
+        else:
+            instance.updated_at = datetime.utcnow()
+            models.storage.new(instance)
+            self._changed()
+
+    def _changed(self):
+        """saves the storage, or counts a pending change in batch mode"""
+        if self.commit_every is None:
+            models.storage.save()
+            return
+        self.pending += 1
+        if self.commit_every and self.pending >= self.commit_every:
+            self._commit()
+
+    def _commit(self):
+        """saves the changes pending in batch mode"""
+        if self.pending:
+            models.storage.save()
+            self.pending = 0
+
+    def run_batch(self, stream, commit_every=0, report=sys.stderr):
+        """runs the commands read from stream, saving the storage once at
+        the end or every commit_every changes, and reports the progress"""
+        self.commit_every = commit_every
+        count = 0
+        start = time.perf_counter()
+        try:
+            for line in stream:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                stop = self.onecmd(self.precmd(line))
+                count += 1
+                if count % self.progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print("{:d} commands ({:.0f}/s)".format(
+                        count, count / elapsed), file=report)
+                if stop:
+                    break
+        finally:
+            self._commit()
+            self.commit_every = None
+        elapsed = time.perf_counter() - start
+        print("{:d} commands in {:.2f}s ({:.0f}/s)".format(
+            count, elapsed, count / elapsed if elapsed else 0), file=report)
+        return count
+
+
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    parser = argparse.ArgumentParser(description="HBNB console")
+    parser.add_argument("-b", "--batch", metavar="FILE",
+                        help="run the commands of FILE ('-' for stdin) "
+                        "and save once at the end")
+    parser.add_argument("-n", "--commit-every", type=int, default=0,
+                        metavar="N", help="in batch mode, also save every "
+                        "N changes")
+    options = parser.parse_args()
+    if models.storage_t != "db":
+        models.storage.force_sync()
+    if options.batch is None:
+        HBNBCommand().cmdloop()
+    elif options.batch == "-":
+        HBNBCommand().run_batch(sys.stdin, options.commit_every)
+    else:
+        with open(options.batch) as f:
+            HBNBCommand().run_batch(f, options.commit_every)
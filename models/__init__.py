@@ -6,13 +6,17 @@ initialize the models package
 from os import getenv
 
 
-storage_t = getenv("HBNB_TYPE_STORAGE")
+storage_type = getenv("HBNB_TYPE_STORAGE")
+# the SQLite engine uses the same SQLAlchemy models as the MySQL one
+storage_t = "db" if storage_type == "sqlite" else storage_type
 
-if storage_t == "db":
+if storage_type == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
 storage.reload()
-
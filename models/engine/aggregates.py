@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+"""
+Contains the class Aggregates
+"""
+
+from models.engine.indexes import Index, number
+import threading
+
+# the number of objects of a class by value of an attribute:
+# name -> (class name, attribute)
+GROUPS = {
+    "cities_per_state": ("City", "state_id"),
+    "places_per_city": ("Place", "city_id"),
+    "reviews_per_place": ("Review", "place_id"),
+}
+# the average of an attribute of a class by value of another one:
+# name -> (class name, group attribute, averaged attribute)
+AVERAGES = {
+    "average_price_by_night": ("Place", "city_id", "price_by_night"),
+}
+# the attributes the aggregates of a class depend on, by class name
+COLUMNS = {}
+for _cls, _attr in GROUPS.values():
+    COLUMNS.setdefault(_cls, set()).add(_attr)
+for _cls, _group, _attr in AVERAGES.values():
+    COLUMNS.setdefault(_cls, set()).update((_group, _attr))
+COLUMNS = {name: tuple(sorted(attrs)) for name, attrs in COLUMNS.items()}
+
+
+class Aggregates(Index):
+    """the number of objects of every class and the aggregates of GROUPS
+    and AVERAGES, updated object by object instead of being recomputed
+
+    FileStorage uses it as one of its indexes (add() and remove() by key).
+    DBStorage calls apply() with the values (see values()) of the objects
+    inserted, updated or deleted by a transaction once it is committed.
+    Every method holds the lock of the aggregates.
+    """
+    name = "aggregates"
+
+    def __init__(self, classes=()):
+        """counts the objects of classes (class names)"""
+        self.classes = tuple(classes)
+        self.__counts = {}
+        self.__groups = {name: {} for name in GROUPS}
+        self.__averages = {name: {} for name in AVERAGES}
+        self.__values = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def values(name, obj):
+        """returns the values of the attributes of obj, instance of the
+        class name, the aggregates depend on"""
+        return tuple(getattr(obj, attr, None)
+                     for attr in COLUMNS.get(name, ()))
+
+    def __change(self, name, values, sign):
+        """adds (sign 1) or removes (sign -1) an object of the class name
+        with values, the caller holds the lock"""
+        self.__counts[name] = self.__counts.get(name, 0) + sign
+        values = dict(zip(COLUMNS.get(name, ()), values))
+        for group, (cls, attr) in GROUPS.items():
+            if cls == name:
+                counts = self.__groups[group]
+                key = values[attr]
+                counts[key] = counts.get(key, 0) + sign
+                if counts[key] <= 0:
+                    del counts[key]
+        for average, (cls, group, attr) in AVERAGES.items():
+            value = number(values.get(attr))
+            if cls == name and value is not None:
+                sums = self.__averages[average]
+                key = values[group]
+                total, count = sums.get(key, (0.0, 0))
+                if count + sign <= 0:
+                    sums.pop(key, None)
+                else:
+                    sums[key] = (total + sign * value, count + sign)
+
+    def apply(self, name, old=None, new=None):
+        """records that an object of the class name with the values old
+        (None if it is new) now has the values new (None if deleted)"""
+        with self.__lock:
+            if old is not None:
+                self.__change(name, old, -1)
+            if new is not None:
+                self.__change(name, new, 1)
+
+    def add(self, key, obj):
+        """counts obj, replacing the object counted under key"""
+        name = key.split(".", 1)[0]
+        values = self.values(name, obj)
+        with self.__lock:
+            old = self.__values.get(key)
+            if old == values:
+                return
+            if old is not None:
+                self.__change(name, old, -1)
+            self.__values[key] = values
+            self.__change(name, values, 1)
+
+    def remove(self, key):
+        """forgets the object counted under key"""
+        with self.__lock:
+            old = self.__values.pop(key, None)
+            if old is not None:
+                self.__change(key.split(".", 1)[0], old, -1)
+
+    def clear(self):
+        """forgets everything"""
+        with self.__lock:
+            self.__counts.clear()
+            for groups in (self.__groups, self.__averages):
+                for values in groups.values():
+                    values.clear()
+            self.__values.clear()
+
+    def load(self, counts, groups, averages):
+        """replaces the aggregates with counts (class name -> number),
+        groups (name -> value -> number) and averages (name -> value ->
+        (sum, number))"""
+        with self.__lock:
+            self.__counts = dict(counts)
+            self.__groups = {name: dict(groups.get(name, {}))
+                             for name in GROUPS}
+            self.__averages = {name: dict(averages.get(name, {}))
+                               for name in AVERAGES}
+
+    def count(self, name):
+        """returns the number of objects of the class name"""
+        return self.__counts.get(name, 0)
+
+    def group(self, name, value):
+        """returns the number of objects of the group name with value"""
+        return self.__groups[name].get(value, 0)
+
+    def average(self, name, value):
+        """returns the average of the group name with value, or None"""
+        total, count = self.__averages[name].get(value, (0.0, 0))
+        return total / count if count else None
+
+    def to_dict(self):
+        """returns a copy of every aggregate"""
+        with self.__lock:
+            aggregates = {"counts": dict(self.__counts)}
+            for name, counts in self.__groups.items():
+                aggregates[name] = dict(counts)
+            for name, sums in self.__averages.items():
+                aggregates[name] = {key: total / count
+                                    for key, (total, count) in sums.items()}
+            return aggregates
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the dependencies between classes used by cascade deletes and
+the class CascadeJob
+"""
+
+import models
+import threading
+import time
+import uuid
+
+# the objects to delete with an object: (class name, foreign key)
+CASCADES = {
+    "State": (("City", "state_id"),),
+    "City": (("Place", "city_id"),),
+    "User": (("Place", "user_id"), ("Review", "user_id")),
+    "Place": (("Review", "place_id"),),
+}
+# every foreign key followed by cascade deletes
+FOREIGN_KEYS = tuple(fk for fks in CASCADES.values() for fk in fks)
+# the number of objects deleted at once
+BATCH = 500
+
+
+class CascadeJob:
+    """deletes an object and its dependents in a background thread
+
+    The jobs are kept in CascadeJob.jobs by id so that their progress can
+    be queried while they run, and forgotten TTL seconds after their end,
+    or sooner, the oldest first, when more than MAX_JOBS are kept.
+    """
+    jobs = {}
+    TTL = 3600
+    MAX_JOBS = 1000
+    __lock = threading.Lock()
+
+    def __init__(self, obj):
+        """prepares the deletion of obj"""
+        self.id = str(uuid.uuid4())
+        self.cls = type(obj)
+        self.obj_id = obj.id
+        self.status = "pending"
+        self.deleted = 0
+        self.total = None
+        self.error = None
+        self.finished = None
+        self.__thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        """registers the job and starts its thread"""
+        with CascadeJob.__lock:
+            CascadeJob.prune()
+            CascadeJob.jobs[self.id] = self
+        self.__thread.start()
+        return self
+
+    @staticmethod
+    def prune():
+        """forgets the jobs finished TTL seconds ago, then the oldest
+        finished jobs while there are MAX_JOBS jobs or more"""
+        now = time.monotonic()
+        jobs = CascadeJob.jobs
+        finished = [job for job in jobs.values() if job.finished is not None]
+        for job in finished:
+            if (now - job.finished > CascadeJob.TTL or
+                    len(jobs) >= CascadeJob.MAX_JOBS):
+                del jobs[job.id]
+
+    def join(self, timeout=None):
+        """waits for the end of the job"""
+        self.__thread.join(timeout)
+
+    def progress(self, deleted, total):
+        """records the progress reported by the storage"""
+        self.deleted = deleted
+        self.total = total
+
+    def run(self):
+        """deletes the object and its dependents"""
+        self.status = "running"
+        try:
+            obj = models.storage.get(self.cls, self.obj_id)
+            if obj is not None:
+                models.storage.cascade_delete(obj, self.progress)
+            self.status = "done"
+        except Exception as error:
+            self.status = "failed"
+            self.error = str(error)
+        finally:
+            self.finished = time.monotonic()
+            if models.storage_t == "db":
+                # releases the session of the thread
+                models.storage.close()
+
+    def to_dict(self):
+        """returns the state of the job"""
+        return {"id": self.id, "class": self.cls.__name__,
+                "object_id": self.obj_id, "status": self.status,
+                "deleted": self.deleted, "total": self.total,
+                "error": self.error}
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Contains the class PlaceColumns
+"""
+
+from array import array
+from models.engine.indexes import Index, number
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# the numeric attributes of the places copied into columns
+COLUMNS = ("price_by_night", "max_guest", "number_rooms", "number_bathrooms",
+           "latitude", "longitude")
+NAN = float("nan")
+INFINITY = float("inf")
+# a scan of the columns costs about as much as checking one row out of
+# SCAN_RATIO object by object: below that, a RangeIndex is faster
+SCAN_RATIO = 1000 if numpy is not None else 15
+
+
+class PlaceColumns(Index):
+    """a column-oriented copy of the numeric attributes of the places: an
+    array('d') per attribute (NaN when the value is not a number) and the
+    key of every row, so that the bounds of a search are evaluated column
+    by column instead of object by object
+
+    With numpy, select() compares every column at once through a numpy
+    view of its array (no copy); without it, each column narrows the rows
+    matching the previous ones. A deleted row is replaced by the last one,
+    so the rows stay packed. FileStorage holds its lock around every call.
+    """
+    name = "columns"
+    classes = ("Place",)
+
+    def __init__(self, attrs=COLUMNS, vectorized=True):
+        """copies the attributes attrs, comparing them with numpy if
+        vectorized and numpy is installed"""
+        self.attrs = tuple(attrs)
+        self.vectorized = vectorized and numpy is not None
+        self.__columns = {attr: array("d") for attr in self.attrs}
+        self.__keys = []
+        self.__rows = {}
+
+    def __len__(self):
+        """returns the number of rows"""
+        return len(self.__keys)
+
+    def add(self, key, obj):
+        """copies the attributes of obj into the row of key"""
+        row = self.__rows.get(key)
+        if row is None:
+            self.__rows[key] = len(self.__keys)
+            self.__keys.append(key)
+        for attr, column in self.__columns.items():
+            value = number(getattr(obj, attr, None))
+            if value is None:
+                value = NAN
+            if row is None:
+                column.append(value)
+            else:
+                column[row] = value
+
+    def remove(self, key):
+        """deletes the row of key, moving the last row in its place"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = self.__keys.pop()
+        for column in self.__columns.values():
+            value = column.pop()
+            if last != key:
+                column[row] = value
+        if last != key:
+            self.__keys[row] = last
+            self.__rows[last] = row
+
+    def clear(self):
+        """forgets everything"""
+        for column in self.__columns.values():
+            del column[:]
+        self.__keys.clear()
+        self.__rows.clear()
+
+    def select(self, bounds):
+        """returns the keys of the rows whose attributes are in bounds
+        (attribute -> (minimum, maximum), inclusive, None for no bound), or
+        None if an attribute has no column"""
+        if not all(attr in self.__columns for attr in bounds):
+            return None
+        if not self.__keys or not bounds:
+            return list(self.__keys)
+        # NaN is neither >= -inf nor <= inf: the rows without a value fail
+        bounds = [(self.__columns[attr],
+                   -INFINITY if low is None else low,
+                   INFINITY if high is None else high)
+                  for attr, (low, high) in bounds.items()]
+        if self.vectorized:
+            rows = self.__mask(bounds)
+        else:
+            rows = range(len(self.__keys))
+            for column, low, high in bounds:
+                rows = [row for row in rows if low <= column[row] <= high]
+        keys = self.__keys
+        return [keys[row] for row in rows]
+
+    @staticmethod
+    def __mask(bounds):
+        """returns the rows in bounds ((column, low, high) triples) found
+        with numpy"""
+        mask = None
+        for column, low, high in bounds:
+            # a view of the array: it cannot grow until the view is freed
+            values = numpy.frombuffer(column, dtype=numpy.float64)
+            matches = (values >= low) & (values <= high)
+            mask = matches if mask is None else mask & matches
+            del values
+        return numpy.flatnonzero(mask).tolist()
@@ -3,43 +3,130 @@
 Contains the class DBStorage
 """
 
+from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.aggregates import AVERAGES, COLUMNS, GROUPS, Aggregates
+from models.engine.cascade import BATCH, CASCADES
+from models.engine.object_cache import ObjectCache
+from models.engine.spatial import box_around, closest, ranges
+from models.engine.text_search import CLASS_FIELDS, rank, terms
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
+import random
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import create_engine, event, func, inspect, text
+from sqlalchemy.orm import (Session, make_transient_to_detached,
+                            scoped_session, sessionmaker)
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql import Select
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# the classes whose objects are kept in the object cache
+CACHED = (Amenity, City, State)
+# the number of times the aggregates are computed while commits land
+AGGREGATES_ATTEMPTS = 3
+
+
+class RoutingSession(Session):
+    """a session reading from a replica, writing to the primary
+
+    The SELECTs go to a replica chosen at random, unless the session is
+    flushing or sticky (info['sticky']): a session becomes sticky when it
+    writes, so that it reads its own writes from the primary until it is
+    closed. Every other statement goes to the primary (bind).
+    """
+
+    def __init__(self, replicas=(), **kwargs):
+        """binds the session to the primary (bind) and replica engines"""
+        super().__init__(**kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """returns the engine running a statement"""
+        if (self.replicas and isinstance(clause, Select) and
+                not self._flushing and not self.info.get('sticky')):
+            return random.choice(self.replicas)
+        return super().get_bind(mapper, clause=clause, **kwargs)
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
+    __replicas = []
     __session = None
+    __cache = None
+    __aggregates = None
 
     def __init__(self):
-        """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+        """Instantiate a DBStorage object
+
+        HBNB_OBJECT_CACHE is the number of objects of the classes in
+        CACHED kept by the read-through cache of get(), which is disabled
+        when it is not set, HBNB_OBJECT_CACHE_TTL their maximum age in
+        seconds (default 60).
+        HBNB_AGGREGATES_TTL is the number of seconds after which the
+        aggregates are computed again (default 60).
+        The reads are sent to the read replicas of the database, if any
+        (see _create_replica_engines).
+        """
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        size = getenv('HBNB_OBJECT_CACHE')
+        if size:
+            self.__cache = ObjectCache(
+                int(size), float(getenv('HBNB_OBJECT_CACHE_TTL', '60')))
+        self.__aggregates_lock = threading.Lock()
+        self.__aggregates_ttl = float(getenv('HBNB_AGGREGATES_TTL', '60'))
+        self.__aggregates_expiry = None
+        # the commits of the sessions in progress and ended, to tell if
+        # one landed while the aggregates were computed; notified when
+        # none is in progress
+        self.__committing = 0
+        self.__commits = 0
+        self.__no_commit = threading.Condition(self.__aggregates_lock)
+        self.__versions = {}
+        self.__engine = self._create_engine()
+        self.__replicas = self._create_replica_engines()
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
+    def _create_engine(self, host=None):
+        """builds the engine of the MySQL database on host (default
+        HBNB_MYSQL_HOST)"""
+        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
+        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
+        HBNB_MYSQL_HOST = host or getenv('HBNB_MYSQL_HOST')
+        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                             format(HBNB_MYSQL_USER,
+                                    HBNB_MYSQL_PWD,
+                                    HBNB_MYSQL_HOST,
+                                    HBNB_MYSQL_DB))
+
+    def _create_replica_engines(self):
+        """builds the engines of the read replicas listed (comma separated)
+        in HBNB_MYSQL_REPLICA_HOSTS"""
+        hosts = getenv('HBNB_MYSQL_REPLICA_HOSTS', '')
+        return [self._create_engine(host.strip())
+                for host in hosts.split(',') if host.strip()]
+
+    def use_primary(self):
+        """sends the reads of the session to the primary until it is closed
+        (before a write, or to read the latest data)"""
+        self.__session.info['sticky'] = True
+
+    def uses_primary(self):
+        """tells if the reads of the session go to the primary"""
+        return bool(self.__session.info.get('sticky'))
+
     def all(self, cls=None):
         """query on the current database session"""
         new_dict = {}
@@ -51,38 +138,575 @@ class DBStorage:
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter_all(self, cls=None, batch_size=1000):
+        """yields the objects of a class or all (if cls==None) one by one
+
+        The rows are streamed from a server-side cursor and loaded by
+        batches of batch_size (yield_per), so that the objects no longer
+        referenced can be freed while iterating. The session must not run
+        other queries (lazy loads) before the end of the iteration.
+        """
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__session.query(classes[clss])
+                for obj in query.yield_per(batch_size):
+                    yield obj
+
+    def iter_place_amenities(self, batch_size=1000):
+        """yields the (place id, amenity id) pairs of place_amenity,
+        streamed like iter_all()"""
+        from models.place import place_amenity
+        rows = self.__session.execute(
+            sqlalchemy.select(place_amenity.c.place_id,
+                              place_amenity.c.amenity_id).
+            execution_options(yield_per=batch_size))
+        for place_id, amenity_id in rows:
+            yield place_id, amenity_id
+
+    def new_place_amenities(self, links):
+        """adds the (place id, amenity id) pairs of links to place_amenity
+        in the current database session, with one executemany() INSERT"""
+        from models.place import place_amenity
+        if links:
+            self.use_primary()
+            # the places must be inserted first
+            self.__session.flush()
+            self.__session.execute(place_amenity.insert(), [
+                {"place_id": place_id, "amenity_id": amenity_id}
+                for place_id, amenity_id in links])
+
     def get(self, cls, id):
-        """retrieves an object of a class with id"""
-        obj = None
-        if cls is not None and issubclass(cls, BaseModel):
-            obj = self.__session.query(cls).filter(cls.id == id).first()
+        """retrieves an object of a class with id
+
+        The identity map of the session is looked up first, then the
+        object cache (for the classes in CACHED), then the database.
+        """
+        if cls not in classes.values():
+            return None
+        key = identity_key(cls, id)
+        obj = self.__session.identity_map.get(key)
+        if obj is not None:
+            return None if obj in self.__session.deleted else obj
+        cached = (self.__cache is not None and cls in CACHED and
+                  key not in self.__session.info.get('changed', ()))
+        if cached:
+            values = self.__cache.get(key)
+            if values is not None:
+                obj = cls()
+                for name, value in values.items():
+                    setattr(obj, name, value)
+                make_transient_to_detached(obj)
+                self.__session.add(obj)
+                return obj
+        obj = self.__session.query(cls).filter(cls.id == id).first()
+        if cached and obj is not None:
+            self.__cache.put(key, {
+                attr.key: getattr(obj, attr.key)
+                for attr in inspect(cls).column_attrs})
         return obj
 
+    def __changed(self, cls, id):
+        """invalidates the cached object of a class with id until the end
+        of the transaction changing it"""
+        if self.__cache is not None and cls in CACHED:
+            key = identity_key(cls, id)
+            self.__session.info.setdefault('changed', set()).add(key)
+            self.__cache.invalidate(key)
+
+    def __invalidate(self):
+        """invalidates the cached objects changed by the transaction"""
+        if self.__cache is not None:
+            for key in self.__session.info.pop('changed', ()):
+                self.__cache.invalidate(key)
+
+    def cache_stats(self):
+        """returns the metrics of the object cache, or None if disabled"""
+        if self.__cache is None:
+            return None
+        return self.__cache.stats()
+
+    def aggregates(self):
+        """returns the Aggregates of the objects of the database
+
+        They are computed by GROUP BY queries on the primary on the first
+        call, then updated from the objects inserted, updated and deleted
+        by the transactions committed by this process: the writes of other
+        processes are seen when they are computed again, at the first call
+        HBNB_AGGREGATES_TTL seconds later or after reload().
+        The queries do not see the changes of a commit made meanwhile,
+        or see them before they are applied: they are only kept if no
+        commit of this process was in progress or ended while they ran,
+        else run again (AGGREGATES_ATTEMPTS times at most, after which
+        they are computed again at the next call).
+        """
+        with self.__aggregates_lock:
+            aggregates = self.__aggregates
+            if (aggregates is not None and
+                    time.monotonic() < self.__aggregates_expiry):
+                return aggregates
+        for attempt in range(AGGREGATES_ATTEMPTS):
+            with self.__no_commit:
+                self.__no_commit.wait_for(lambda: not self.__committing,
+                                          timeout=1)
+                commits = self.__commits
+            loaded = self.__load_aggregates()
+            with self.__aggregates_lock:
+                if not self.__committing and self.__commits == commits:
+                    self.__aggregates = loaded
+                    self.__aggregates_expiry = (time.monotonic() +
+                                                self.__aggregates_ttl)
+                    return loaded
+        with self.__aggregates_lock:
+            if self.__aggregates is None:
+                self.__aggregates = loaded
+                self.__aggregates_expiry = time.monotonic()
+            return self.__aggregates
+
+    def __load_aggregates(self):
+        """computes the Aggregates of the objects of the database"""
+        select = sqlalchemy.select
+        aggregates = Aggregates(classes)
+        with self.__engine.connect() as connection:
+            counts = {name: connection.execute(
+                select(func.count(cls.id))).scalar()
+                for name, cls in classes.items()}
+            groups = {}
+            for group, (name, attr) in GROUPS.items():
+                column = getattr(classes[name], attr)
+                groups[group] = dict(connection.execute(
+                    select(column, func.count()).group_by(column)).all())
+            averages = {}
+            for average, (name, group, attr) in AVERAGES.items():
+                column = getattr(classes[name], group)
+                value = getattr(classes[name], attr)
+                averages[average] = {
+                    key: (float(total), count)
+                    for key, total, count in connection.execute(
+                        select(column, func.sum(value), func.count(value)).
+                        group_by(column))
+                    if count}
+        aggregates.load(counts, groups, averages)
+        return aggregates
+
+    @staticmethod
+    def __committed(name, obj):
+        """returns the values (see Aggregates.values) of obj, instance of
+        the class name, before the changes of the flush"""
+        values = []
+        attrs = inspect(obj).attrs
+        for attr in COLUMNS.get(name, ()):
+            history = attrs[attr].history
+            if history.deleted:
+                values.append(history.deleted[0])
+            elif history.unchanged:
+                values.append(history.unchanged[0])
+            else:
+                values.append(getattr(obj, attr))
+        return tuple(values)
+
+    def version(self, *cls):
+        """returns a value changing whenever objects of the classes cls
+        (classes or names, every class if none) change, to tell if what
+        was read from them is still up to date (see
+        web_flask/page_cache.py)
+
+        It is read from the database, to see the writes of the other
+        processes: the number of rows and the latest updated_at of every
+        class, with the number of the transactions of this process
+        changing them, which also tells the updates made within the same
+        second as the latest one.
+        """
+        names = [c if type(c) is str else c.__name__ for c in cls]
+        names = [name for name in names or sorted(classes)
+                 if name in classes]
+        versions = self.__versions
+        rows = tuple(tuple(self.__session.execute(sqlalchemy.select(
+            func.count(classes[name].id),
+            func.max(classes[name].updated_at))).one()) for name in names)
+        return sum(versions.get(name, 0) for name in names), rows
+
+    def __after_flush(self, session, flush_context):
+        """records the changes of the aggregates made by a flush, and the
+        classes changed, applied when the transaction is committed"""
+        session.info.setdefault('versions', set()).update(
+            type(obj).__name__ for objs in
+            (session.new, session.dirty, session.deleted) for obj in objs)
+        deltas = session.info.setdefault('aggregates', [])
+        for obj in session.new:
+            name = type(obj).__name__
+            if name in classes:
+                deltas.append((name, None, Aggregates.values(name, obj)))
+        for obj in session.dirty:
+            name = type(obj).__name__
+            if name in COLUMNS:
+                old = self.__committed(name, obj)
+                new = Aggregates.values(name, obj)
+                if old != new:
+                    deltas.append((name, old, new))
+        for obj in session.deleted:
+            name = type(obj).__name__
+            if name in classes:
+                deltas.append((name, self.__committed(name, obj), None))
+
+    def __before_commit(self, session):
+        """counts the commit in progress (see aggregates)"""
+        with self.__aggregates_lock:
+            if not session.info.get('committing'):
+                session.info['committing'] = True
+                self.__committing += 1
+
+    def __after_commit(self, session):
+        """applies the changes of the aggregates of the transaction and
+        increments the versions of the classes it changed"""
+        deltas = session.info.pop('aggregates', ())
+        with self.__aggregates_lock:
+            for name in session.info.pop('versions', ()):
+                self.__versions[name] = self.__versions.get(name, 0) + 1
+            if self.__aggregates is not None:
+                for name, old, new in deltas:
+                    self.__aggregates.apply(name, old, new)
+
+    def __after_transaction_end(self, session, transaction):
+        """counts the end of the commit in progress, committed or not"""
+        if transaction.parent is None and session.info.pop('committing',
+                                                           False):
+            with self.__aggregates_lock:
+                self.__committing -= 1
+                self.__commits += 1
+                if not self.__committing:
+                    self.__no_commit.notify_all()
+
+    def __after_rollback(self, session, previous_transaction):
+        """forgets the changes of the aggregates of the transaction"""
+        session.info.pop('aggregates', None)
+        session.info.pop('versions', None)
+
+    def search(self, query):
+        """returns the (place id, score) pairs of the places matching every
+        word of query in their name, description or reviews, the best
+        first
+
+        Every word is looked up in the full-text indexes of the database
+        (see _text_scores).
+        """
+        scores = None
+        for word in terms(query):
+            found = self._text_scores(self.__session, word)
+            if scores is None:
+                scores = found
+            else:
+                scores = {place_id: score + found[place_id]
+                          for place_id, score in scores.items()
+                          if place_id in found}
+            if not scores:
+                break
+        return rank(scores or {})
+
+    def range_query(self, cls, bounds):
+        """returns the objects of cls whose attributes are in bounds
+        (attribute -> (minimum, maximum), inclusive, None for no bound),
+        selected with the indexes of the columns"""
+        if type(cls) is str:
+            cls = classes[cls]
+        query = self.__session.query(cls)
+        for attr, (low, high) in bounds.items():
+            column = getattr(cls, attr)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        return query.all()
+
+    def ordered(self, cls, attr, descending=False, limit=None,
+                related=None):
+        """returns the objects of cls sorted by attr then id (descending if
+        descending), at most limit of them, only those whose attribute
+        related[0] is related[1] if related is given, with ORDER BY and
+        LIMIT on the indexes of the columns"""
+        if type(cls) is str:
+            cls = classes[cls]
+        query = self.__session.query(cls)
+        if related is not None:
+            query = query.filter(getattr(cls, related[0]) == related[1])
+        columns = (getattr(cls, attr), cls.id)
+        if descending:
+            columns = [column.desc() for column in columns]
+        query = query.order_by(*columns)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def state_tree(self):
+        """returns the (state, [cities]) pairs of the states sorted by name,
+        with their cities sorted by name, with two queries reading the
+        indexes ix_states_name and ix_cities_state_id_name in order"""
+        cities = {}
+        query = self.__session.query(City).order_by(City.state_id, City.name)
+        for city in query:
+            cities.setdefault(city.state_id, []).append(city)
+        return [(state, cities.get(state.id, [])) for state in
+                self.__session.query(State).order_by(State.name)]
+
+    def within(self, south, west, north, east, bounds=None):
+        """returns the places in a box of latitudes and longitudes
+        (crossing the antimeridian if west > east), selected with the index
+        of the coordinates, only those whose attributes are in bounds (see
+        range_query) if given"""
+        places = []
+        for s, w, n, e in ranges(south, west, north, east):
+            places.extend(self.range_query(Place, dict(
+                bounds or {}, latitude=(s, n), longitude=(w, e))))
+        return places
+
+    def nearest(self, latitude, longitude, radius, k=None, bounds=None):
+        """returns the (place, distance) pairs of the places at most radius
+        kilometers away from a point, the nearest first, at most k of them
+        if k is not None, only those whose attributes are in bounds (see
+        range_query) if given
+
+        The places of the box around the circle are selected with the
+        index of the coordinates, then their distance computed here.
+        """
+        places = self.within(*box_around(latitude, longitude, radius),
+                             bounds=bounds)
+        return closest(((place, place.latitude, place.longitude)
+                        for place in places), latitude, longitude, radius, k)
+
+    def _text_scores(self, session, word):
+        """returns the scores of the places containing word in one of the
+        fields of CLASS_FIELDS by place id, summing the MySQL relevance of
+        the FULLTEXT index of every field times its weight"""
+        scores = {}
+        for name, fields in CLASS_FIELDS.items():
+            table = classes[name].__tablename__
+            place_id = "id" if name == "Place" else "place_id"
+            for attr, weight in fields:
+                match = "MATCH({}) AGAINST (:word IN BOOLEAN MODE)".format(
+                    attr)
+                rows = session.execute(text(
+                    "SELECT {}, {} FROM {} WHERE {}".format(
+                        place_id, match, table, match)), {"word": word})
+                for id, score in rows:
+                    scores[id] = scores.get(id, 0) + weight * score
+        return scores
+
+    def _create_text_index(self, engine, tables=None):
+        """creates the missing FULLTEXT indexes of the fields of
+        CLASS_FIELDS (of the tables named in tables only, if given),
+        returns their names"""
+        inspector = inspect(engine)
+        created = []
+        for name, fields in CLASS_FIELDS.items():
+            table = classes[name].__tablename__
+            if tables is not None and table not in tables:
+                continue
+            existing = {index['name']
+                        for index in inspector.get_indexes(table)}
+            for attr, weight in fields:
+                index = "ft_{}_{}".format(table, attr)
+                if index not in existing:
+                    with engine.begin() as connection:
+                        connection.execute(text(
+                            "ALTER TABLE {} ADD FULLTEXT INDEX {} ({})".
+                            format(table, index, attr)))
+                    created.append(index)
+        return created
+
+    def _drop_text_index(self, engine):
+        """drops the FULLTEXT indexes of the fields of CLASS_FIELDS (to
+        measure what they cost)"""
+        inspector = inspect(engine)
+        for name, fields in CLASS_FIELDS.items():
+            table = classes[name].__tablename__
+            existing = {index['name']
+                        for index in inspector.get_indexes(table)}
+            for attr, weight in fields:
+                index = "ft_{}_{}".format(table, attr)
+                if index in existing:
+                    with engine.begin() as connection:
+                        connection.execute(text(
+                            "ALTER TABLE {} DROP INDEX {}".format(
+                                table, index)))
+
+    def drop_text_index(self):
+        """drops the full-text indexes until upgrade_schema()"""
+        self._drop_text_index(self.__engine)
+
     def count(self, cls=None):
         """retrieves the number of objects of a class or all (if cls==None)"""
-        return len(self.all(cls))
+        total = 0
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                total += self.__session.query(
+                    func.count(classes[clss].id)).scalar()
+        return total
+
+    def related(self, cls, attr, value):
+        """returns the objects of cls whose attribute attr is value"""
+        if type(cls) is str:
+            cls = classes[cls]
+        return self.__session.query(cls).filter(
+            getattr(cls, attr) == value).all()
 
     def new(self, obj):
         """add the object to the current database session"""
+        self.use_primary()
+        self.__changed(type(obj), obj.id)
         self.__session.add(obj)
 
+    def new_many(self, objs):
+        """add every object of objs to the current database session"""
+        self.use_primary()
+        for obj in objs:
+            self.__changed(type(obj), obj.id)
+        self.__session.add_all(objs)
+
+    def save_many(self, objs):
+        """add and commit every object of objs in a single transaction
+
+        The session flushes the objects of a class sharing the same
+        columns with one executemany() INSERT.
+        """
+        now = datetime.utcnow()
+        for obj in objs:
+            obj.updated_at = now
+        self.new_many(objs)
+        self.save()
+
     def save(self):
         """commit all changes of the current database session"""
+        self.use_primary()
+        if self.__cache is not None:
+            session = self.__session
+            for obj in session.dirty | session.deleted:
+                self.__changed(type(obj), obj.id)
         self.__session.commit()
+        self.__invalidate()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
+            self.use_primary()
+            self.__changed(type(obj), obj.id)
             self.__session.delete(obj)
 
+    def cascade_delete(self, obj, progress=None):
+        """deletes obj and the rows depending on it (the cities of a
+        state, the places of a city or of a user, the reviews of a place
+        or of a user) in a single transaction, returns the number of
+        objects deleted
+
+        The ids of the dependents are selected level by level through the
+        foreign keys, then deleted by batches of bulk DELETEs, children
+        first, after each of which progress(deleted, total) is called if
+        given.
+        """
+        from models.place import place_amenity
+        self.use_primary()
+        levels = [(type(obj), [obj.id])]
+        seen = {type(obj): {obj.id}}
+        # levels grows while it is walked: breadth-first over CASCADES
+        for cls, ids in levels:
+            for child_name, attr in CASCADES.get(cls.__name__, ()):
+                child = classes[child_name]
+                found = seen.setdefault(child, set())
+                child_ids = []
+                for start in range(0, len(ids), BATCH):
+                    rows = self.__session.query(child.id).filter(
+                        getattr(child, attr).in_(ids[start:start + BATCH]))
+                    for row in rows:
+                        if row[0] not in found:
+                            found.add(row[0])
+                            child_ids.append(row[0])
+                if child_ids:
+                    levels.append((child, child_ids))
+        total = sum(len(ids) for cls, ids in levels)
+        deleted = 0
+        try:
+            for cls, ids in reversed(levels):
+                for start in range(0, len(ids), BATCH):
+                    batch = ids[start:start + BATCH]
+                    self.__deleted_rows(cls, batch)
+                    if cls is Place:
+                        self.__session.execute(place_amenity.delete().where(
+                            place_amenity.c.place_id.in_(batch)))
+                    self.__session.query(cls).filter(
+                        cls.id.in_(batch)).delete()
+                    for id in batch:
+                        self.__changed(cls, id)
+                    deleted += len(batch)
+                    if progress is not None:
+                        progress(deleted, total)
+            self.save()
+        except Exception:
+            self.__session.rollback()
+            raise
+        return total
+
+    def __deleted_rows(self, cls, ids):
+        """records the changes of the aggregates made by deleting the rows
+        of cls with ids in bulk (without flushing the objects)"""
+        name = cls.__name__
+        self.__session.info.setdefault('versions', set()).add(name)
+        deltas = self.__session.info.setdefault('aggregates', [])
+        attrs = COLUMNS.get(name, ())
+        if not attrs:
+            deltas.extend((name, (), None) for id in ids)
+            return
+        rows = self.__session.query(*(getattr(cls, attr) for attr in attrs))
+        for row in rows.filter(cls.id.in_(ids)):
+            deltas.append((name, tuple(row), None))
+
     def reload(self):
-        """reloads data from the database"""
+        """reloads data from the database
+
+        The missing tables are created with their full-text indexes; those
+        of the existing tables are left to upgrade_schema(), since adding
+        them rebuilds the table.
+        """
+        with self.__aggregates_lock:
+            self.__aggregates = None
+        existing = set(inspect(self.__engine).get_table_names())
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        tables = set(Base.metadata.tables) - existing
+        if tables:
+            self._create_text_index(self.__engine, tables)
+        sess_factory = sessionmaker(bind=self.__engine,
+                                    class_=RoutingSession,
+                                    replicas=self.__replicas,
+                                    expire_on_commit=False)
+        event.listen(sess_factory, 'after_flush', self.__after_flush)
+        event.listen(sess_factory, 'before_commit', self.__before_commit)
+        event.listen(sess_factory, 'after_commit', self.__after_commit)
+        event.listen(sess_factory, 'after_transaction_end',
+                     self.__after_transaction_end)
+        event.listen(sess_factory, 'after_soft_rollback',
+                     self.__after_rollback)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def upgrade_schema(self):
+        """creates the tables and indexes of the models missing from the
+        database, returns the names of the indexes created
+
+        reload() creates the missing tables (with their full-text
+        indexes) only: the indexes added to the models since an existing
+        table was created, and the full-text indexes of an existing table,
+        are added here.
+        """
+        Base.metadata.create_all(self.__engine)
+        inspector = inspect(self.__engine)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            existing = {index['name']
+                        for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda i: i.name):
+                if index.name not in existing:
+                    index.create(self.__engine)
+                    created.append(index.name)
+        return created + self._create_text_index(self.__engine)
+
     def close(self):
         """call remove() method on the private session attribute"""
+        self.__invalidate()
         self.__session.remove()
-
@@ -3,14 +3,31 @@
 Contains the FileStorage class
 """
 
+import atexit
+from datetime import datetime
 import json
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, time
 from models.city import City
+from models.engine.aggregates import Aggregates
+from models.engine.cascade import BATCH, CASCADES, FOREIGN_KEYS
+from models.engine.columns import SCAN_RATIO, PlaceColumns
+from models.engine.group_commit import GroupCommit
+from models.engine.hierarchy import StateTree
+from models.engine.indexes import (RANGES, ForeignKeyIndex, RangeIndex,
+                                   within_bounds)
+from models.engine.ordering import order
+from models.engine.spatial import (GridIndex, box_around, closest,
+                                   coordinates, ranges)
+from models.engine.text_search import TextIndex, rank, terms
+from models.engine.write_behind import WriteBehind
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+import os
+from os import getenv
+import threading
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -23,12 +40,65 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # lock - guards __objects against concurrent requests
+    __lock = threading.RLock()
+    # lock - serializes the writes of the JSON file
+    __write_lock = threading.Lock()
+    # dictionary - the secondary indexes of __objects by name
+    __indexes = {"{}.{}".format(*fk): ForeignKeyIndex(*fk)
+                 for fk in FOREIGN_KEYS}
+    __indexes.update(("{}.{}".format(*attr), RangeIndex(*attr))
+                     for attr in RANGES)
+    __indexes[Aggregates.name] = Aggregates(classes)
+    __indexes[TextIndex.name] = TextIndex()
+    __indexes[GridIndex.name] = GridIndex()
+    __indexes[PlaceColumns.name] = PlaceColumns()
+    __indexes[StateTree.name] = StateTree()
+    # dictionary - the indexes of each class name
+    __class_indexes = {}
+    # dictionary - the number of changes of the objects of each class name
+    __versions = {}
+    # the size and modification time of the JSON file last read or written
+    __file_stat = None
+    # set - the keys deleted from __objects since the file was last written,
+    # not to be read back from it
+    __deleted = set()
+    # the keys of the JSON file last read or written
+    __file_keys = frozenset()
+
+    def __init__(self):
+        """enables group commit or write-behind from the environment
+
+        HBNB_GROUP_COMMIT is the window in milliseconds during which
+        concurrent saves are merged into a single write of the file.
+        HBNB_WRITE_BEHIND is the maximum age in seconds of an unsaved
+        change when the file is written by a background thread instead,
+        HBNB_WRITE_BEHIND_MAX the number of changes forcing a write. Each
+        of these writes first merges what other processes wrote to the
+        file (see __merge).
+        """
+        window = getenv("HBNB_GROUP_COMMIT")
+        interval = getenv("HBNB_WRITE_BEHIND")
+        self.__committer = None
+        self.__flusher = None
+        if interval is not None:
+            self.__flusher = WriteBehind(
+                self.__write_behind, float(interval or 1),
+                int(getenv("HBNB_WRITE_BEHIND_MAX", "1000")))
+            atexit.register(self.__flusher.stop)
+        elif window is not None:
+            self.__committer = GroupCommit(self.__write,
+                                           float(window or 0) / 1000)
 
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """returns the dictionary __objects, or a new dictionary of the
+        objects of cls built from a snapshot of __objects taken under the
+        lock (the write-behind thread may change __objects meanwhile)"""
         if cls is not None:
+            with self.__lock:
+                items = list(self.__objects.items())
             new_dict = {}
-            for key, value in self.__objects.items():
+            for key, value in items:
                 if cls == value.__class__ or cls == value.__class__.__name__:
                     new_dict[key] = value
             return new_dict
@@ -37,41 +107,369 @@ class FileStorage:
     def get(self, cls, id):
         """retrieves an object of a class with id"""
         if cls is not None:
-            res = list(
-                filter(
-                    lambda x: type(x) is cls and x.id == id,
-                    self.__objects.values()
-                )
-            )
-            if res:
-                return res[0]
+            name = cls if type(cls) is str else cls.__name__
+            return self.__objects.get("{}.{}".format(name, id))
         return None
 
+    def iter_all(self, cls=None, batch_size=1000):
+        """yields the objects of a class or all (if cls==None) one by one
+
+        The objects are taken from a snapshot of the references of
+        __objects, so that they can be saved or deleted meanwhile.
+        batch_size is ignored: every object is already in memory.
+        """
+        with self.__lock:
+            objs = list(self.__objects.values())
+        for obj in objs:
+            if (cls is None or cls == obj.__class__ or
+                    cls == obj.__class__.__name__):
+                yield obj
+
     def count(self, cls=None):
         """retrieves the number of objects of a class or all (if cls==None)"""
-        return len(self.all(cls))
+        if cls is None:
+            return len(self.__objects)
+        return sum(1 for obj in self.iter_all(cls))
+
+    def related(self, cls, attr, value):
+        """returns the objects of cls whose attribute attr is value"""
+        name = cls if type(cls) is str else cls.__name__
+        index = self.__indexes.get(name + "." + attr)
+        if index is None:
+            objs = self.all(name).values()
+        else:
+            objs = (self.__objects.get(key) for key in index.keys(value))
+        return [obj for obj in objs
+                if obj is not None and getattr(obj, attr, None) == value]
+
+    def range_query(self, cls, bounds):
+        """returns the objects of cls whose attributes are in bounds
+        (attribute -> (minimum, maximum), inclusive, None for no bound)
+
+        The objects are taken from the RangeIndex of the most selective
+        attribute with one, then checked against the other bounds, unless
+        that range holds more than 1 / SCAN_RATIO of the objects: then
+        every bound is evaluated at once on the PlaceColumns.
+        """
+        name = cls if type(cls) is str else cls.__name__
+        with self.__lock:
+            best = None
+            for attr, (low, high) in bounds.items():
+                index = self.__indexes.get(name + "." + attr)
+                if isinstance(index, RangeIndex):
+                    count = index.count(low, high)
+                    if best is None or count < best[0]:
+                        best = (count, index)
+            columns = self.__indexes.get(PlaceColumns.name)
+            if (columns is not None and name in columns.classes and
+                    (best is None or best[0] * SCAN_RATIO > len(columns))):
+                keys = columns.select(bounds)
+                if keys is not None:
+                    return [self.__objects[key] for key in keys]
+            if best is None:
+                objs = list(self.all(name).values())
+            else:
+                low, high = bounds[best[1].attr]
+                objs = [self.__objects[key]
+                        for key in best[1].range(low, high)]
+        return [obj for obj in objs if within_bounds(obj, bounds)]
+
+    def ordered(self, cls, attr, descending=False, limit=None,
+                related=None):
+        """returns the objects of cls sorted by attr then id (see order()),
+        at most limit of them, only those whose attribute related[0] is
+        related[1] if related is given
+
+        Without related, the order of the RangeIndex of attr is used if
+        there is one and it holds every object of cls.
+        """
+        name = cls if type(cls) is str else cls.__name__
+        if related is not None:
+            return order(self.related(name, *related), attr, descending,
+                         limit)
+        with self.__lock:
+            index = self.__indexes.get(name + "." + attr)
+            if (isinstance(index, RangeIndex) and index.count() ==
+                    self.__indexes[Aggregates.name].count(name)):
+                keys = index.range()
+                if descending:
+                    keys.reverse()
+                objs = [self.__objects.get(key) for key in keys[:limit]]
+                if None not in objs:
+                    return objs
+            objs = list(self.all(name).values())
+        return order(objs, attr, descending, limit)
+
+    def state_tree(self):
+        """returns the (state, [cities]) pairs of the states sorted by name,
+        with their cities sorted by name, read from the StateTree"""
+        tree = []
+        with self.__lock:
+            objs = self.__objects
+            for state_id, city_ids in self.__indexes[StateTree.name].tree():
+                state = objs.get("State." + state_id)
+                if state is not None:
+                    cities = (objs.get("City." + city_id)
+                              for city_id in city_ids)
+                    tree.append((state, [city for city in cities
+                                         if city is not None]))
+        return tree
+
+    def version(self, *cls):
+        """returns a number changing whenever objects of the classes cls
+        (classes or names, every class if none) are added or deleted, to
+        tell if what was read from them is still up to date (see
+        web_flask/page_cache.py)"""
+        names = [c if type(c) is str else c.__name__ for c in cls]
+        versions = self.__versions
+        return sum(versions.get(name, 0) for name in names or versions)
+
+    def __changed(self, names):
+        """increments the versions of the class names, the caller holds
+        __lock"""
+        for name in names:
+            self.__versions[name] = self.__versions.get(name, 0) + 1
+
+    def aggregates(self):
+        """returns the Aggregates of the objects, kept up to date by new(),
+        reload() and delete()"""
+        return self.__indexes[Aggregates.name]
+
+    def search(self, query):
+        """returns the (place id, score) pairs of the places matching every
+        word of query in their name, description or reviews, the best
+        first (see TextIndex)"""
+        with self.__lock:
+            index = self.__indexes.get(TextIndex.name)
+            if index is None:
+                return []
+            scores = index.search(terms(query))
+            scores = {place_id: score for place_id, score in scores.items()
+                      if "Place." + place_id in self.__objects}
+        return rank(scores)
+
+    def within(self, south, west, north, east, bounds=None):
+        """returns the places in a box of latitudes and longitudes
+        (crossing the antimeridian if west > east), found in the cells of
+        the GridIndex, only those whose attributes are in bounds (see
+        range_query) if given
+
+        With bounds, the box is one more pair of bounds of range_query(),
+        on the latitude and longitude (evaluated with the other bounds on
+        the PlaceColumns when they select many places).
+        """
+        if not bounds:
+            with self.__lock:
+                return [self.__objects[key] for key, lat, lon in
+                        self.__indexes[GridIndex.name].within(
+                            south, west, north, east)]
+        places = []
+        for s, w, n, e in ranges(south, west, north, east):
+            places.extend(self.range_query(
+                "Place", dict(bounds, latitude=(s, n), longitude=(w, e))))
+        # the class attributes of a place without coordinates are 0.0
+        return [place for place in places if coordinates(place) is not None]
+
+    def nearest(self, latitude, longitude, radius, k=None, bounds=None):
+        """returns the (place, distance) pairs of the places at most radius
+        kilometers away from a point, the nearest first, at most k of them
+        if k is not None, only those whose attributes are in bounds (see
+        range_query) if given"""
+        box = box_around(latitude, longitude, radius)
+        if bounds:
+            points = [(place,) + coordinates(place)
+                      for place in self.within(*box, bounds=bounds)]
+        else:
+            with self.__lock:
+                points = [(self.__objects[key], lat, lon)
+                          for key, lat, lon in
+                          self.__indexes[GridIndex.name].within(*box)]
+        return closest(points, latitude, longitude, radius, k)
+
+    def drop_text_index(self):
+        """stops indexing the words of the objects (to measure what it
+        costs), until the process restarts"""
+        with self.__lock:
+            index = self.__indexes.pop(TextIndex.name, None)
+            self.__class_indexes.clear()
+            if index is not None:
+                index.clear()
+
+    def __indexes_of(self, name):
+        """returns the indexes of the objects of the class name"""
+        indexes = self.__class_indexes.get(name)
+        if indexes is None:
+            indexes = [index for index in self.__indexes.values()
+                       if name in index.classes]
+            self.__class_indexes[name] = indexes
+        return indexes
+
+    def __index(self, key, obj):
+        """adds obj to the indexes, the caller holds __lock"""
+        for index in self.__indexes_of(obj.__class__.__name__):
+            index.add(key, obj)
+
+    def __unindex(self, key):
+        """removes key from the indexes, the caller holds __lock"""
+        for index in self.__indexes_of(key.split(".", 1)[0]):
+            index.remove(key)
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__lock:
+                self.__objects[key] = obj
+                self.__deleted.discard(key)
+                self.__index(key, obj)
+                self.__changed((obj.__class__.__name__,))
+            if self.__flusher is not None:
+                self.__flusher.mark(key)
+
+    def new_many(self, objs):
+        """sets in __objects every obj of objs"""
+        objs = {obj.__class__.__name__ + "." + obj.id: obj for obj in objs}
+        with self.__lock:
+            self.__objects.update(objs)
+            self.__deleted.difference_update(objs)
+            for key, obj in objs.items():
+                self.__index(key, obj)
+            self.__changed({key.split(".", 1)[0] for key in objs})
+        if self.__flusher is not None:
+            for key in objs:
+                self.__flusher.mark(key)
+
+    def save_many(self, objs):
+        """adds and saves every obj of objs with a single write"""
+        now = datetime.utcnow()
+        for obj in objs:
+            obj.updated_at = now
+        self.new_many(objs)
+        self.save()
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        if self.__flusher is not None:
+            self.__flusher.mark()
+        elif self.__committer is not None:
+            self.__committer.commit()
+        else:
+            self.__write()
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    def flush(self):
+        """writes the pending changes of write-behind mode now"""
+        if self.__flusher is not None:
+            self.__flusher.flush()
+
+    def force_sync(self):
+        """leaves write-behind mode: flushes, then saves synchronously"""
+        if self.__flusher is not None:
+            flusher = self.__flusher
+            self.__flusher = None
+            flusher.stop()
+            atexit.unregister(flusher.stop)
+
+    def __write(self, merge=False):
+        """writes a snapshot of __objects to the JSON file, after merging
+        the changes of other processes if merge"""
+        with self.__write_lock:
+            if merge:
+                self.__merge()
+            with self.__lock:
+                json_objects = {}
+                for key in self.__objects:
+                    json_objects[key] = self.__objects[key].to_dict()
+                self.__deleted.clear()
+            with open(self.__file_path, 'w') as f:
+                json.dump(json_objects, f)
+            self.__file_stat = self.__stat()
+            self.__file_keys = set(json_objects)
+
+    def __write_behind(self):
+        """writes the file from write-behind mode, where close() does not
+        reload it: what other processes wrote is merged first"""
+        self.__write(merge=True)
+
+    def __merge(self):
+        """reads the objects other processes changed in the JSON file since
+        this process last read or wrote it, the caller holds __write_lock
+
+        The object with the newest updated_at wins. The objects deleted by
+        this process since its last write stay deleted; those no longer
+        in the file that were in it are deleted from __objects.
+        """
         try:
+            stat = self.__stat()
+            if self.__file_stat is None or stat == self.__file_stat:
+                return
             with open(self.__file_path, 'r') as f:
                 jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+        except (OSError, ValueError):
+            return
+        objs = {}
+        for key, values in jo.items():
+            obj = self.__objects.get(key)
+            if obj is None or (str(self.__updated_at(obj)) <
+                               str(values.get("updated_at"))):
+                objs[key] = classes[values["__class__"]](**values)
+        with self.__lock:
+            for key in self.__file_keys - jo.keys():
+                if self.__objects.pop(key, None) is not None:
+                    self.__unindex(key)
+            for key in self.__deleted.intersection(objs):
+                del objs[key]
+            self.__objects.update(objs)
+            for key, obj in objs.items():
+                self.__index(key, obj)
+            self.__changed(classes)
+
+    def __stat(self):
+        """returns the path, size and modification time of the JSON file"""
+        stat = os.stat(self.__file_path)
+        return self.__file_path, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def __updated_at(obj):
+        """returns updated_at of obj as written in the JSON file"""
+        updated_at = getattr(obj, "updated_at", None)
+        if isinstance(updated_at, datetime):
+            return updated_at.strftime(time)
+        return updated_at
+
+    def reload(self):
+        """deserializes the JSON file to __objects
+
+        Nothing is read if the file is the one this process last read or
+        wrote (same path, size and modification time). Otherwise only the
+        objects whose updated_at differs from the one in memory are built
+        and indexed again.
+        """
+        self.flush()
+        try:
+            with self.__write_lock:
+                stat = self.__stat()
+                if stat == self.__file_stat:
+                    return
+                with open(self.__file_path, 'r') as f:
+                    jo = json.load(f)
+                objs = {}
+                for key, values in jo.items():
+                    obj = self.__objects.get(key)
+                    if (obj is None or self.__updated_at(obj) !=
+                            values.get("updated_at")):
+                        objs[key] = classes[values["__class__"]](**values)
+                # under __write_lock: no write can empty __deleted before
+                # the objects read are added
+                with self.__lock:
+                    for key in self.__deleted.intersection(objs):
+                        del objs[key]
+                    self.__objects.update(objs)
+                    for key, obj in objs.items():
+                        self.__index(key, obj)
+                    # written by another process: anything may have changed
+                    self.__changed(classes)
+                    self.__file_stat = stat
+                    self.__file_keys = set(jo)
         except Exception:
             pass
 
@@ -79,10 +477,61 @@ class FileStorage:
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__lock:
+                if key in self.__objects:
+                    del self.__objects[key]
+                    self.__deleted.add(key)
+                    self.__unindex(key)
+                    self.__changed((obj.__class__.__name__,))
+            if self.__flusher is not None:
+                self.__flusher.mark(key)
+
+    def __dependents(self, obj):
+        """returns the keys of obj and of the objects to delete with it"""
+        keys = [obj.__class__.__name__ + "." + obj.id]
+        seen = set(keys)
+        # keys grows while it is walked: breadth-first over CASCADES
+        for key in keys:
+            name, id = key.split(".", 1)
+            for child, attr in CASCADES.get(name, ()):
+                index = self.__indexes[child + "." + attr]
+                for child_key in sorted(index.keys(id)):
+                    if child_key not in seen and child_key in self.__objects:
+                        seen.add(child_key)
+                        keys.append(child_key)
+        return keys
+
+    def cascade_delete(self, obj, progress=None):
+        """deletes obj and the objects depending on it (the cities of a
+        state, the places of a city or of a user, the reviews of a place
+        or of a user) with a single save, returns the number of objects
+        deleted
+
+        The dependents are found with the foreign key indexes. They are
+        deleted by batches, after each of which progress(deleted, total)
+        is called if given.
+        """
+        with self.__lock:
+            keys = self.__dependents(obj)
+        total = len(keys)
+        for start in range(0, total, BATCH):
+            batch = keys[start:start + BATCH]
+            with self.__lock:
+                for key in batch:
+                    if self.__objects.pop(key, None) is not None:
+                        self.__deleted.add(key)
+                        self.__unindex(key)
+                self.__changed({key.split(".", 1)[0] for key in batch})
+            if self.__flusher is not None:
+                for key in batch:
+                    self.__flusher.mark(key)
+            if progress is not None:
+                progress(start + len(batch), total)
+        self.save()
+        return total
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
-
+        if self.__flusher is None:
+            # in write-behind mode the objects in memory are the newest
+            self.reload()
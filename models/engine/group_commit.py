@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Contains the class GroupCommit
+"""
+
+import threading
+import time
+
+
+class GroupCommit:
+    """coalesces the concurrent flushes of a storage into a single one
+
+    Every caller of commit() takes a ticket. The first caller finding no
+    flush running becomes the leader: it waits for the window, then
+    flushes once for every ticket taken so far. The other callers wait
+    until a flush that started after their ticket completes.
+    """
+
+    def __init__(self, flush, window=0.0):
+        """flush is called without arguments, window is in seconds"""
+        self.__flush = flush
+        self.__window = window
+        self.__cond = threading.Condition()
+        self.__requested = 0
+        self.__durable = 0
+        self.__flushing = False
+        self.commits = 0
+        self.flushes = 0
+
+    def commit(self):
+        """blocks until all the changes made before the call are flushed"""
+        with self.__cond:
+            self.__requested += 1
+            self.commits += 1
+            ticket = self.__requested
+            while self.__durable < ticket and self.__flushing:
+                self.__cond.wait()
+            if self.__durable >= ticket:
+                return
+            self.__flushing = True
+        try:
+            if self.__window:
+                time.sleep(self.__window)
+            with self.__cond:
+                batch = self.__requested
+            self.__flush()
+        except BaseException:
+            # the waiting callers elect a new leader and retry
+            with self.__cond:
+                self.__flushing = False
+                self.__cond.notify_all()
+            raise
+        with self.__cond:
+            self.__durable = batch
+            self.__flushing = False
+            self.flushes += 1
+            self.__cond.notify_all()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+Contains the class StateTree, the states and their cities sorted by name,
+kept up to date by FileStorage
+"""
+
+from bisect import bisect_left, insort
+from models.engine.indexes import Index
+
+
+def entry(obj):
+    """returns the sort key of a state or a city: by name (compared as a
+    string) then id, those without a name last"""
+    name = getattr(obj, "name", None)
+    return name is None, "" if name is None else str(name), obj.id
+
+
+class StateTree(Index):
+    """the ids of the states sorted by name and, for each state, the ids of
+    its cities sorted by name
+
+    A new, renamed or moved object is inserted by bisection in the sorted
+    list of its state (or of the states): the tree is never sorted again.
+    tree() builds the ids in order once, then returns them until a state
+    or a city changes.
+    """
+    name = "states.cities"
+    classes = ("State", "City")
+
+    def __init__(self):
+        """creates an empty tree"""
+        # the sort keys of the states, sorted, and of each state id
+        self.__states = []
+        self.__state_keys = {}
+        # the sort keys of the cities of each state id, sorted, and the
+        # (state id, sort key) of each city id
+        self.__cities = {}
+        self.__city_keys = {}
+        # the (state id, city ids) pairs in order, None if out of date
+        self.__tree = None
+
+    def add(self, key, obj):
+        """inserts the state or city obj at its place"""
+        name, id = key.split(".", 1)
+        if name == "State":
+            sort_key = entry(obj)
+            if self.__state_keys.get(id) == sort_key:
+                return
+            self.remove(key)
+            insort(self.__states, sort_key)
+            self.__state_keys[id] = sort_key
+        else:
+            value = getattr(obj, "state_id", None), entry(obj)
+            if self.__city_keys.get(id) == value:
+                return
+            self.remove(key)
+            insort(self.__cities.setdefault(value[0], []), value[1])
+            self.__city_keys[id] = value
+        self.__tree = None
+
+    def remove(self, key):
+        """removes the state or city of key"""
+        name, id = key.split(".", 1)
+        if name == "State":
+            if id not in self.__state_keys:
+                return
+            sort_key = self.__state_keys.pop(id)
+            del self.__states[bisect_left(self.__states, sort_key)]
+        else:
+            if id not in self.__city_keys:
+                return
+            state_id, sort_key = self.__city_keys.pop(id)
+            cities = self.__cities[state_id]
+            del cities[bisect_left(cities, sort_key)]
+            if not cities:
+                del self.__cities[state_id]
+        self.__tree = None
+
+    def clear(self):
+        """forgets every state and city"""
+        self.__states.clear()
+        self.__state_keys.clear()
+        self.__cities.clear()
+        self.__city_keys.clear()
+        self.__tree = None
+
+    def tree(self):
+        """returns the (state id, [city ids]) pairs of the states sorted by
+        name, with their cities sorted by name (not to be modified)"""
+        if self.__tree is None:
+            self.__tree = [(state_id, [city[-1] for city in
+                                       self.__cities.get(state_id, ())])
+                           for _, _, state_id in self.__states]
+        return self.__tree
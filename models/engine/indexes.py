@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+"""
+Contains the secondary indexes kept up to date by FileStorage
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+
+# the numeric attributes searched by range: (class name, attribute)
+RANGES = (
+    ("Place", "price_by_night"),
+    ("Place", "max_guest"),
+    ("Place", "number_rooms"),
+    ("Place", "number_bathrooms"),
+)
+
+
+class Index(ABC):
+    """base class of the indexes of FileStorage
+
+    FileStorage calls add() from new() and reload() (for a new object or
+    a new version of an object) and remove() from delete(), with the
+    key <class name>.<id>, for the objects of the classes listed in
+    `classes`.
+    """
+    name = None
+    classes = ()
+
+    @abstractmethod
+    def add(self, key, obj):
+        """indexes obj, replacing what was indexed under key"""
+
+    @abstractmethod
+    def remove(self, key):
+        """forgets what was indexed under key"""
+
+    @abstractmethod
+    def clear(self):
+        """forgets everything"""
+
+
+class ForeignKeyIndex(Index):
+    """maps the values of a foreign key to the keys of the objects"""
+
+    def __init__(self, cls_name, attr):
+        """indexes the attribute attr of the instances of cls_name"""
+        self.name = "{}.{}".format(cls_name, attr)
+        self.classes = (cls_name,)
+        self.attr = attr
+        self.__keys = {}
+        self.__values = {}
+
+    def add(self, key, obj):
+        """indexes obj under the value of its foreign key"""
+        value = getattr(obj, self.attr, None)
+        if key in self.__values:
+            if self.__values[key] == value:
+                return
+            self.remove(key)
+        self.__values[key] = value
+        self.__keys.setdefault(value, set()).add(key)
+
+    def remove(self, key):
+        """forgets the foreign key of key"""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        keys = self.__keys[value]
+        keys.discard(key)
+        if not keys:
+            del self.__keys[value]
+
+    def clear(self):
+        """forgets everything"""
+        self.__keys.clear()
+        self.__values.clear()
+
+    def keys(self, value):
+        """returns the keys of the objects whose foreign key is value"""
+        return set(self.__keys.get(value, ()))
+
+
+def number(value):
+    """returns value as a float, or None if it is not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def within_bounds(obj, bounds):
+    """tells if the attributes of obj are in bounds (attribute ->
+    (minimum, maximum), inclusive, None for no bound)"""
+    for attr, (low, high) in bounds.items():
+        value = number(getattr(obj, attr, None))
+        if (value is None or (low is not None and value < low) or
+                (high is not None and value > high)):
+            return False
+    return True
+
+
+class RangeIndex(Index):
+    """the keys of the objects sorted by the numeric value of an attribute,
+    to find those whose value is in a range by bisection
+
+    The sorted lists are built by the first query, then kept sorted by
+    insertion. After more than REBUILD changes (or one per thousand
+    entries) between two queries they are dropped and sorted again by the
+    next one: a bulk load costs a single sort instead of an insertion per
+    object.
+    """
+    REBUILD = 64
+
+    def __init__(self, cls_name, attr):
+        """indexes the attribute attr of the instances of cls_name"""
+        self.name = "{}.{}".format(cls_name, attr)
+        self.classes = (cls_name,)
+        self.attr = attr
+        # (value, key) sorted, and the values alone for the bisections,
+        # None until the next query if they are out of date
+        self.__entries = None
+        self.__numbers = None
+        self.__changes = 0
+        self.__values = {}
+
+    def add(self, key, obj):
+        """indexes obj under the value of its attribute"""
+        value = number(getattr(obj, self.attr, None))
+        if self.__values.get(key) == value:
+            return
+        self.remove(key)
+        if value is None:
+            return
+        self.__values[key] = value
+        if self.__change():
+            position = bisect_left(self.__entries, (value, key))
+            self.__entries.insert(position, (value, key))
+            self.__numbers.insert(position, value)
+
+    def remove(self, key):
+        """forgets the value of key"""
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        if self.__change():
+            position = bisect_left(self.__entries, (value, key))
+            del self.__entries[position]
+            del self.__numbers[position]
+
+    def __change(self):
+        """counts a change, returns True if the sorted lists are still to
+        be updated"""
+        if self.__entries is None:
+            return False
+        self.__changes += 1
+        if self.__changes > max(self.REBUILD, len(self.__entries) // 1000):
+            self.__entries = self.__numbers = None
+            return False
+        return True
+
+    def clear(self):
+        """forgets everything"""
+        self.__entries = self.__numbers = None
+        self.__values.clear()
+
+    def __bounds(self, low, high):
+        """returns the positions of the first entry in [low, high] and
+        after the last one, sorting the entries first if needed"""
+        if self.__entries is None:
+            self.__entries = sorted((value, key)
+                                    for key, value in self.__values.items())
+            self.__numbers = [value for value, key in self.__entries]
+        self.__changes = 0
+        start = 0 if low is None else bisect_left(self.__numbers, low)
+        end = (len(self.__numbers) if high is None else
+               bisect_right(self.__numbers, high))
+        return start, max(start, end)
+
+    def count(self, low=None, high=None):
+        """returns the number of objects whose value is in [low, high]"""
+        start, end = self.__bounds(low, high)
+        return end - start
+
+    def range(self, low=None, high=None):
+        """returns the keys of the objects whose value is in [low, high]
+        (None for no bound), by increasing value"""
+        start, end = self.__bounds(low, high)
+        return [key for value, key in self.__entries[start:end]]
+
+    def keys(self, value):
+        """returns the keys of the objects whose value is value"""
+        value = number(value)
+        if value is None:
+            return set()
+        return set(self.range(value, value))
@@ -0,0 +1,256 @@
+#!/usr/bin/python3
+"""
+Migrates the objects of a FileStorage JSON file to the database of
+DBStorage, or the objects of the database to a FileStorage JSON file
+
+usage: HBNB_TYPE_STORAGE=db python3 -m models.engine.migrate to-db FILE
+                                   [-b BATCH] [-p] [-c CHECKPOINT]
+       HBNB_TYPE_STORAGE=db python3 -m models.engine.migrate to-file FILE
+                                   [-b BATCH]
+
+The database is the one selected by the environment (HBNB_TYPE_STORAGE=db
+or sqlite and their settings). The ids and dates of the objects are kept.
+
+to-db commits every BATCH objects and records the last id committed of
+every class in the CHECKPOINT file (FILE.checkpoint by default): run again
+after a failure, it resumes where it stopped. With -p, the classes of a
+wave (see WAVES) are migrated in parallel threads. The objects whose
+parent (city of a place...) is not in the file are skipped.
+
+to-file streams the tables to a temporary file renamed to FILE at the end.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sys
+import threading
+import time
+
+# the classes migrated together, every class after the classes it refers to
+WAVES = (("Amenity", "State", "User"), ("City",), ("Place",), ("Review",))
+# the foreign keys of the classes: attribute -> class name
+PARENTS = {
+    "City": {"state_id": "State"},
+    "Place": {"city_id": "City", "user_id": "User"},
+    "Review": {"place_id": "Place", "user_id": "User"},
+}
+
+
+class Checkpoint:
+    """the last id migrated of every class, kept in a JSON file"""
+
+    def __init__(self, path):
+        """loads the checkpoint file path if it exists"""
+        self.path = path
+        self.ids = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.ids = json.load(f)
+
+    def last(self, name):
+        """returns the last id of the class name migrated, or None"""
+        return self.ids.get(name)
+
+    def done(self, name, id):
+        """records that the objects of name up to id are migrated"""
+        with self.lock:
+            self.ids[name] = id
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.ids, f)
+            os.replace(tmp, self.path)
+
+    def remove(self):
+        """deletes the checkpoint file of a completed migration"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Progress:
+    """counts the objects migrated and reports the rows per second"""
+
+    def __init__(self, report=sys.stderr):
+        """prints the progress to report"""
+        self.report = report
+        self.start = time.perf_counter()
+        self.counts = {}
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    def add(self, name, n):
+        """records n more objects of the class name"""
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + n
+            elapsed = time.perf_counter() - self.start
+            print("{}: {:d} rows ({:.0f} rows/s overall)".format(
+                name, self.counts[name], self.total() / elapsed),
+                file=self.report)
+
+    def total(self):
+        """returns the number of objects migrated"""
+        return sum(self.counts.values())
+
+    def summary(self):
+        """prints the number of objects migrated and the rate"""
+        elapsed = time.perf_counter() - self.start
+        print("{:d} rows in {:.2f}s ({:.0f} rows/s), {:d} skipped".format(
+            self.total(), elapsed, self.total() / elapsed if elapsed else 0,
+            self.skipped), file=self.report)
+
+
+def load_file(path):
+    """returns the records of a FileStorage JSON file by class name, sorted
+    by id, without the objects missing a parent"""
+    with open(path) as f:
+        objects = json.load(f)
+    records = {}
+    for record in objects.values():
+        records.setdefault(record.get("__class__"), []).append(record)
+    ids = {name: {record["id"] for record in records.get(name, ())}
+           for wave in WAVES for name in wave}
+    skipped = 0
+    for name in list(records):
+        if name not in ids:
+            skipped += len(records.pop(name))
+    # the parents first, so that the children of a skipped object are
+    # skipped too
+    for name in (name for wave in WAVES for name in wave):
+        if name not in records:
+            continue
+        valid = [record for record in records[name]
+                 if all(record.get(attr) in ids[parent]
+                        for attr, parent in PARENTS.get(name, {}).items())]
+        skipped += len(records[name]) - len(valid)
+        valid.sort(key=lambda record: record["id"])
+        records[name] = valid
+        ids[name] = {record["id"] for record in valid}
+    return records, skipped
+
+
+def migrate_class(storage, name, records, batch_size, checkpoint,
+                  progress, amenity_ids=()):
+    """adds the records of the class name to the database, committing
+    every batch_size objects (with the links of the places to the
+    amenities of amenity_ids)"""
+    from models.engine.db_storage import classes
+    cls = classes[name]
+    last = checkpoint.last(name)
+    if last is not None:
+        records = [record for record in records if record["id"] > last]
+    resumed = last is not None
+    storage.use_primary()
+    try:
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            if resumed:
+                # the batch may have been committed after the checkpoint
+                batch = [record for record in batch
+                         if storage.get(cls, record["id"]) is None]
+                resumed = False
+            storage.new_many([cls(**record) for record in batch])
+            if name == "Place":
+                links = set()
+                for record in batch:
+                    for amenity_id in record.get("amenity_ids") or ():
+                        if amenity_id in amenity_ids:
+                            links.add((record["id"], amenity_id))
+                storage.new_place_amenities(sorted(links))
+            storage.save()
+            checkpoint.done(name, records[min(start + batch_size,
+                                              len(records)) - 1]["id"])
+            progress.add(name, len(batch))
+    finally:
+        storage.close()
+
+
+def to_db(storage, path, batch_size=1000, parallel=False, checkpoint=None,
+          report=sys.stderr):
+    """migrates the objects of the JSON file path to the database of
+    storage, returns the Progress of the migration"""
+    records, skipped = load_file(path)
+    checkpoint = Checkpoint(checkpoint or path + ".checkpoint")
+    progress = Progress(report)
+    progress.skipped = skipped
+    amenity_ids = {record["id"] for record in records.get("Amenity", ())}
+    for wave in WAVES:
+        names = [name for name in wave if records.get(name)]
+        if parallel and len(names) > 1:
+            with ThreadPoolExecutor(len(names)) as pool:
+                futures = [pool.submit(migrate_class, storage, name,
+                                       records[name], batch_size,
+                                       checkpoint, progress, amenity_ids)
+                           for name in names]
+                for future in futures:
+                    future.result()
+        else:
+            for name in names:
+                migrate_class(storage, name, records[name], batch_size,
+                              checkpoint, progress, amenity_ids)
+    checkpoint.remove()
+    progress.summary()
+    return progress
+
+
+def to_file(storage, path, batch_size=1000, report=sys.stderr):
+    """writes the objects of the database of storage to the JSON file
+    path, returns the Progress of the migration"""
+    from models.engine.db_storage import classes
+    progress = Progress(report)
+    links = {}
+    for place_id, amenity_id in storage.iter_place_amenities(batch_size):
+        links.setdefault(place_id, []).append(amenity_id)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            sep = "{"
+            for wave in WAVES:
+                for name in wave:
+                    count = 0
+                    for obj in storage.iter_all(classes[name], batch_size):
+                        record = obj.to_dict()
+                        if name == "Place":
+                            record["amenity_ids"] = links.get(obj.id, [])
+                        f.write("{}{}: {}".format(
+                            sep, json.dumps(name + "." + obj.id),
+                            json.dumps(record)))
+                        sep = ", "
+                        count += 1
+                        if count % batch_size == 0:
+                            progress.add(name, batch_size)
+                    if count % batch_size:
+                        progress.add(name, count % batch_size)
+            f.write("{}" if sep == "{" else "}")
+        os.replace(tmp, path)
+    finally:
+        storage.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    progress.summary()
+    return progress
+
+
+def main():
+    """parses the command line and runs the migration"""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("direction", choices=("to-db", "to-file"))
+    parser.add_argument("file")
+    parser.add_argument("-b", "--batch", type=int, default=1000)
+    parser.add_argument("-p", "--parallel", action="store_true")
+    parser.add_argument("-c", "--checkpoint")
+    args = parser.parse_args()
+    import models
+    if models.storage_t != "db":
+        parser.error("HBNB_TYPE_STORAGE must select a database")
+    if args.direction == "to-db":
+        to_db(models.storage, args.file, args.batch, args.parallel,
+              args.checkpoint)
+    else:
+        to_file(models.storage, args.file, args.batch)
+
+
+if __name__ == "__main__":
+    main()
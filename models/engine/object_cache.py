@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Contains the class ObjectCache
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class ObjectCache:
+    """a process-wide cache of the column values of objects by key, with
+    least recently used eviction and a time to live
+
+    It is shared by the threads of the process: every method holds the
+    lock of the cache.
+    """
+
+    def __init__(self, size=1000, ttl=60.0, clock=time.monotonic):
+        """keeps at most size entries, each for ttl seconds"""
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """returns the values cached under key, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self.__entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, values):
+        """caches values under key, evicting the least recently used"""
+        with self.__lock:
+            self.__entries[key] = (self.clock() + self.ttl, values)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """forgets the values cached under key"""
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        """forgets every entry"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """returns the metrics of the cache"""
+        with self.__lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self.__entries), "max_size": self.size,
+                    "ttl": self.ttl, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Contains the function order, sorting objects by an attribute
+"""
+
+import heapq
+from models.engine.indexes import RANGES, number
+
+# the attributes compared as numbers
+NUMERIC = {attr for cls, attr in RANGES}
+
+
+def comparable(value):
+    """returns value in a form comparable with any other value: the numbers
+    first, then the strings, then the other values by their string, None
+    if value is None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return 0, value
+    if isinstance(value, str):
+        return 1, value
+    return 2, str(value)
+
+
+def sort_key(attr):
+    """returns the key sorting objects by their attribute attr, then by id"""
+    if attr in NUMERIC:
+        return lambda obj: (number(getattr(obj, attr, None)), obj.id)
+    return lambda obj: (comparable(getattr(obj, attr, None)), obj.id)
+
+
+def order(objs, attr, descending=False, limit=None):
+    """returns objs sorted by their attribute attr then by id (both
+    descending if descending), those without a value last, at most limit
+    of them
+
+    With a limit, the first objects are found with a heap of limit objects
+    (heapq.nsmallest() or nlargest()) instead of sorting them all.
+    """
+    key = sort_key(attr)
+    valued = []
+    missing = []
+    for obj in objs:
+        (missing if key(obj)[0] is None else valued).append(obj)
+    if limit is None:
+        valued.sort(key=key, reverse=descending)
+    else:
+        select = heapq.nlargest if descending else heapq.nsmallest
+        valued = select(limit, valued, key=key)
+    missing.sort(key=lambda obj: obj.id, reverse=descending)
+    objs = valued + missing
+    return objs if limit is None else objs[:limit]
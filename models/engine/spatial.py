@@ -0,0 +1,147 @@
+#!/usr/bin/python3
+"""
+Contains the geometry of the spatial search of the places and the class
+GridIndex used by FileStorage
+"""
+
+import heapq
+from models.engine.indexes import Index
+import math
+
+# the mean radius of the Earth in kilometers
+EARTH_RADIUS = 6371.0088
+# the size in degrees of the cells of GridIndex
+CELL = 1.0
+
+
+def coordinates(obj):
+    """returns the (latitude, longitude) of a place as floats, or None if
+    it has no valid coordinates set on the instance (the class attributes
+    of a place of FileStorage are not coordinates)"""
+    attrs = vars(obj)
+    try:
+        latitude = float(attrs["latitude"])
+        longitude = float(attrs["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return latitude, longitude
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """returns the great-circle distance in kilometers between two points
+    (haversine formula)"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) *
+         math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def ranges(south, west, north, east):
+    """returns the (south, west, north, east) boxes without wrapping
+    covering a box, which crosses the antimeridian if west > east"""
+    if west <= east:
+        return [(south, west, north, east)]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+
+def box_around(latitude, longitude, radius):
+    """returns the (south, west, north, east) box containing the points
+    at most radius kilometers away from a point"""
+    dlat = math.degrees(radius / EARTH_RADIUS)
+    south = max(-90.0, latitude - dlat)
+    north = min(90.0, latitude + dlat)
+    if south == -90.0 or north == 90.0:
+        # a pole is in the circle: every longitude
+        return south, -180.0, north, 180.0
+    dlon = math.degrees(radius / EARTH_RADIUS /
+                        math.cos(math.radians(latitude)))
+    if dlon >= 180:
+        return south, -180.0, north, 180.0
+    west = longitude - dlon
+    east = longitude + dlon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return south, west, north, east
+
+
+def closest(points, latitude, longitude, radius, k=None):
+    """returns the (value, distance) pairs of the points (value, latitude,
+    longitude) at most radius kilometers away from a point, the nearest
+    first, at most k of them if k is not None"""
+    found = []
+    for value, lat, lon in points:
+        d = distance(latitude, longitude, lat, lon)
+        if d <= radius:
+            found.append((value, d))
+    if k is not None:
+        return heapq.nsmallest(k, found, key=lambda item: item[1])
+    return sorted(found, key=lambda item: item[1])
+
+
+class GridIndex(Index):
+    """a grid of cells of CELL degrees mapping every cell to the keys of
+    the places located in it, with their coordinates"""
+    name = "spatial"
+    classes = ("Place",)
+
+    def __init__(self, cell=CELL):
+        """creates an empty grid of cells of cell degrees"""
+        self.cell = cell
+        self.__cells = {}
+        self.__points = {}
+
+    def __cell(self, latitude, longitude):
+        """returns the cell of a point"""
+        return (math.floor(latitude / self.cell),
+                math.floor(longitude / self.cell))
+
+    def add(self, key, obj):
+        """indexes the coordinates of obj, replacing those of key"""
+        point = coordinates(obj)
+        if self.__points.get(key) == point:
+            return
+        self.remove(key)
+        if point is not None:
+            self.__points[key] = point
+            self.__cells.setdefault(self.__cell(*point), {})[key] = point
+
+    def remove(self, key):
+        """forgets the coordinates of key"""
+        point = self.__points.pop(key, None)
+        if point is None:
+            return
+        cell = self.__cell(*point)
+        keys = self.__cells[cell]
+        del keys[key]
+        if not keys:
+            del self.__cells[cell]
+
+    def clear(self):
+        """forgets everything"""
+        self.__cells.clear()
+        self.__points.clear()
+
+    def within(self, south, west, north, east):
+        """yields the (key, latitude, longitude) of the places in a box
+        (crossing the antimeridian if west > east)"""
+        for s, w, n, e in ranges(south, west, north, east):
+            low = self.__cell(s, w)
+            high = self.__cell(n, e)
+            cells = (high[0] - low[0] + 1) * (high[1] - low[1] + 1)
+            if cells > len(self.__cells):
+                # fewer cells are occupied than covered by the box
+                found = (points for cell, points in self.__cells.items()
+                         if low[0] <= cell[0] <= high[0] and
+                         low[1] <= cell[1] <= high[1])
+            else:
+                found = (self.__cells.get((i, j), {})
+                         for i in range(low[0], high[0] + 1)
+                         for j in range(low[1], high[1] + 1))
+            for points in found:
+                for key, (lat, lon) in points.items():
+                    if s <= lat <= n and w <= lon <= e:
+                        yield key, lat, lon
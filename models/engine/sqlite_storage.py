@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.base_model import Base
+from models.engine.db_storage import DBStorage, classes
+from models.engine.text_search import CLASS_FIELDS
+from os import getenv
+from sqlalchemy import create_engine, event, text
+
+# pragmas applied to every new connection of the engine
+PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("foreign_keys", "ON"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-65536"),
+    ("mmap_size", "268435456"),
+    ("busy_timeout", "5000"),
+)
+
+
+def set_pragmas(dbapi_connection, connection_record):
+    """tunes a new SQLite connection (WAL journal, relaxed fsync...)"""
+    cursor = dbapi_connection.cursor()
+    for name, value in PRAGMAS:
+        cursor.execute("PRAGMA {}={}".format(name, value))
+    cursor.close()
+
+
+def text_tables():
+    """yields the table, FTS5 table, place id column and fields (attribute,
+    weight) of every class of CLASS_FIELDS"""
+    for name, fields in CLASS_FIELDS.items():
+        table = classes[name].__tablename__
+        place_id = "id" if name == "Place" else "place_id"
+        yield table, table + "_fts", place_id, fields
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an embedded SQLite database file"""
+
+    def _create_engine(self, path=None):
+        """builds the engine of the SQLite database file path (default
+        HBNB_SQLITE_PATH)"""
+        path = path or getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        engine = create_engine('sqlite:///{}'.format(path),
+                               connect_args={'check_same_thread': False})
+        event.listen(engine, 'connect', set_pragmas)
+        return engine
+
+    def _create_replica_engines(self):
+        """builds the engines of the SQLite files listed (comma separated)
+        in HBNB_SQLITE_REPLICA_PATHS, standing in for read replicas
+
+        Nothing copies the data of the primary to these files, so their
+        tables are created here.
+        """
+        paths = getenv('HBNB_SQLITE_REPLICA_PATHS', '')
+        engines = [self._create_engine(path.strip())
+                   for path in paths.split(',') if path.strip()]
+        for engine in engines:
+            Base.metadata.create_all(engine)
+        return engines
+
+    def _text_scores(self, session, word):
+        """returns the scores of the places containing word in one of the
+        fields of CLASS_FIELDS by place id, summing the BM25 rank of the
+        FTS5 table of every table weighted by field"""
+        scores = {}
+        for table, fts, place_id, fields in text_tables():
+            weights = ", ".join(str(weight) for attr, weight in fields)
+            rows = session.execute(text(
+                "SELECT t.{}, -bm25({}, {}) FROM {} JOIN {} t "
+                "ON t.rowid = {}.rowid WHERE {} MATCH :word".format(
+                    place_id, fts, weights, fts, table, fts, fts)),
+                {"word": '"{}"'.format(word.replace('"', '""'))})
+            for id, score in rows:
+                scores[id] = scores.get(id, 0) + score
+        return scores
+
+    def _create_text_index(self, engine, tables=None):
+        """creates the FTS5 tables indexing the fields of CLASS_FIELDS (of
+        the tables named in tables only, if given) and the triggers keeping
+        them up to date, if missing, returns their names
+
+        The FTS5 tables are external content tables, reading the fields
+        from their table by rowid: a VACUUM may change the rowids, after
+        which drop_text_index() then upgrade_schema() rebuilds them.
+        """
+        created = []
+        with engine.begin() as connection:
+            triggers = {row[0] for row in connection.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger'"))}
+            for table, fts, place_id, fields in text_tables():
+                if fts + "_ai" in triggers or (tables is not None and
+                                               table not in tables):
+                    continue
+                columns = ", ".join(attr for attr, weight in fields)
+                new = ", ".join("new." + attr for attr, weight in fields)
+                old = ", ".join("old." + attr for attr, weight in fields)
+                insert = ("INSERT INTO {0}(rowid, {1}) VALUES "
+                          "(new.rowid, {2});".format(fts, columns, new))
+                delete = ("INSERT INTO {0}({0}, rowid, {1}) VALUES "
+                          "('delete', old.rowid, {2});".format(
+                              fts, columns, old))
+                for statement in (
+                        "DROP TABLE IF EXISTS {}".format(fts),
+                        "CREATE VIRTUAL TABLE {} USING fts5({}, content={},"
+                        " content_rowid=rowid)".format(fts, columns, table),
+                        "CREATE TRIGGER {}_ai AFTER INSERT ON {} BEGIN {} "
+                        "END".format(fts, table, insert),
+                        "CREATE TRIGGER {}_ad AFTER DELETE ON {} BEGIN {} "
+                        "END".format(fts, table, delete),
+                        "CREATE TRIGGER {}_au AFTER UPDATE OF {} ON {} "
+                        "BEGIN {} {} END".format(fts, columns, table,
+                                                 delete, insert),
+                        "INSERT INTO {0}({0}) VALUES ('rebuild')".format(
+                            fts)):
+                    connection.execute(text(statement))
+                created.append(fts)
+        return created
+
+    def _drop_text_index(self, engine):
+        """drops the FTS5 tables and their triggers (to measure what they
+        cost)"""
+        with engine.begin() as connection:
+            for table, fts, place_id, fields in text_tables():
+                for suffix in ("_ai", "_ad", "_au"):
+                    connection.execute(text(
+                        "DROP TRIGGER IF EXISTS {}{}".format(fts, suffix)))
+                connection.execute(text("DROP TABLE IF EXISTS {}".format(
+                    fts)))
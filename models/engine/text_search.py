@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""
+Contains the full-text search of the places: the fields searched, the
+tokenizer and the class TextIndex used by FileStorage
+"""
+
+from models.engine.indexes import Index
+import math
+import re
+
+# the fields searched: (class name, attribute, weight in the score), the
+# score of a review counting for its place
+FIELDS = (
+    ("Place", "name", 3.0),
+    ("Place", "description", 1.0),
+    ("Review", "text", 0.5),
+)
+# the fields searched by class name: [(attribute, weight)]
+CLASS_FIELDS = {}
+for _cls, _attr, _weight in FIELDS:
+    CLASS_FIELDS.setdefault(_cls, []).append((_attr, _weight))
+# the words of a text
+WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    """returns the lowercase words of text"""
+    if not isinstance(text, str):
+        return []
+    return WORD.findall(text.lower())
+
+
+def terms(query):
+    """returns the distinct words of a search query, in order"""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def rank(scores):
+    """returns the (place id, score) pairs of scores (place id -> score),
+    the best first (then by id)"""
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TextIndex(Index):
+    """an inverted index of the words of the FIELDS of the places and
+    reviews, mapping every word to the keys of the objects containing it
+    with the weighted number of occurrences
+
+    search() returns the places containing every word of a query in their
+    fields or in the text of one of their reviews, scored by tf-idf.
+    """
+    name = "text"
+    classes = tuple(sorted({cls for cls, attr, weight in FIELDS}))
+
+    def __init__(self):
+        """creates an empty index"""
+        self.__postings = {}
+        self.__docs = {}
+
+    @staticmethod
+    def document(key, obj):
+        """returns the place id and the weighted term frequencies of obj"""
+        name = key.split(".", 1)[0]
+        place_id = obj.id if name == "Place" else getattr(obj, "place_id",
+                                                          None)
+        frequencies = {}
+        for cls, attr, weight in FIELDS:
+            if cls == name:
+                for word in tokenize(getattr(obj, attr, None)):
+                    frequencies[word] = frequencies.get(word, 0) + weight
+        return place_id, frequencies
+
+    def add(self, key, obj):
+        """indexes the words of obj, replacing what was indexed under key"""
+        document = self.document(key, obj)
+        if self.__docs.get(key) == document:
+            return
+        self.remove(key)
+        self.__docs[key] = document
+        for word, frequency in document[1].items():
+            self.__postings.setdefault(word, {})[key] = frequency
+
+    def remove(self, key):
+        """forgets the words of key"""
+        document = self.__docs.pop(key, None)
+        if document is None:
+            return
+        for word in document[1]:
+            postings = self.__postings[word]
+            del postings[key]
+            if not postings:
+                del self.__postings[word]
+
+    def clear(self):
+        """forgets everything"""
+        self.__postings.clear()
+        self.__docs.clear()
+
+    def search(self, words):
+        """returns the scores of the places matching every word of words
+        by place id"""
+        scores = None
+        total = len(self.__docs)
+        for word in words:
+            postings = self.__postings.get(word, {})
+            idf = math.log(1 + total / len(postings)) if postings else 0
+            found = {}
+            for key, frequency in postings.items():
+                place_id = self.__docs[key][0]
+                found[place_id] = found.get(place_id, 0) + frequency * idf
+            if scores is None:
+                scores = found
+            else:
+                scores = {place_id: score + found[place_id]
+                          for place_id, score in scores.items()
+                          if place_id in found}
+            if not scores:
+                break
+        return scores or {}
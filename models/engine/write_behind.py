@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Contains the class WriteBehind
+"""
+
+import threading
+import time
+
+
+class WriteBehind:
+    """persists the changes of a storage from a background thread
+
+    The storage marks the keys it changes; the thread flushes once the
+    oldest unflushed change is `interval` seconds old or `max_dirty` keys
+    are dirty, so a change is never more than `interval` seconds (plus the
+    time of one write) away from the disk.
+    """
+
+    def __init__(self, flush, interval=1.0, max_dirty=1000):
+        """flush is called without arguments, interval is in seconds"""
+        self.__flush = flush
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self.__cond = threading.Condition()
+        self.__flush_lock = threading.Lock()
+        self.__dirty = set()
+        self.__oldest = None
+        self.__stopped = False
+        self.flushes = 0
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def mark(self, key=None):
+        """records a change of key (None for an untracked change)"""
+        with self.__cond:
+            first = not self.__dirty
+            if first:
+                self.__oldest = time.monotonic()
+            self.__dirty.add(key)
+            if first or len(self.__dirty) >= self.max_dirty:
+                self.__cond.notify()
+
+    def pending(self):
+        """returns the number of dirty keys"""
+        with self.__cond:
+            return len(self.__dirty)
+
+    def staleness(self):
+        """returns the age in seconds of the oldest unflushed change"""
+        with self.__cond:
+            if not self.__dirty:
+                return 0.0
+            return time.monotonic() - self.__oldest
+
+    def flush(self):
+        """persists the pending changes now, from the calling thread"""
+        with self.__flush_lock:
+            with self.__cond:
+                dirty = self.__dirty
+                oldest = self.__oldest
+                self.__dirty = set()
+                self.__oldest = None
+            if not dirty:
+                return
+            try:
+                self.__flush()
+            except BaseException:
+                with self.__cond:
+                    self.__dirty |= dirty
+                    self.__oldest = oldest
+                raise
+            self.flushes += 1
+
+    def stop(self):
+        """stops the thread and flushes what is left"""
+        with self.__cond:
+            self.__stopped = True
+            self.__cond.notify()
+        if self.__thread is not threading.current_thread():
+            self.__thread.join()
+        self.flush()
+
+    def __due(self):
+        """tells if the pending changes must be flushed now"""
+        if not self.__dirty:
+            return False
+        return (len(self.__dirty) >= self.max_dirty or
+                time.monotonic() - self.__oldest >= self.interval)
+
+    def __run(self):
+        """flushes whenever the pending changes are due"""
+        while True:
+            with self.__cond:
+                while not self.__stopped and not self.__due():
+                    if self.__dirty:
+                        timeout = self.__oldest + self.interval
+                        self.__cond.wait(timeout - time.monotonic())
+                    else:
+                        self.__cond.wait()
+                if self.__stopped:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                # kept dirty, retried on the next interval
+                with self.__cond:
+                    self.__cond.wait(self.interval)
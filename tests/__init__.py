@@ -0,0 +1,5 @@
+#!/usr/bin/python3
+"""the tests expect the storage to save synchronously"""
+import os
+
+os.environ.pop("HBNB_WRITE_BEHIND", None)
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import batch
+import inspect
+import models
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the batch view"""
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/vi/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/vi/views/batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(batch.__doc__) >= 1)
+        for name, func in inspect.getmembers(batch, inspect.isfunction):
+            if func.__module__ == batch.__name__:
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} function needs a docstring".format(
+                                    name))
+
+
+class TestBatch(unittest.TestCase):
+    """Test POST /api/v1/batch"""
+
+    def setUp(self):
+        """creates a state, and the client of the API"""
+        self.client = app.test_client()
+        self.state = State(name="Batched")
+        self.state.save()
+        self.created = [self.state.id]
+
+    def tearDown(self):
+        """deletes the states created"""
+        for state_id in self.created:
+            state = models.storage.get(State, state_id)
+            if state is not None:
+                models.storage.cascade_delete(state)
+        models.storage.close()
+
+    def batch(self, requests, status=200):
+        """runs a batch, returns the list of the results"""
+        response = self.client.post('/api/v1/batch', json=requests)
+        self.assertEqual(response.status_code, status)
+        return response.get_json()
+
+    def test_streamed(self):
+        """Test that a streamed list is read within the batch, which closes
+        the storage once, after every sub-request"""
+        results = self.batch([
+            {"path": "/states"},
+            {"method": "POST", "path": "/states", "body": {"name": "Later"}},
+        ])
+        self.assertIn("Batched", [state.get("name")
+                                  for state in results[0]["body"]])
+        self.assertEqual(results[1]["status"], 201)
+        self.created.append(results[1]["body"]["id"])
+        if models.storage_t == 'db':
+            # the session of the batch was closed at its teardown
+            self.assertFalse(models.storage.uses_primary())
+
+    def test_order(self):
+        """Test that the sub-requests run in order, each seeing the writes
+        of the previous ones"""
+        path = "/states/" + self.state.id
+        results = self.batch([
+            {"method": "GET", "path": path},
+            {"method": "PUT", "path": path, "body": {"name": "Renamed"}},
+            {"path": "/api/v1" + path},
+        ])
+        self.assertEqual([result["status"] for result in results],
+                         [200, 200, 200])
+        self.assertEqual([results[0]["body"]["name"],
+                          results[2]["body"]["name"]], ["Batched", "Renamed"])
+
+    def test_parallel(self):
+        """Test that the parallel GETs keep the order of their results"""
+        results = self.batch({"requests": [
+            {"path": "/status"},
+            {"path": "/states/" + self.state.id},
+            {"path": "/states/nope"},
+        ], "parallel": True})
+        self.assertEqual([result["status"] for result in results],
+                         [200, 200, 404])
+        self.assertEqual(results[1]["body"]["id"], self.state.id)
+
+    def test_errors(self):
+        """Test the errors of the sub-requests and of the batch"""
+        results = self.batch([
+            {"path": "/states/nope"},
+            {"method": "POST", "path": "/states", "body": {}},
+            {"method": "POST", "path": "/batch", "body": []},
+        ])
+        self.assertEqual(results[0], {"status": 404,
+                                      "body": {"error": "Not found"}})
+        self.assertEqual([result["status"] for result in results[1:]],
+                         [400, 400])
+        self.assertEqual(results[2]["body"], {"error": "Nested batch"})
+        for requests in ({}, [{"method": "GET"}],
+                         [{"path": "/status"}] * (batch.MAX_REQUESTS + 1)):
+            self.batch(requests, 400)
+
+    def test_invalid_method(self):
+        """Test that a batch with an invalid method is rejected before any
+        sub-request runs"""
+        count = models.storage.count(State)
+        for method in (1, None, "FETCH"):
+            self.batch([
+                {"method": "POST", "path": "/states",
+                 "body": {"name": "Never"}},
+                {"method": method, "path": "/states"},
+            ], 400)
+        self.assertEqual(models.storage.count(State), count)
+
+    def test_parallel_primary(self):
+        """Test that the parallel GETs after a write read the primary"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing a database")
+        dispatch = batch.dispatch
+        primary = []
+
+        def record(sub):
+            """records the routing of the session of the sub-request"""
+            primary.append(models.storage.uses_primary())
+            return dispatch(sub)
+        with mock.patch.object(batch, 'dispatch', side_effect=record):
+            results = self.batch({"requests": [
+                {"method": "POST", "path": "/states",
+                 "body": {"name": "Parallel"}},
+                {"path": "/states"},
+                {"path": "/states/" + self.state.id},
+            ], "parallel": True})
+        self.created.append(results[0]["body"]["id"])
+        self.assertIn("Parallel", [state["name"]
+                                   for state in results[1]["body"]])
+        self.assertEqual(primary, [True] * 3)
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestStats classes
+"""
+
+from api.v1.app import app
+from api.v1.views import index
+import inspect
+import models
+from models.state import State
+import unittest
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the documentation of the index view"""
+
+    def test_index_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(index.__doc__) >= 1)
+        for name, func in inspect.getmembers(index, inspect.isfunction):
+            if func.__module__ == index.__name__:
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} function needs a docstring".format(
+                                    name))
+
+
+class TestStats(unittest.TestCase):
+    """Test GET /api/v1/stats"""
+
+    def setUp(self):
+        """creates the client of the API"""
+        self.client = app.test_client()
+
+    def stats(self):
+        """returns the numbers of objects of the stats"""
+        response = self.client.get('/api/v1/stats')
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_stats(self):
+        """Test that the stats count every class"""
+        stats = self.stats()
+        self.assertEqual(sorted(stats), sorted(index.STATS))
+        self.assertEqual(stats["states"], models.storage.count(State))
+
+    def test_other_process(self):
+        """Test that the stats count at once the writes of other
+        processes in the database"""
+        if models.storage_t != 'db':
+            self.skipTest("not testing a database")
+        before = self.stats()["states"]
+        engine = models.storage._DBStorage__engine
+        # a write which does not go through the session, as from another
+        # process
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO states (id, created_at, updated_at, name) "
+                "VALUES ('stats-process', '2017-01-01 00:00:00', "
+                "'2017-01-01 00:00:00', 'Other')")
+        try:
+            self.assertEqual(self.stats()["states"], before + 1)
+        finally:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "DELETE FROM states WHERE id = 'stats-process'")
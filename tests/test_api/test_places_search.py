@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesSearch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import places
+import inspect
+import models
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the places view"""
+
+    def test_pep8_conformance_places(self):
+        """Test that api/vi/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/vi/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(places.__doc__) >= 1)
+        for name, func in inspect.getmembers(places, inspect.isfunction):
+            if func.__module__ == places.__name__:
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} function needs a docstring".format(
+                                    name))
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test POST /api/v1/places_search"""
+
+    def setUp(self):
+        """creates places in Paris and Versailles, and the client of the
+        API"""
+        self.client = app.test_client()
+        self.user = User(email="search@hbnb.io", password="pwd")
+        self.state = State(name="Searched")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.places = [Place(name=name, city_id=self.city.id,
+                             user_id=self.user.id, latitude=lat,
+                             longitude=lon, price_by_night=price,
+                             max_guest=guests)
+                       for name, lat, lon, price, guests in (
+                           ("Paris", 48.8566, 2.3522, 200, 2),
+                           ("Versailles", 48.8049, 2.1204, 50, 6))]
+        models.storage.save_many([self.user, self.state, self.city] +
+                                 self.places)
+
+    def tearDown(self):
+        """deletes the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def search(self, data):
+        """returns the names of the places found"""
+        response = self.client.post('/api/v1/places_search', json=data)
+        self.assertEqual(response.status_code, 200)
+        return [place["name"] for place in response.get_json()]
+
+    def test_near_k(self):
+        """Test that k gives the nearest places, after the ranges"""
+        near = {"latitude": 48.8566, "longitude": 2.3522, "radius": 50,
+                "k": 1}
+        self.assertEqual(self.search({"near": near}), ["Paris"])
+        self.assertEqual(self.search({"near": near,
+                                      "price_by_night": {"max": 100}}),
+                         ["Versailles"])
+        self.assertEqual(self.search({"near": near,
+                                      "max_guest": {"min": 4}}),
+                         ["Versailles"])
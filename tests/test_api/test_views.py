@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Contains the TestViewsDocs and TestStreamJson classes
+"""
+
+from api.v1.app import app
+from api.v1 import views
+import inspect
+import models
+import unittest
+from unittest import mock
+
+
+class TestViewsDocs(unittest.TestCase):
+    """Tests to check the documentation of the helpers of the views"""
+
+    def test_views_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(views.__doc__) >= 1)
+        for name, func in inspect.getmembers(views, inspect.isfunction):
+            if func.__module__ == views.__name__:
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} function needs a docstring".format(
+                                    name))
+
+
+class TestStreamJson(unittest.TestCase):
+    """Test the responses of stream_json"""
+
+    def setUp(self):
+        """creates the client of the API"""
+        self.client = app.test_client()
+
+    def test_read(self):
+        """Test that the storage is closed once the stream is read"""
+        with mock.patch.object(models.storage, 'close',
+                               wraps=models.storage.close) as close:
+            response = self.client.get('/api/v1/states')
+            self.assertIs(type(response.get_json()), list)
+            response.close()
+        self.assertEqual(close.call_count, 1)
+
+    def test_not_read(self):
+        """Test that the storage is closed when the response is closed
+        before its body is read"""
+        with mock.patch.object(models.storage, 'close',
+                               wraps=models.storage.close) as close:
+            with app.test_request_context('/api/v1/states'):
+                response = views.stream_json(iter(()))
+            self.assertEqual(close.call_count, 0)
+            response.close()
+        self.assertEqual(close.call_count, 1)
@@ -5,8 +5,15 @@ Contains the class TestConsoleDocs
 
 import console
 import inspect
+import io
+import json
+import models
+from models.state import State
+import os
 import pep8
+import tempfile
 import unittest
+from unittest import mock
 HBNBCommand = console.HBNBCommand
 
 
@@ -39,3 +46,162 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsoleBatch(unittest.TestCase):
+    """Class for testing the batch mode of the console"""
+    def run_batch(self, commands, commit_every=0):
+        """runs commands in batch mode, returns the number of saves"""
+        out = io.StringIO()
+        with mock.patch.object(models.storage, "save") as save:
+            with mock.patch("sys.stdout", out):
+                count = HBNBCommand().run_batch(io.StringIO(commands),
+                                                commit_every, out)
+        self.assertIn("{:d} commands in".format(count), out.getvalue())
+        return count, save.call_count
+
+    def test_batch_saves_once(self):
+        """Test that batch mode saves once at the end"""
+        commands = 'create State name="Ohio"\n' * 5 + "\n# comment\n"
+        self.assertEqual(self.run_batch(commands), (5, 1))
+
+    def test_batch_commit_every(self):
+        """Test that batch mode saves every n changes"""
+        commands = 'create Amenity name="Wifi"\n' * 5 + "all Amenity\n"
+        self.assertEqual(self.run_batch(commands, 2), (6, 3))
+
+    def test_batch_stops_on_quit(self):
+        """Test that quit ends the batch"""
+        commands = 'create State name="Utah"\nquit\ncreate State\n'
+        self.assertEqual(self.run_batch(commands), (2, 1))
+
+
+class TestConsoleImportExport(unittest.TestCase):
+    """Class for testing the NDJSON import and export of the console"""
+    def run_command(self, line):
+        """runs a console command, returns what it printed"""
+        out = io.StringIO()
+        with mock.patch("sys.stdout", out):
+            HBNBCommand().onecmd(line)
+        return out.getvalue()
+
+    def test_export_import(self):
+        """Test that exported objects are imported back unchanged"""
+        state = State(name="Maine")
+        models.storage.new(state)
+        models.storage.save()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "states.ndjson")
+            out = self.run_command("export State " + path)
+            self.assertEqual(out, "{:d} exported\n".format(
+                models.storage.count(State)))
+            with open(path) as f:
+                lines = [line for line in f if state.id in line]
+            self.assertEqual(len(lines), 1)
+            models.storage.delete(state)
+            models.storage.save()
+            with open(path, "w") as f:
+                f.write(lines[0] + "not json\n")
+            out = self.run_command("import " + path)
+            self.assertEqual(out, "1 imported, 1 skipped\n")
+        copy = models.storage.get(State, state.id)
+        self.assertEqual(copy.name, "Maine")
+        self.assertEqual(copy.created_at, state.created_at)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_import_failed(self):
+        """Test that a failed import leaves the objects as they were"""
+        state = State(name="Kept")
+        models.storage.new(state)
+        models.storage.save()
+        new = State(name="Imported")
+        lines = [json.dumps(dict(state.to_dict(), name="Replaced")),
+                 json.dumps(new.to_dict()), json.dumps(new.to_dict())]
+        new_many = models.storage.new_many
+        calls = []
+
+        def fail(objs):
+            """adds the first two chunks, fails on the third one"""
+            calls.append(objs)
+            if len(calls) > 2:
+                raise ValueError("disk full")
+            new_many(objs)
+        command = HBNBCommand()
+        command.chunk_size = 1
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "states.ndjson")
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            out = io.StringIO()
+            with mock.patch("sys.stdout", out), \
+                    mock.patch.object(models.storage, "new_many", fail):
+                command.onecmd("import " + path)
+        self.assertEqual(out.getvalue(), "** import failed after 2: "
+                         "disk full **\n")
+        self.assertEqual(models.storage.get(State, state.id).name, "Kept")
+        self.assertIsNone(models.storage.get(State, new.id))
+        models.storage.delete(state)
+        models.storage.save()
+
+    def test_errors(self):
+        """Test the messages of invalid commands"""
+        self.assertEqual(self.run_command("import"),
+                         "** file name missing **\n")
+        self.assertEqual(self.run_command("import /nonexistent"),
+                         "** file doesn't exist **\n")
+        self.assertEqual(self.run_command("export"),
+                         "** class name missing **\n")
+        self.assertEqual(self.run_command("export Foo x"),
+                         "** class doesn't exist **\n")
+        self.assertEqual(self.run_command("export State"),
+                         "** file name missing **\n")
+
+
+class TestConsoleCommands(unittest.TestCase):
+    """Class for testing the commands looking up a single instance"""
+    def run_command(self, line):
+        """runs a console command, returns what it printed"""
+        out = io.StringIO()
+        with mock.patch("sys.stdout", out):
+            HBNBCommand().onecmd(line)
+        return out.getvalue()
+
+    def test_show_update_destroy(self):
+        """Test show, update and destroy through storage.get()"""
+        state = State(name="Idaho")
+        state.save()
+        with mock.patch.object(models.storage, "all") as all_objects:
+            self.assertIn(state.id, self.run_command(
+                "show State " + state.id))
+            self.run_command('update State {} name "Iowa"'.format(state.id))
+            self.assertEqual(models.storage.get(State, state.id).name,
+                             "Iowa")
+            self.run_command("destroy State " + state.id)
+            self.assertIsNone(models.storage.get(State, state.id))
+            self.assertFalse(all_objects.called)
+        self.assertEqual(self.run_command("show State " + state.id),
+                         "** no instance found **\n")
+
+    def test_count(self):
+        """Test the count command"""
+        self.assertEqual(self.run_command("count State"),
+                         "{:d}\n".format(models.storage.count(State)))
+        self.assertEqual(self.run_command("count"),
+                         "{:d}\n".format(models.storage.count()))
+        self.assertEqual(self.run_command("count Foo"),
+                         "** class doesn't exist **\n")
+
+    def test_upgrade(self):
+        """Test that upgrade adds nothing to an up to date schema"""
+        if models.storage_t == "db":
+            self.assertEqual(self.run_command("upgrade"),
+                             "0 indexes created\n")
+        else:
+            self.assertEqual(self.run_command("upgrade"),
+                             "** no schema to upgrade **\n")
+
+    def test_all(self):
+        """Test that all prints every instance in a list"""
+        out = self.run_command("all State")
+        self.assertTrue(out.startswith("[") and out.endswith("]\n"))
+        self.assertEqual(out.count("[State]"), models.storage.count(State))
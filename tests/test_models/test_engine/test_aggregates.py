@@ -0,0 +1,210 @@
+#!/usr/bin/python3
+"""
+Contains the TestAggregatesDocs, TestAggregates and TestStorageAggregates
+classes
+"""
+
+import inspect
+import models
+from models.city import City
+from models.engine import aggregates
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+from unittest import mock
+Aggregates = aggregates.Aggregates
+
+
+class TestAggregatesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the aggregates"""
+
+    def test_pep8_conformance_aggregates(self):
+        """Test that models/engine/aggregates.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/aggregates.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_aggregates_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(aggregates.__doc__) >= 1)
+        self.assertTrue(len(Aggregates.__doc__) >= 1)
+        for name, func in inspect.getmembers(Aggregates, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestAggregates(unittest.TestCase):
+    """Test the Aggregates class"""
+
+    def test_add_remove(self):
+        """Test that the aggregates follow the objects added and removed"""
+        agg = Aggregates(("City", "Place"))
+        agg.add("Place.1", Place(city_id="c1", price_by_night=100))
+        agg.add("Place.2", Place(city_id="c1", price_by_night=50))
+        agg.add("Place.3", Place(city_id="c2", price_by_night=10))
+        self.assertEqual(agg.count("Place"), 3)
+        self.assertEqual(agg.group("places_per_city", "c1"), 2)
+        self.assertEqual(agg.average("average_price_by_night", "c1"), 75)
+        # a new version of an object replaces the old one
+        agg.add("Place.2", Place(city_id="c2", price_by_night=30))
+        self.assertEqual(agg.count("Place"), 3)
+        self.assertEqual(agg.group("places_per_city", "c1"), 1)
+        self.assertEqual(agg.average("average_price_by_night", "c2"), 20)
+        agg.remove("Place.1")
+        agg.remove("Place.1")
+        self.assertEqual(agg.count("Place"), 2)
+        self.assertEqual(agg.to_dict()["places_per_city"], {"c2": 2})
+        self.assertIsNone(agg.average("average_price_by_night", "c1"))
+        agg.clear()
+        self.assertEqual(agg.count("Place"), 0)
+
+    def test_apply(self):
+        """Test that apply() records insertions, updates and deletions"""
+        agg = Aggregates()
+        agg.load({"City": 1}, {"cities_per_state": {"s1": 1}}, {})
+        agg.apply("City", None, ("s1",))
+        agg.apply("City", ("s1",), ("s2",))
+        self.assertEqual(agg.count("City"), 2)
+        self.assertEqual(agg.to_dict()["cities_per_state"],
+                         {"s1": 1, "s2": 1})
+        agg.apply("City", ("s2",), None)
+        self.assertEqual(agg.count("City"), 1)
+        self.assertEqual(agg.group("cities_per_state", "s2"), 0)
+
+
+class TestStorageAggregates(unittest.TestCase):
+    """Test the aggregates maintained by the storage"""
+
+    def setUp(self):
+        """creates a state with a city, two places and a review"""
+        self.user = User(email="agg@hbnb.io", password="pwd")
+        self.state = State(name="Aggregated")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.other = City(name="Other", state_id=self.state.id)
+        self.places = [Place(name="Home", city_id=self.city.id,
+                             user_id=self.user.id, price_by_night=price)
+                       for price in (100, 60)]
+        self.review = Review(text="Nice", place_id=self.places[0].id,
+                             user_id=self.user.id)
+        self.before = models.storage.aggregates().count("Place")
+        models.storage.save_many([self.user, self.state, self.city,
+                                  self.other] + self.places + [self.review])
+
+    def tearDown(self):
+        """deletes what is left of the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def test_insert_update_delete(self):
+        """Test that the aggregates follow the saves and deletes"""
+        agg = models.storage.aggregates()
+        self.assertEqual(agg.count("Place"), self.before + 2)
+        self.assertEqual(agg.group("cities_per_state", self.state.id), 2)
+        self.assertEqual(agg.group("places_per_city", self.city.id), 2)
+        self.assertEqual(agg.group("reviews_per_place", self.places[0].id),
+                         1)
+        self.assertEqual(agg.average("average_price_by_night",
+                                     self.city.id), 80)
+        place = models.storage.get(Place, self.places[1].id)
+        place.city_id = self.other.id
+        place.price_by_night = 90
+        place.save()
+        self.assertEqual(agg.group("places_per_city", self.city.id), 1)
+        self.assertEqual(agg.average("average_price_by_night",
+                                     self.other.id), 90)
+        models.storage.delete(models.storage.get(Review, self.review.id))
+        models.storage.save()
+        self.assertEqual(agg.group("reviews_per_place", self.places[0].id),
+                         0)
+
+    def test_cascade_delete(self):
+        """Test that the aggregates follow a cascade delete"""
+        agg = models.storage.aggregates()
+        models.storage.cascade_delete(self.state)
+        self.assertEqual(agg.count("Place"), self.before)
+        self.assertEqual(agg.group("cities_per_state", self.state.id), 0)
+        self.assertEqual(agg.to_dict()["average_price_by_night"].get(
+            self.city.id), None)
+
+    def test_rollback(self):
+        """Test that a change is only counted once committed"""
+        if models.storage_t != 'db':
+            self.skipTest("FileStorage has no transactions")
+        agg = models.storage.aggregates()
+        state = State(name="Rolled back")
+        models.storage.new(state)
+        # the query flushes the state
+        self.assertIsNotNone(models.storage.get(State, state.id))
+        models.storage.close()
+        self.assertEqual(agg.count("State"),
+                         models.storage.count(State))
+
+    def test_other_process(self):
+        """Test that the writes of other processes are seen after the time
+        to live of the aggregates, or after reload()"""
+        if models.storage_t != 'db':
+            self.skipTest("FileStorage counts every write it reloads")
+        storage = models.storage
+        before = storage.aggregates().count("State")
+        engine = storage._DBStorage__engine
+        # a write which does not go through the session, as from another
+        # process
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO states (id, created_at, updated_at, name) "
+                "VALUES ('other-process', '2017-01-01 00:00:00', "
+                "'2017-01-01 00:00:00', 'Other')")
+        try:
+            self.assertEqual(storage.aggregates().count("State"), before)
+            # as if their time to live were over
+            storage._DBStorage__aggregates_expiry = 0
+            self.assertEqual(storage.aggregates().count("State"),
+                             before + 1)
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "DELETE FROM states WHERE id = 'other-process'")
+            self.assertEqual(storage.aggregates().count("State"),
+                             before + 1)
+            storage.close()
+            storage.reload()
+            self.assertEqual(storage.aggregates().count("State"), before)
+        finally:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "DELETE FROM states WHERE id = 'other-process'")
+
+    def test_commit_while_loading(self):
+        """Test that aggregates computed while a commit lands are computed
+        again"""
+        if models.storage_t != 'db':
+            self.skipTest("FileStorage computes them under its lock")
+        storage = models.storage
+        load = storage._DBStorage__load_aggregates
+        calls = []
+        state = State(name="Meanwhile")
+
+        def commit_first(*args):
+            """computes the aggregates, then commits a state on the first
+            call, as another thread would"""
+            aggregates = load(*args)
+            calls.append(aggregates)
+            if len(calls) == 1:
+                storage.new(state)
+                storage.save()
+            return aggregates
+        storage._DBStorage__aggregates_expiry = 0
+        with mock.patch.object(storage, "_DBStorage__load_aggregates",
+                               commit_first):
+            aggregates = storage.aggregates()
+        self.assertEqual(len(calls), 2)
+        self.assertIs(aggregates, calls[1])
+        self.assertEqual(aggregates.count("State"), storage.count(State))
+        storage.delete(storage.get(State, state.id))
+        storage.save()
@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+"""
+Contains the TestCascadeDocs, TestForeignKeyIndex and TestCascadeDelete
+classes
+"""
+
+import inspect
+import models
+from models.city import City
+from models.engine import cascade, indexes
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import threading
+import time
+import unittest
+from unittest import mock
+CascadeJob = cascade.CascadeJob
+ForeignKeyIndex = indexes.ForeignKeyIndex
+
+
+class TestCascadeDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the cascade deletes"""
+
+    def test_pep8_conformance_cascade(self):
+        """Test that cascade.py and indexes.py conform to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cascade.py',
+                                    'models/engine/indexes.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cascade_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(cascade.__doc__) >= 1)
+        self.assertTrue(len(indexes.__doc__) >= 1)
+        for cls in (CascadeJob, indexes.Index, ForeignKeyIndex):
+            self.assertTrue(len(cls.__doc__) >= 1)
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} method needs a docstring".format(name))
+
+
+class TestForeignKeyIndex(unittest.TestCase):
+    """Test the ForeignKeyIndex class"""
+
+    def test_add_remove(self):
+        """Test that the keys follow the value of the foreign key"""
+        index = ForeignKeyIndex("City", "state_id")
+        city = City(name="Town", state_id="s1")
+        index.add("City.1", city)
+        self.assertEqual(index.keys("s1"), {"City.1"})
+        city.state_id = "s2"
+        index.add("City.1", city)
+        self.assertEqual(index.keys("s1"), set())
+        self.assertEqual(index.keys("s2"), {"City.1"})
+        index.remove("City.1")
+        index.remove("City.1")
+        self.assertEqual(index.keys("s2"), set())
+
+    def test_clear(self):
+        """Test that clear() forgets every key"""
+        index = ForeignKeyIndex("City", "state_id")
+        index.add("City.1", City(name="Town", state_id="s1"))
+        index.clear()
+        self.assertEqual(index.keys("s1"), set())
+
+    def test_abstract(self):
+        """Test that an index must implement add, remove and clear"""
+        with self.assertRaises(TypeError):
+            indexes.Index()
+
+
+class PausedJob(CascadeJob):
+    """a CascadeJob waiting to be resumed after each batch"""
+
+    def __init__(self, obj):
+        """prepares the deletion of obj"""
+        super().__init__(obj)
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def progress(self, deleted, total):
+        """records the progress, then waits to be resumed"""
+        super().progress(deleted, total)
+        self.paused.set()
+        self.resume.wait(10)
+
+
+class TestCascadeDelete(unittest.TestCase):
+    """Test cascade_delete() of the storage and the CascadeJob class"""
+
+    def setUp(self):
+        """creates two states with a city, a place and a review each, the
+        review of each place being written by the owner of the other"""
+        self.users = [User(email="u{}@hbnb.io".format(i), password="pwd")
+                      for i in range(2)]
+        self.objs = list(self.users)
+        self.states = []
+        self.places = []
+        self.reviews = []
+        for i in range(2):
+            state = State(name="Cascade {}".format(i))
+            city = City(name="Town", state_id=state.id)
+            place = Place(name="Home", city_id=city.id,
+                          user_id=self.users[i].id)
+            review = Review(text="Nice", place_id=place.id,
+                            user_id=self.users[1 - i].id)
+            self.states.append(state)
+            self.places.append(place)
+            self.reviews.append(review)
+            self.objs += [state, city, place, review]
+        models.storage.save_many(self.objs)
+
+    def tearDown(self):
+        """deletes what is left of the objects"""
+        for obj in reversed(self.objs):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.delete(obj)
+        models.storage.save()
+
+    def gone(self, *objs):
+        """asserts that objs are deleted"""
+        for obj in objs:
+            self.assertIsNone(models.storage.get(type(obj), obj.id))
+
+    def kept(self, *objs):
+        """asserts that objs are still stored"""
+        for obj in objs:
+            self.assertIsNotNone(models.storage.get(type(obj), obj.id))
+
+    def test_delete_user(self):
+        """Test that a user is deleted with their places and reviews"""
+        calls = []
+        deleted = models.storage.cascade_delete(
+            self.users[0], lambda done, total: calls.append((done, total)))
+        models.storage.close()
+        self.assertEqual(deleted, 4)
+        self.assertEqual(calls[-1], (4, 4))
+        self.gone(self.users[0], self.places[0], *self.reviews)
+        self.kept(self.users[1], self.places[1], *self.states)
+
+    def test_delete_state(self):
+        """Test that a state is deleted with its cities and their places"""
+        self.assertEqual(models.storage.cascade_delete(self.states[1]), 4)
+        models.storage.close()
+        self.gone(*self.objs[6:])
+        self.kept(*self.objs[:6])
+
+    def test_related(self):
+        """Test that related() follows the foreign keys"""
+        state = self.states[0]
+        cities = models.storage.related(City, "state_id", state.id)
+        self.assertEqual([city.id for city in cities], [self.objs[3].id])
+        self.assertEqual([city.id for city in state.cities],
+                         [self.objs[3].id])
+        self.assertEqual(models.storage.related(City, "state_id", "x"), [])
+
+    def test_job(self):
+        """Test that a job deletes in the background and reports it"""
+        job = CascadeJob(self.places[0])
+        self.assertEqual(job.to_dict()["status"], "pending")
+        job.start()
+        job.join(10)
+        self.assertIs(CascadeJob.jobs[job.id], job)
+        self.assertEqual(job.to_dict()["status"], "done")
+        self.assertEqual((job.deleted, job.total), (2, 2))
+        models.storage.close()
+        self.gone(self.places[0], self.reviews[0])
+        self.kept(self.places[1], self.reviews[1])
+
+    def test_job_close(self):
+        """Test that the storage closed while a job runs does not bring
+        back what the job deleted"""
+        job = PausedJob(self.states[0]).start()
+        self.assertTrue(job.paused.wait(10))
+        models.storage.close()
+        job.resume.set()
+        job.join(10)
+        self.assertEqual(job.to_dict()["status"], "done")
+        models.storage.close()
+        self.gone(*self.objs[2:6])
+        self.kept(*self.objs[6:])
+
+    def test_prune(self):
+        """Test that the finished jobs are forgotten after TTL seconds or
+        beyond MAX_JOBS jobs, the running ones kept"""
+        jobs = [CascadeJob(self.places[0]) for i in range(4)]
+        for job, age in zip(jobs, (7200, 10, 5, None)):
+            if age is not None:
+                job.finished = time.monotonic() - age
+        with mock.patch.dict(CascadeJob.jobs, clear=True), \
+                mock.patch.object(CascadeJob, "MAX_JOBS", 3):
+            CascadeJob.jobs.update((job.id, job) for job in jobs)
+            CascadeJob.prune()
+            self.assertEqual(list(CascadeJob.jobs), [job.id for job in
+                                                     jobs[2:]])
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumnsDocs, TestPlaceColumns and TestColumnScan classes
+"""
+
+import inspect
+import models
+from models.city import City
+from models.engine import columns
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+PlaceColumns = columns.PlaceColumns
+numpy = columns.numpy
+
+
+class TestColumnsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the columns"""
+
+    def test_pep8_conformance_columns(self):
+        """Test that models/engine/columns.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/columns.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_columns_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(columns.__doc__) >= 1)
+        self.assertTrue(len(PlaceColumns.__doc__) >= 1)
+        for name, func in inspect.getmembers(PlaceColumns,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestPlaceColumns(unittest.TestCase):
+    """Test the PlaceColumns class, with and without numpy"""
+
+    def columns(self):
+        """yields the columns of the places 0 to 4, with numpy (if it is
+        installed) then without"""
+        for vectorized in (True, False):
+            index = PlaceColumns(vectorized=vectorized)
+            for i, price in enumerate((10, 20, None, "30", 40)):
+                index.add("Place.{}".format(i),
+                          Place(price_by_night=price, max_guest=i))
+            with self.subTest(vectorized=index.vectorized):
+                yield index
+
+    def test_select(self):
+        """Test that every bound applies and the missing values fail"""
+        for index in self.columns():
+            self.assertEqual(index.select({"price_by_night": (15, None)}),
+                             ["Place.1", "Place.3", "Place.4"])
+            self.assertEqual(index.select({"price_by_night": (15, 35),
+                                           "max_guest": (None, 2)}),
+                             ["Place.1"])
+            self.assertEqual(index.select({"price_by_night": (None, None)}),
+                             ["Place.0", "Place.1", "Place.3", "Place.4"])
+            self.assertIsNone(index.select({"name": (None, None)}))
+
+    def test_add_remove(self):
+        """Test that the rows follow the objects"""
+        for index in self.columns():
+            index.remove("Place.1")
+            index.remove("Place.1")
+            index.add("Place.0", Place(price_by_night=35))
+            index.add("Place.5", Place(price_by_night=25))
+            self.assertEqual(len(index), 5)
+            self.assertEqual(sorted(index.select({"price_by_night":
+                                                  (15, 35)})),
+                             ["Place.0", "Place.3", "Place.5"])
+            index.remove("Place.5")
+            index.clear()
+            self.assertEqual(index.select({"price_by_night": (0, 50)}), [])
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        """Test that the bounds are compared with numpy, the coordinates
+        with the numbers"""
+        index = PlaceColumns()
+        self.assertTrue(index.vectorized)
+        for i, (lat, lon) in enumerate(((48.8, 2.3), (51.5, -0.1),
+                                        (-33.9, 151.2))):
+            index.add("Place.{}".format(i),
+                      Place(latitude=lat, longitude=lon, max_guest=i))
+        self.assertEqual(index.select({"latitude": (40, 60),
+                                       "longitude": (-10, 10)}),
+                         ["Place.0", "Place.1"])
+        self.assertEqual(index.select({"latitude": (40, 60),
+                                       "max_guest": (1, None)}),
+                         ["Place.1"])
+
+
+class TestColumnScan(unittest.TestCase):
+    """Test range_query() of the storage on broad bounds"""
+
+    def setUp(self):
+        """creates places of several prices and positions"""
+        self.user = User(email="columns@hbnb.io", password="pwd")
+        self.state = State(name="Scanned")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.places = [Place(name="Place {}".format(i), city_id=self.city.id,
+                             user_id=self.user.id, price_by_night=price,
+                             max_guest=2, latitude=lat, longitude=lon)
+                       for i, (price, lat, lon) in enumerate(
+                           ((80001, 48.8, 2.3), (80002, 51.5, -0.1),
+                            (80003, -33.9, 151.2)))]
+        models.storage.save_many([self.user, self.state, self.city] +
+                                 self.places)
+
+    def tearDown(self):
+        """deletes the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def test_range_query(self):
+        """Test the bounds on the coordinates and the numbers"""
+        found = models.storage.range_query(Place, {
+            "price_by_night": (80000, None), "max_guest": (None, 4),
+            "latitude": (40, 60), "longitude": (-10, 10)})
+        self.assertEqual(sorted(place.id for place in found),
+                         sorted(place.id for place in self.places[:2]))
+
+    def test_within_nearest(self):
+        """Test the places of a box or a circle in the bounds"""
+        bounds = {"price_by_night": (80002, None)}
+        found = models.storage.within(40, -10, 60, 10, bounds=bounds)
+        self.assertEqual([place.id for place in found], [self.places[1].id])
+        found = models.storage.within(-40, 150, -30, -170, bounds)
+        self.assertEqual([place.id for place in found], [self.places[2].id])
+        found = models.storage.nearest(48.8, 2.3, 400, 1, bounds)
+        self.assertEqual([place.id for place, d in found],
+                         [self.places[1].id])
+        self.assertAlmostEqual(found[0][1], 340, delta=10)
@@ -8,6 +8,7 @@ from datetime import datetime
 import inspect
 import models
 from models.engine import db_storage
+from models.engine.object_cache import ObjectCache
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -138,3 +139,68 @@ class TestDBStorage(unittest.TestCase):
         with self.assertRaises(TypeError):
             storage.count(State, 'op')
 
+    def test_save_many(self):
+        """Test that save_many() commits every object at once."""
+        storage = models.storage
+        states = [State(name="State {}".format(i)) for i in range(3)]
+        count = storage.count(State)
+        storage.save_many(states)
+        storage.close()
+        self.assertEqual(storage.count(State), count + 3)
+        for state in states:
+            self.assertEqual(storage.get(State, state.id).name, state.name)
+
+    def test_iter_all(self):
+        """Test that iter_all() streams the objects of all()."""
+        storage = models.storage
+        states = [State(name="Iter {}".format(i)) for i in range(5)]
+        storage.save_many(states)
+        objs = storage.iter_all(State, batch_size=2)
+        self.assertNotIsInstance(objs, (list, dict))
+        ids = [obj.id for obj in objs]
+        self.assertEqual(sorted(ids), sorted(
+            obj.id for obj in storage.all(State).values()))
+        for state in states:
+            self.assertIn(state.id, ids)
+        self.assertEqual(len(list(storage.iter_all())), len(storage.all()))
+        self.assertEqual(len(list(storage.iter_all("State"))), len(ids))
+
+    def test_get_identity_map(self):
+        """Test that get() returns the object of the session if any."""
+        storage = models.storage
+        state = State(name="Mapped")
+        storage.new(state)
+        storage.save()
+        self.assertIs(storage.get(State, state.id), state)
+        storage.delete(state)
+        self.assertIsNone(storage.get(State, state.id))
+        storage.save()
+
+    def test_get_object_cache(self):
+        """Test the read-through cache of get() and its invalidation."""
+        storage = models.storage
+        cache = ObjectCache(10, 60)
+        storage._DBStorage__cache = cache
+        try:
+            state = State(name="Cached")
+            storage.new(state)
+            storage.save()
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "Cached")
+            self.assertEqual(cache.stats()["misses"], 1)
+            storage.close()
+            cached = storage.get(State, state.id)
+            self.assertEqual(cache.stats()["hits"], 1)
+            self.assertEqual(cached.name, "Cached")
+            self.assertEqual(cached.created_at, state.created_at)
+            cached.name = "Renamed"
+            storage.save()
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "Renamed")
+            self.assertEqual(storage.cache_stats()["hits"], 1)
+            storage.delete(storage.get(State, state.id))
+            storage.save()
+            storage.close()
+            self.assertIsNone(storage.get(State, state.id))
+        finally:
+            storage._DBStorage__cache = None
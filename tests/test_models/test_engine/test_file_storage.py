@@ -172,3 +172,34 @@ class TestFileStorage(unittest.TestCase):
         with self.assertRaises(TypeError):
             storage.count(State, 'op')
 
+    def test_save_many(self):
+        """Verify that save_many() adds the objects and writes them once."""
+        storage = FileStorage()
+        states = [State(name="State {}".format(i)) for i in range(3)]
+        storage.save_many(states)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        for state in states:
+            self.assertIs(storage.all()["State." + state.id], state)
+            self.assertIn("State." + state.id, js)
+            storage.delete(state)
+        storage.save()
+
+    def test_iter_all(self):
+        """Verify that iter_all() yields the objects of all() lazily."""
+        storage = FileStorage()
+        state = State(name="Iter")
+        storage.new(state)
+        objs = storage.iter_all(State)
+        self.assertNotIsInstance(objs, (list, dict))
+        objs = list(objs)
+        self.assertIn(state, objs)
+        self.assertEqual(len(objs), len(storage.all(State)))
+        self.assertEqual(len(list(storage.iter_all())), len(storage.all()))
+        self.assertEqual(len(list(storage.iter_all("State"))), len(objs))
+        self.assertEqual(storage.count(State), len(objs))
+        # the snapshot allows changes while iterating
+        for obj in storage.iter_all(State):
+            storage.delete(obj)
+            storage.new(obj)
+        storage.delete(state)
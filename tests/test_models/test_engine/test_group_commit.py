@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+Contains the TestGroupCommitDocs and TestGroupCommit classes
+"""
+
+import inspect
+from models.engine import group_commit
+import pep8
+import threading
+import time
+import unittest
+GroupCommit = group_commit.GroupCommit
+
+
+class TestGroupCommitDocs(unittest.TestCase):
+    """Tests to check the documentation and style of GroupCommit class"""
+
+    def test_pep8_conformance_group_commit(self):
+        """Test that models/engine/group_commit.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/group_commit.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_group_commit_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(group_commit.__doc__) >= 1)
+        self.assertTrue(len(GroupCommit.__doc__) >= 1)
+        for name, func in inspect.getmembers(GroupCommit,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Test the GroupCommit class"""
+
+    def run_threads(self, committer, n):
+        """calls committer.commit() from n threads at once"""
+        threads = [threading.Thread(target=committer.commit)
+                   for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_single_commit_flushes(self):
+        """Test that a lone commit flushes once"""
+        flushes = []
+        committer = GroupCommit(lambda: flushes.append(1))
+        committer.commit()
+        committer.commit()
+        self.assertEqual(len(flushes), 2)
+        self.assertEqual(committer.flushes, 2)
+
+    def test_concurrent_commits_are_merged(self):
+        """Test that commits queued during a flush share the next one"""
+        flushes = []
+
+        def flush():
+            """a slow flush"""
+            time.sleep(0.02)
+            flushes.append(1)
+
+        committer = GroupCommit(flush, window=0.01)
+        self.run_threads(committer, 20)
+        self.assertEqual(committer.commits, 20)
+        self.assertLess(len(flushes), 20)
+        self.assertEqual(committer.flushes, len(flushes))
+
+    def test_commit_waits_for_its_data(self):
+        """Test that a commit returns only after its data is flushed"""
+        lock = threading.Lock()
+        data = []
+        flushed = []
+        durable = []
+
+        def flush():
+            """records how many items were flushed"""
+            time.sleep(0.005)
+            with lock:
+                flushed.append(len(data))
+
+        committer = GroupCommit(flush)
+
+        def writer():
+            """adds one item, commits it and checks it was flushed"""
+            with lock:
+                data.append(1)
+                mine = len(data)
+            committer.commit()
+            with lock:
+                durable.append(max(flushed) >= mine)
+
+        threads = [threading.Thread(target=writer) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(durable, [True] * 10)
+
+    def test_failed_flush_is_retried(self):
+        """Test that an error reaches the leader and does not block others"""
+        calls = []
+
+        def flush():
+            """fails the first time"""
+            calls.append(1)
+            if len(calls) == 1:
+                raise IOError("disk full")
+
+        committer = GroupCommit(flush)
+        with self.assertRaises(IOError):
+            committer.commit()
+        committer.commit()
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(committer.flushes, 1)
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Contains the TestHierarchyDocs, TestStateTree and TestStorageStateTree
+classes
+"""
+
+import inspect
+import models
+from models.city import City
+from models.engine import hierarchy
+from models.state import State
+import pep8
+import unittest
+StateTree = hierarchy.StateTree
+
+
+class TestHierarchyDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the hierarchy"""
+
+    def test_pep8_conformance_hierarchy(self):
+        """Test that models/engine/hierarchy.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/hierarchy.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_hierarchy_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(hierarchy.__doc__) >= 1)
+        self.assertTrue(len(StateTree.__doc__) >= 1)
+        for name, func in inspect.getmembers(StateTree, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestStateTree(unittest.TestCase):
+    """Test the StateTree class"""
+
+    def setUp(self):
+        """creates a tree of two states and three cities"""
+        self.index = StateTree()
+        for id, name in (("1", "Texas"), ("2", "Alaska")):
+            self.index.add("State." + id, State(id=id, name=name))
+        for id, name, state_id in (("a", "Waco", "1"), ("b", "Austin", "1"),
+                                   ("c", "Juneau", "2")):
+            self.index.add("City." + id,
+                           City(id=id, name=name, state_id=state_id))
+
+    def test_tree(self):
+        """Test that the states and their cities are sorted by name"""
+        self.assertEqual(self.index.tree(), [("2", ["c"]), ("1", ["b", "a"])])
+
+    def test_changes(self):
+        """Test that the tree follows the renames, moves and removals"""
+        tree = self.index.tree()
+        self.assertIs(self.index.tree(), tree)
+        self.index.add("State.1", State(id="1", name="Texas"))
+        self.assertIs(self.index.tree(), tree)
+        self.index.add("State.1", State(id="1", name="Alabama"))
+        self.index.add("City.a", City(id="a", name="Anchorage",
+                                      state_id="2"))
+        self.assertEqual(self.index.tree(), [("1", ["b"]),
+                                             ("2", ["a", "c"])])
+        self.index.remove("State.2")
+        self.index.remove("City.b")
+        self.index.remove("City.b")
+        self.assertEqual(self.index.tree(), [("1", [])])
+        self.index.clear()
+        self.assertEqual(self.index.tree(), [])
+
+    def test_names_not_str(self):
+        """Test that names which are not strings are sorted as strings"""
+        self.index.add("State.3", State(id="3", name=5))
+        self.index.add("City.d", City(id="d", name=7, state_id="3"))
+        self.index.add("City.e", City(id="e", name="Dallas", state_id="3"))
+        self.assertEqual(self.index.tree(), [("3", ["d", "e"]), ("2", ["c"]),
+                                             ("1", ["b", "a"])])
+        self.index.remove("State.3")
+        self.assertEqual(self.index.tree(), [("2", ["c"]), ("1", ["b", "a"])])
+
+
+class TestStorageStateTree(unittest.TestCase):
+    """Test state_tree() of the storage"""
+
+    def setUp(self):
+        """creates two states with cities"""
+        self.states = [State(name=name) for name in ("Zz Tree", "Zy Tree")]
+        self.cities = [City(name=name, state_id=self.states[0].id)
+                       for name in ("Oak", "Elm", "Pine")]
+        models.storage.save_many(self.states + self.cities)
+
+    def tearDown(self):
+        """deletes the objects"""
+        for state in self.states:
+            state = models.storage.get(State, state.id)
+            if state is not None:
+                models.storage.cascade_delete(state)
+        models.storage.close()
+
+    def names(self):
+        """returns the names of the states of the test and of their
+        cities"""
+        ids = {state.id for state in self.states}
+        return [(state.name, [city.name for city in cities])
+                for state, cities in models.storage.state_tree()
+                if state.id in ids]
+
+    def test_state_tree(self):
+        """Test the states and cities sorted by name"""
+        self.assertEqual(self.names(), [("Zy Tree", []),
+                                        ("Zz Tree", ["Elm", "Oak", "Pine"])])
+        names = [state.name for state, cities in models.storage.state_tree()]
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(len(names), models.storage.count(State))
+
+    def test_update(self):
+        """Test that the tree follows the changes of the cities"""
+        city = models.storage.get(City, self.cities[2].id)
+        city.name = "Ash"
+        city.state_id = self.states[1].id
+        city.save()
+        models.storage.delete(models.storage.get(City, self.cities[0].id))
+        models.storage.save()
+        self.assertEqual(self.names(), [("Zy Tree", ["Ash"]),
+                                        ("Zz Tree", ["Elm"])])
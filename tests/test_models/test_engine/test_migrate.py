@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the TestMigrateDocs and TestMigrate classes
+"""
+
+import inspect
+import io
+import json
+import models
+from models.engine import migrate
+import os
+import pep8
+import tempfile
+import unittest
+import uuid
+
+
+class TestMigrateDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the migration tool"""
+
+    def test_pep8_conformance_migrate(self):
+        """Test that models/engine/migrate.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/migrate.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_migrate_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(migrate.__doc__) >= 1)
+        for name, func in inspect.getmembers(migrate, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} function needs a docstring".format(name))
+        for cls in (migrate.Checkpoint, migrate.Progress):
+            self.assertTrue(len(cls.__doc__) >= 1)
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} method needs a docstring".format(name))
+
+
+@unittest.skipIf(models.storage_t != 'db', "the migration needs a database")
+class TestMigrate(unittest.TestCase):
+    """Test the migration between a JSON file and the database"""
+
+    def setUp(self):
+        """writes a FileStorage file of 2 states with a city, a place and a
+        review each, an amenity, a user, a BaseModel and an orphan city"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.json")
+        date = "2021-02-03T04:05:06.000007"
+        self.records = {}
+
+        def add(cls, **attrs):
+            """adds a record, returns its id"""
+            attrs.update(id=str(uuid.uuid4()), created_at=date,
+                         updated_at=date, __class__=cls)
+            self.records[cls + "." + attrs["id"]] = attrs
+            return attrs["id"]
+
+        self.amenity = add("Amenity", name="Wifi")
+        self.user = add("User", email="m@hbnb.io", password="pwd")
+        self.states = []
+        self.places = []
+        for i in range(2):
+            state = add("State", name="Migrated {}".format(i))
+            city = add("City", name="Town", state_id=state)
+            place = add("Place", name="Home", city_id=city,
+                        user_id=self.user, amenity_ids=[self.amenity])
+            add("Review", text="Nice", place_id=place, user_id=self.user)
+            self.states.append(state)
+            self.places.append(place)
+        add("BaseModel")
+        self.orphan = add("City", name="Lost", state_id="nowhere")
+        with open(self.path, "w") as f:
+            json.dump(self.records, f)
+
+    def tearDown(self):
+        """deletes the migrated objects"""
+        from models.engine.db_storage import classes
+        storage = models.storage
+        for name in ("User", "State", "Amenity"):
+            for key, record in self.records.items():
+                if record["__class__"] == name:
+                    obj = storage.get(classes[name], record["id"])
+                    if obj is not None:
+                        storage.cascade_delete(obj)
+        storage.close()
+        self.tmp.cleanup()
+
+    def check_migrated(self):
+        """asserts that the objects of the file are in the database"""
+        from models.engine.db_storage import classes
+        models.storage.close()
+        for key, record in self.records.items():
+            name = record["__class__"]
+            if name == "BaseModel" or record["id"] == self.orphan:
+                continue
+            obj = models.storage.get(classes[name], record["id"])
+            self.assertIsNotNone(obj, key)
+            self.assertEqual(obj.to_dict()["created_at"],
+                             record["created_at"])
+        place = models.storage.get(classes["Place"], self.places[0])
+        self.assertEqual([a.id for a in place.amenities], [self.amenity])
+        self.assertIsNone(models.storage.get(classes["City"], self.orphan))
+
+    def test_to_db(self):
+        """Test a parallel migration to the database in small batches"""
+        report = io.StringIO()
+        progress = migrate.to_db(models.storage, self.path, batch_size=1,
+                                 parallel=True, report=report)
+        self.assertEqual(progress.total(), 10)
+        self.assertEqual(progress.skipped, 2)
+        self.assertIn("rows/s", report.getvalue())
+        self.assertFalse(os.path.exists(self.path + ".checkpoint"))
+        self.check_migrated()
+
+    def test_resume(self):
+        """Test that a migration resumes after its checkpoint"""
+        from models.engine.db_storage import classes
+        checkpoint = migrate.Checkpoint(self.path + ".checkpoint")
+        # the amenity and the user were migrated, the first state was
+        # committed but the migration stopped before its checkpoint
+        for name, id in (("Amenity", self.amenity), ("User", self.user),
+                         ("State", min(self.states))):
+            models.storage.new(classes[name](
+                **self.records[name + "." + id]))
+        models.storage.save()
+        models.storage.close()
+        checkpoint.done("Amenity", self.amenity)
+        checkpoint.done("User", self.user)
+        checkpoint.done("State", "")
+        progress = migrate.to_db(models.storage, self.path, batch_size=1,
+                                 report=io.StringIO())
+        self.assertEqual(progress.counts, {"State": 1, "City": 2,
+                                           "Place": 2, "Review": 2})
+        self.check_migrated()
+
+    def test_to_file(self):
+        """Test that to_file() writes back what to_db() migrated"""
+        migrate.to_db(models.storage, self.path, report=io.StringIO())
+        back = os.path.join(self.tmp.name, "back.json")
+        migrate.to_file(models.storage, back, report=io.StringIO())
+        with open(back) as f:
+            objects = json.load(f)
+        for key, record in self.records.items():
+            if record["__class__"] == "BaseModel" or key.endswith(
+                    self.orphan):
+                continue
+            self.assertEqual({attr: objects[key][attr] for attr in record},
+                             record)
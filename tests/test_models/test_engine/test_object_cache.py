@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Contains the TestObjectCacheDocs and TestObjectCache classes
+"""
+
+import inspect
+from models.engine import object_cache
+import pep8
+import unittest
+ObjectCache = object_cache.ObjectCache
+
+
+class TestObjectCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ObjectCache class"""
+
+    def test_pep8_conformance_object_cache(self):
+        """Test that models/engine/object_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/object_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_object_cache_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(object_cache.__doc__) >= 1)
+        self.assertTrue(len(ObjectCache.__doc__) >= 1)
+        for name, func in inspect.getmembers(ObjectCache,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestObjectCache(unittest.TestCase):
+    """Test the ObjectCache class"""
+
+    def setUp(self):
+        """creates a cache of 2 entries with a fake clock"""
+        self.now = 0
+        self.cache = ObjectCache(2, 10, lambda: self.now)
+
+    def test_hit_and_miss(self):
+        """Test that get() returns what put() cached and counts it"""
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", {"name": "A"})
+        self.assertEqual(self.cache.get("a"), {"name": "A"})
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        """Test that an entry expires after its time to live"""
+        self.cache.put("a", 1)
+        self.now = 9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_invalidate(self):
+        """Test that invalidate() and clear() forget entries"""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.invalidate("a")
+        self.cache.invalidate("x")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get("b"), 2)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("b"))
@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Contains the TestOrderingDocs, TestOrder and TestStorageOrdered classes
+"""
+
+from datetime import datetime, timedelta
+import inspect
+import models
+from models.city import City
+from models.engine import ordering
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestOrderingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the ordering"""
+
+    def test_pep8_conformance_ordering(self):
+        """Test that models/engine/ordering.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/ordering.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_ordering_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(ordering.__doc__) >= 1)
+        for name, func in inspect.getmembers(ordering, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} function needs a docstring".format(name))
+
+
+class TestOrder(unittest.TestCase):
+    """Test the order function"""
+
+    def setUp(self):
+        """creates places with prices, one of them without"""
+        self.places = [Place(id=str(i), price_by_night=price)
+                       for i, price in enumerate((30, "10", 20, None, 10))]
+
+    def ids(self, *args, **kwargs):
+        """returns the ids of the places ordered"""
+        return [place.id for place in
+                ordering.order(self.places, "price_by_night", *args,
+                               **kwargs)]
+
+    def test_sort(self):
+        """Test the whole order, the numbers compared as numbers"""
+        self.assertEqual(self.ids(), ["1", "4", "2", "0", "3"])
+        self.assertEqual(self.ids(True), ["0", "2", "4", "1", "3"])
+
+    def test_top(self):
+        """Test that the limit gives the first objects of the order"""
+        self.assertEqual(self.ids(limit=2), ["1", "4"])
+        self.assertEqual(self.ids(True, 1), ["0"])
+        self.assertEqual(self.ids(limit=5), self.ids())
+        self.assertEqual(self.ids(limit=0), [])
+
+    def test_mixed_types(self):
+        """Test that values of different types are ordered: the numbers,
+        then the strings, then the others"""
+        places = [Place(id=str(i), name=name) for i, name in
+                  enumerate(("b", 5, None, datetime(2017, 1, 1), "a", 10))]
+        ids = [place.id for place in ordering.order(places, "name")]
+        self.assertEqual(ids, ["1", "5", "4", "0", "3", "2"])
+        ids = [place.id for place in ordering.order(places, "name", True, 2)]
+        self.assertEqual(ids, ["3", "0"])
+
+
+class TestStorageOrdered(unittest.TestCase):
+    """Test ordered() of the storage"""
+
+    def setUp(self):
+        """creates a city with places and a place with reviews"""
+        self.user = User(email="ordered@hbnb.io", password="pwd")
+        self.state = State(name="Sorted")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.places = [Place(name=name, city_id=self.city.id,
+                             user_id=self.user.id, price_by_night=price)
+                       for name, price in (("Loft", 120), ("Cabin", 60),
+                                           ("Studio", 90))]
+        now = datetime.utcnow()
+        self.reviews = [Review(text="Review {}".format(i),
+                               place_id=self.places[0].id,
+                               user_id=self.user.id,
+                               created_at=(now - timedelta(days=i)).strftime(
+                                   "%Y-%m-%dT%H:%M:%S.%f"))
+                        for i in range(4)]
+        models.storage.save_many([self.user, self.state, self.city] +
+                                 self.places + self.reviews)
+
+    def tearDown(self):
+        """deletes the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def test_places_of_city(self):
+        """Test the cheapest places and the places by name of a city"""
+        city = ("city_id", self.city.id)
+        found = models.storage.ordered(Place, "price_by_night", limit=2,
+                                       related=city)
+        self.assertEqual([place.name for place in found], ["Cabin", "Studio"])
+        found = models.storage.ordered(Place, "name", True, related=city)
+        self.assertEqual([place.name for place in found],
+                         ["Studio", "Loft", "Cabin"])
+
+    def test_latest_reviews(self):
+        """Test the latest reviews of a place"""
+        found = models.storage.ordered(Review, "created_at", True, 3,
+                                       ("place_id", self.places[0].id))
+        self.assertEqual([review.id for review in found],
+                         [review.id for review in self.reviews[:3]])
+
+    def test_all(self):
+        """Test the order of every object of a class"""
+        found = models.storage.ordered(Place, "price_by_night")
+        prices = [place.price_by_night for place in found]
+        self.assertEqual(prices, sorted(prices))
+        self.assertEqual(len(found), models.storage.count(Place))
+        found = models.storage.ordered(State, "name", True, 1)
+        self.assertEqual(len(found), 1)
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the TestRangeIndex and TestRangeQuery classes
+"""
+
+import models
+from models.city import City
+from models.engine import indexes
+from models.place import Place
+from models.state import State
+from models.user import User
+import unittest
+RangeIndex = indexes.RangeIndex
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Test the RangeIndex class"""
+
+    def test_range(self):
+        """Test that the keys of a range are found by increasing value"""
+        index = RangeIndex("Place", "price_by_night")
+        for i, price in enumerate((50, 10, 30, 30, "20", None)):
+            index.add("Place.{}".format(i), Place(price_by_night=price))
+        self.assertEqual(index.range(20, 30),
+                         ["Place.4", "Place.2", "Place.3"])
+        self.assertEqual(index.range(None, 15), ["Place.1"])
+        self.assertEqual(index.range(31), ["Place.0"])
+        self.assertEqual(index.count(), 5)
+        self.assertEqual(index.count(60), 0)
+        self.assertEqual(index.keys(30), {"Place.2", "Place.3"})
+
+    def test_add_remove(self):
+        """Test that the keys follow the value of the attribute"""
+        index = RangeIndex("Place", "max_guest")
+        index.add("Place.1", Place(max_guest=2))
+        index.add("Place.1", Place(max_guest=6))
+        self.assertEqual(index.range(None, 4), [])
+        self.assertEqual(index.range(5, 6), ["Place.1"])
+        index.remove("Place.1")
+        index.remove("Place.1")
+        self.assertEqual(index.count(), 0)
+
+    def test_rebuild(self):
+        """Test the queries between few and many changes"""
+        index = RangeIndex("Place", "price_by_night")
+        for i in range(200):
+            index.add("Place.{}".format(i), Place(price_by_night=i))
+        self.assertEqual(index.count(10, 19), 10)
+        index.add("Place.5", Place(price_by_night=500))
+        self.assertEqual(index.range(400), ["Place.5"])
+        for i in range(100):
+            index.remove("Place.{}".format(i))
+        index.add("Place.0", Place(price_by_night=150))
+        self.assertEqual(index.count(), 101)
+        self.assertEqual(index.range(149, 150), ["Place.149", "Place.0",
+                                                 "Place.150"])
+
+    def test_within_bounds(self):
+        """Test the check of the bounds of several attributes"""
+        place = Place(price_by_night=80, max_guest=4)
+        self.assertTrue(indexes.within_bounds(
+            place, {"price_by_night": (None, 100), "max_guest": (4, None)}))
+        self.assertFalse(indexes.within_bounds(
+            place, {"price_by_night": (None, 100), "max_guest": (5, None)}))
+
+
+class TestRangeQuery(unittest.TestCase):
+    """Test range_query() of the storage"""
+
+    def setUp(self):
+        """creates places of several prices and sizes"""
+        self.user = User(email="range@hbnb.io", password="pwd")
+        self.state = State(name="Ranged")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.places = [Place(name="Place {}".format(i), city_id=self.city.id,
+                             user_id=self.user.id, price_by_night=price,
+                             max_guest=guests, number_rooms=guests // 2,
+                             number_bathrooms=1)
+                       for i, (price, guests) in enumerate(
+                           ((90001, 2), (90050, 4), (90100, 6)))]
+        models.storage.save_many([self.user, self.state, self.city] +
+                                 self.places)
+
+    def tearDown(self):
+        """deletes the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def ids(self, bounds):
+        """returns the ids of the places in bounds"""
+        return sorted(place.id for place in
+                      models.storage.range_query(Place, bounds))
+
+    def test_range_query(self):
+        """Test that every bound applies"""
+        ids = [place.id for place in self.places]
+        self.assertEqual(self.ids({"price_by_night": (90000, 90060)}),
+                         sorted(ids[:2]))
+        self.assertEqual(self.ids({"price_by_night": (90000, 90060),
+                                   "max_guest": (3, None)}), ids[1:2])
+        self.assertEqual(self.ids({"price_by_night": (90000, None),
+                                   "number_rooms": (None, 1)}), ids[:1])
+        self.assertEqual(self.ids({"price_by_night": (90200, None)}), [])
+
+    def test_update(self):
+        """Test that the index follows the updates"""
+        place = models.storage.get(Place, self.places[2].id)
+        place.price_by_night = 90010
+        place.save()
+        self.assertIn(place.id, self.ids({"price_by_night": (90000,
+                                                             90020)}))
@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+"""
+Contains the TestSpatialDocs, TestGeometry, TestGridIndex and
+TestStorageSpatial classes
+"""
+
+import inspect
+import models
+from models.city import City
+from models.engine import spatial
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+GridIndex = spatial.GridIndex
+
+
+class TestSpatialDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the spatial search"""
+
+    def test_pep8_conformance_spatial(self):
+        """Test that models/engine/spatial.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/spatial.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_spatial_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(spatial.__doc__) >= 1)
+        for name, func in inspect.getmembers(spatial, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} function needs a docstring".format(name))
+        self.assertTrue(len(GridIndex.__doc__) >= 1)
+        for name, func in inspect.getmembers(GridIndex, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestGeometry(unittest.TestCase):
+    """Test the distances and boxes"""
+
+    def test_distance(self):
+        """Test the haversine distance"""
+        # Paris - London
+        self.assertAlmostEqual(spatial.distance(48.8566, 2.3522,
+                                                51.5074, -0.1278),
+                               343.6, delta=1)
+        self.assertEqual(spatial.distance(10, 20, 10, 20), 0)
+
+    def test_box_around(self):
+        """Test that the box contains the circle"""
+        south, west, north, east = spatial.box_around(0, 0, 111.2)
+        self.assertAlmostEqual(north, 1, places=2)
+        self.assertAlmostEqual(west, -1, places=2)
+        # across the antimeridian
+        south, west, north, east = spatial.box_around(0, 179.5, 111.2)
+        self.assertGreater(west, east)
+        self.assertEqual(spatial.ranges(south, west, north, east),
+                         [(south, west, north, 180.0),
+                          (south, -180.0, north, east)])
+        # around a pole
+        self.assertEqual(spatial.box_around(89.5, 0, 100)[1::2],
+                         (-180.0, 180.0))
+
+    def test_closest(self):
+        """Test that the points are sorted and limited to k"""
+        points = [("a", 0, 2), ("b", 0, 1), ("c", 0, 10)]
+        found = spatial.closest(points, 0, 0, 500)
+        self.assertEqual([id for id, d in found], ["b", "a"])
+        self.assertEqual([id for id, d in spatial.closest(points, 0, 0, 500,
+                                                          1)], ["b"])
+
+
+class TestGridIndex(unittest.TestCase):
+    """Test the GridIndex class"""
+
+    def test_within(self):
+        """Test that the places of a box are found, in a few cells or many"""
+        index = GridIndex()
+        index.add("Place.1", Place(latitude=48.85, longitude=2.35))
+        index.add("Place.2", Place(latitude=48.2, longitude=-1.5))
+        index.add("Place.3", Place(latitude=-33.9, longitude=151.2))
+        index.add("Place.4", Place(name="Nowhere"))
+        keys = {key for key, lat, lon in index.within(48, 2, 49, 3)}
+        self.assertEqual(keys, {"Place.1"})
+        keys = {key for key, lat, lon in index.within(-90, -180, 90, 180)}
+        self.assertEqual(keys, {"Place.1", "Place.2", "Place.3"})
+        keys = {key for key, lat, lon in index.within(-40, 150, 50, -1)}
+        self.assertEqual(keys, {"Place.2", "Place.3"})
+
+    def test_add_remove(self):
+        """Test that a place moves with its coordinates"""
+        index = GridIndex()
+        index.add("Place.1", Place(latitude=48.85, longitude=2.35))
+        index.add("Place.1", Place(latitude=40.7, longitude=-74.0))
+        self.assertEqual(list(index.within(48, 2, 49, 3)), [])
+        self.assertEqual(len(list(index.within(40, -75, 41, -73))), 1)
+        index.remove("Place.1")
+        index.remove("Place.1")
+        self.assertEqual(list(index.within(-90, -180, 90, 180)), [])
+
+
+class TestStorageSpatial(unittest.TestCase):
+    """Test within() and nearest() of the storage"""
+
+    def setUp(self):
+        """creates places in Paris, Versailles, London and Fiji"""
+        self.user = User(email="spatial@hbnb.io", password="pwd")
+        self.state = State(name="Mapped")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.places = [Place(name=name, city_id=self.city.id,
+                             user_id=self.user.id, latitude=lat,
+                             longitude=lon)
+                       for name, lat, lon in (
+                           ("Paris", 48.8566, 2.3522),
+                           ("Versailles", 48.8049, 2.1204),
+                           ("London", 51.5074, -0.1278),
+                           ("Fiji", -17.7, 179.9))]
+        models.storage.save_many([self.user, self.state, self.city] +
+                                 self.places)
+
+    def tearDown(self):
+        """deletes the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def test_within(self):
+        """Test the places of a box"""
+        ids = {place.id for place in models.storage.within(48, 2, 49, 3)}
+        self.assertEqual(ids, {self.places[0].id, self.places[1].id})
+        ids = {place.id for place in models.storage.within(-20, 179, -15,
+                                                           -179)}
+        self.assertEqual(ids, {self.places[3].id})
+
+    def test_nearest(self):
+        """Test the nearest places of a circle"""
+        found = models.storage.nearest(48.8566, 2.3522, 400)
+        self.assertEqual([place.id for place, d in found],
+                         [place.id for place in self.places[:3]])
+        self.assertAlmostEqual(found[1][1], 18.5, delta=1)
+        found = models.storage.nearest(48.8566, 2.3522, 400, 1)
+        self.assertEqual([place.id for place, d in found],
+                         [self.places[0].id])
+        found = models.storage.nearest(-17.7, -179.9, 50)
+        self.assertEqual([place.id for place, d in found],
+                         [self.places[3].id])
+
+    def test_move(self):
+        """Test that the index follows the updates"""
+        place = models.storage.get(Place, self.places[2].id)
+        place.latitude = 48.86
+        place.longitude = 2.34
+        place.save()
+        ids = {place.id for place in models.storage.within(48, 2, 49, 3)}
+        self.assertIn(place.id, ids)
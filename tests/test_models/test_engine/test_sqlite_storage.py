@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import inspect
+import models
+from models.engine import sqlite_storage
+from models.state import State
+import os
+import pep8
+import tempfile
+import unittest
+from unittest import mock
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqls_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sqls_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sqls_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_type != 'sqlite', "not testing sqlite storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+
+    def test_pragmas(self):
+        """Test that the connections run in WAL mode with foreign keys"""
+        engine = models.storage._DBStorage__engine
+        with engine.connect() as conn:
+            journal = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            fks = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        self.assertEqual(journal.lower(), "wal")
+        self.assertEqual(fks, 1)
+
+    def test_save_get_delete(self):
+        """Test the round trip of an object through the database"""
+        state = State(name="Oregon")
+        state.save()
+        models.storage.close()
+        self.assertEqual(models.storage.get(State, state.id).name, "Oregon")
+        count = models.storage.count(State)
+        models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+        self.assertIsNone(models.storage.get(State, state.id))
+        self.assertEqual(models.storage.count(State), count - 1)
+
+    def test_replica_routing(self):
+        """Test that the reads go to the replica until the first write"""
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {"HBNB_SQLITE_PATH": os.path.join(tmp, "primary.db"),
+                   "HBNB_SQLITE_REPLICA_PATHS": os.path.join(tmp, "r.db")}
+            with mock.patch.dict(os.environ, env):
+                storage = SQLiteStorage()
+                storage.reload()
+            try:
+                state = State(name="Primary")
+                storage.new(state)
+                storage.save()
+                self.assertEqual(storage.count(State), 1)
+                storage.close()
+                # the replica file is never written
+                self.assertIsNone(storage.get(State, state.id))
+                self.assertEqual(storage.count(State), 0)
+                storage.use_primary()
+                self.assertEqual(storage.get(State, state.id).name,
+                                 "Primary")
+                storage.delete(storage.get(State, state.id))
+                storage.save()
+                self.assertEqual(storage.count(State), 0)
+                storage.close()
+                self.assertEqual(storage.count(State), 0)
+            finally:
+                storage.close()
+                storage._DBStorage__engine.dispose()
+                for engine in storage._DBStorage__replicas:
+                    engine.dispose()
+
+    def test_query_plans(self):
+        """Test that the lookups and sorts of the app use the indexes"""
+        plans = (
+            ("SELECT * FROM cities WHERE state_id = 'x' ORDER BY name",
+             "ix_cities_state_id_name"),
+            # either composite index starting with city_id
+            ("SELECT * FROM places WHERE city_id = 'x'",
+             "ix_places_city_id_"),
+            ("SELECT * FROM places WHERE user_id = 'x'",
+             "ix_places_user_id"),
+            ("SELECT * FROM reviews WHERE place_id = 'x'",
+             "ix_reviews_place_id_created_at"),
+            ("SELECT * FROM reviews WHERE user_id = 'x'",
+             "ix_reviews_user_id"),
+            ("SELECT * FROM place_amenity WHERE amenity_id = 'x'",
+             "ix_place_amenity_amenity_id"),
+            ("SELECT * FROM users WHERE email = 'x'", "ix_users_email"),
+            ("SELECT * FROM states ORDER BY name", "ix_states_name"),
+            ("SELECT * FROM cities ORDER BY state_id, name",
+             "ix_cities_state_id_name"),
+            ("SELECT * FROM amenities ORDER BY name", "ix_amenities_name"),
+            ("SELECT * FROM places ORDER BY name", "ix_places_name"),
+            ("SELECT * FROM places WHERE latitude BETWEEN 1 AND 2 "
+             "AND longitude BETWEEN 3 AND 4",
+             "ix_places_latitude_longitude"),
+            ("SELECT * FROM places WHERE price_by_night <= 100",
+             "ix_places_price_by_night"),
+            ("SELECT * FROM places WHERE max_guest >= 4",
+             "ix_places_max_guest"),
+            ("SELECT * FROM places WHERE number_rooms >= 2",
+             "ix_places_number_rooms"),
+            ("SELECT * FROM places WHERE number_bathrooms >= 2",
+             "ix_places_number_bathrooms"),
+            ("SELECT * FROM places WHERE city_id = 'x' "
+             "ORDER BY price_by_night, id LIMIT 5",
+             "ix_places_city_id_price_by_night"),
+            ("SELECT * FROM places WHERE city_id = 'x' "
+             "ORDER BY name DESC, id DESC",
+             "ix_places_city_id_name"),
+            ("SELECT * FROM reviews WHERE place_id = 'x' "
+             "ORDER BY created_at DESC, id DESC LIMIT 3",
+             "ix_reviews_place_id_created_at"),
+        )
+        engine = models.storage._DBStorage__engine
+        with engine.connect() as conn:
+            for query, index in plans:
+                plan = " ".join(row[-1] for row in conn.exec_driver_sql(
+                    "EXPLAIN QUERY PLAN " + query))
+                self.assertIn(index, plan, query)
+                self.assertNotIn("TEMP B-TREE", plan, query)
+
+    def test_upgrade_schema(self):
+        """Test that upgrade_schema() adds the missing indexes"""
+        engine = models.storage._DBStorage__engine
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_reviews_user_id")
+        self.assertEqual(models.storage.upgrade_schema(),
+                         ["ix_reviews_user_id"])
+        self.assertEqual(models.storage.upgrade_schema(), [])
+
+    def test_text_index_upgrade(self):
+        """Test that reload() leaves the full-text indexes of the existing
+        tables to upgrade_schema()"""
+        storage = models.storage
+        storage.drop_text_index()
+        storage.close()
+        storage.reload()
+        self.assertEqual(storage.upgrade_schema(),
+                         ["places_fts", "reviews_fts"])
+        self.assertEqual(storage.upgrade_schema(), [])
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+"""
+Contains the TestTextSearchDocs, TestTextIndex and TestStorageSearch
+classes
+"""
+
+import inspect
+import json
+import models
+from models.city import City
+from models.engine import text_search
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+TextIndex = text_search.TextIndex
+
+
+class TestTextSearchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the text search"""
+
+    def test_pep8_conformance_text_search(self):
+        """Test that models/engine/text_search.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/text_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_text_search_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(text_search.__doc__) >= 1)
+        for name, func in inspect.getmembers(text_search,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} function needs a docstring".format(name))
+        self.assertTrue(len(TextIndex.__doc__) >= 1)
+        for name, func in inspect.getmembers(TextIndex, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestTextIndex(unittest.TestCase):
+    """Test the TextIndex class"""
+
+    def test_tokenize(self):
+        """Test that the words are split and lowercased"""
+        self.assertEqual(text_search.tokenize("Cozy loft, near_the Lake!"),
+                         ["cozy", "loft", "near", "the", "lake"])
+        self.assertEqual(text_search.tokenize(None), [])
+        self.assertEqual(text_search.terms("lake Lake loft"),
+                         ["lake", "loft"])
+
+    def test_search(self):
+        """Test that every word must match and the name weighs most"""
+        index = TextIndex()
+        index.add("Place.1", Place(id="1", name="Lake cabin",
+                                   description="quiet"))
+        index.add("Place.2", Place(id="2", name="Loft",
+                                   description="a lake view"))
+        index.add("Place.3", Place(id="3", name="Studio"))
+        index.add("Review.1", Review(place_id="3", text="the lake is near"))
+        scores = index.search(["lake"])
+        self.assertEqual(set(scores), {"1", "2", "3"})
+        self.assertEqual([id for id, score in text_search.rank(scores)],
+                         ["1", "2", "3"])
+        self.assertEqual(set(index.search(["lake", "quiet"])), {"1"})
+        self.assertEqual(index.search(["lake", "nowhere"]), {})
+
+    def test_add_remove(self):
+        """Test that a new version of an object replaces the old one"""
+        index = TextIndex()
+        index.add("Place.1", Place(id="1", name="Lake cabin"))
+        index.add("Place.1", Place(id="1", name="Beach house"))
+        self.assertEqual(index.search(["lake"]), {})
+        self.assertEqual(set(index.search(["beach"])), {"1"})
+        index.remove("Place.1")
+        index.remove("Place.1")
+        self.assertEqual(index.search(["beach"]), {})
+
+
+class TestStorageSearch(unittest.TestCase):
+    """Test search() of the storage"""
+
+    def setUp(self):
+        """creates three places, one of which has a review"""
+        self.user = User(email="search@hbnb.io", password="pwd")
+        self.state = State(name="Searched")
+        self.city = City(name="Town", state_id=self.state.id)
+        self.places = [
+            Place(name="Zebra lake cabin", city_id=self.city.id,
+                  user_id=self.user.id, description="quiet and sunny"),
+            Place(name="Zebra loft", city_id=self.city.id,
+                  user_id=self.user.id, description="a view of the lake"),
+            Place(name="Zebra studio", city_id=self.city.id,
+                  user_id=self.user.id, description="downtown"),
+        ]
+        self.review = Review(text="Lovely lake nearby",
+                             place_id=self.places[2].id,
+                             user_id=self.user.id)
+        models.storage.save_many([self.user, self.state, self.city] +
+                                 self.places + [self.review])
+
+    def tearDown(self):
+        """deletes the objects"""
+        for obj in (self.state, self.user):
+            obj = models.storage.get(type(obj), obj.id)
+            if obj is not None:
+                models.storage.cascade_delete(obj)
+        models.storage.close()
+
+    def ids(self, query):
+        """returns the ids of the places matching query, the best first"""
+        return [place_id for place_id, score in models.storage.search(query)]
+
+    def test_search(self):
+        """Test that the places are ranked and every word must match"""
+        ids = [place.id for place in self.places]
+        found = self.ids("zebra lake")
+        # the words of the name weigh most
+        self.assertEqual(found[0], ids[0])
+        self.assertEqual(sorted(found), sorted(ids))
+        self.assertEqual(self.ids("ZEBRA Quiet"), ids[:1])
+        self.assertEqual(self.ids("zebra nowhere"), [])
+        self.assertEqual(self.ids(""), [])
+
+    def test_changes(self):
+        """Test that the index follows the updates and deletes"""
+        place = models.storage.get(Place, self.places[0].id)
+        place.name = "Zebra beach house"
+        place.save()
+        self.assertEqual(self.ids("zebra beach"), [place.id])
+        self.assertNotIn(place.id, self.ids("zebra cabin"))
+        review = models.storage.get(Review, self.review.id)
+        models.storage.delete(review)
+        models.storage.save()
+        self.assertEqual(self.ids("zebra lake"), [self.places[1].id])
+
+    def test_reload(self):
+        """Test that reload() only reads and indexes again the objects
+        another process changed in the file"""
+        if models.storage_t == 'db':
+            self.skipTest("not testing file storage")
+        cabin, loft = (models.storage.get(Place, place.id)
+                       for place in self.places[:2])
+        models.storage.close()
+        self.assertIs(models.storage.get(Place, cabin.id), cabin)
+        path = models.storage._FileStorage__file_path
+        with open(path) as f:
+            objs = json.load(f)
+        objs["Place." + cabin.id].update(
+            name="Zebra igloo", updated_at="2030-01-01T00:00:00.000000")
+        with open(path, "w") as f:
+            json.dump(objs, f)
+        models.storage.close()
+        self.assertIsNot(models.storage.get(Place, cabin.id), cabin)
+        self.assertIs(models.storage.get(Place, loft.id), loft)
+        self.assertEqual(self.ids("zebra igloo"), [cabin.id])
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Contains the TestWriteBehindDocs and TestWriteBehind classes
+"""
+
+import inspect
+import json
+import models
+from models.engine import write_behind
+from models.engine.file_storage import FileStorage
+from models.state import State
+import os
+import pep8
+import tempfile
+import time
+import unittest
+from unittest import mock
+WriteBehind = write_behind.WriteBehind
+
+
+class TestWriteBehindDocs(unittest.TestCase):
+    """Tests to check the documentation and style of WriteBehind class"""
+
+    def test_pep8_conformance_write_behind(self):
+        """Test that models/engine/write_behind.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/write_behind.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_write_behind_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(write_behind.__doc__) >= 1)
+        self.assertTrue(len(WriteBehind.__doc__) >= 1)
+        for name, func in inspect.getmembers(WriteBehind,
+                                             inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Test the WriteBehind class"""
+
+    def test_flush_on_interval(self):
+        """Test that the thread flushes once the interval elapsed"""
+        flushes = []
+        flusher = WriteBehind(lambda: flushes.append(1), interval=0.05)
+        flusher.mark("a")
+        flusher.mark("b")
+        self.assertEqual(flushes, [])
+        time.sleep(0.3)
+        self.assertEqual(flushes, [1])
+        self.assertEqual(flusher.pending(), 0)
+        flusher.stop()
+
+    def test_flush_on_size(self):
+        """Test that max_dirty keys trigger a flush before the interval"""
+        flushes = []
+        flusher = WriteBehind(lambda: flushes.append(1), interval=60,
+                              max_dirty=3)
+        for key in "abc":
+            flusher.mark(key)
+        time.sleep(0.2)
+        self.assertEqual(flushes, [1])
+        flusher.stop()
+
+    def test_flush_and_stop(self):
+        """Test the synchronous flush and the flush on stop"""
+        flushes = []
+        flusher = WriteBehind(lambda: flushes.append(1), interval=60)
+        flusher.flush()
+        self.assertEqual(flushes, [])
+        flusher.mark("a")
+        self.assertGreaterEqual(flusher.staleness(), 0)
+        flusher.flush()
+        self.assertEqual(flushes, [1])
+        flusher.mark("b")
+        flusher.stop()
+        self.assertEqual(flushes, [1, 1])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Test FileStorage in write-behind mode"""
+
+    def setUp(self):
+        """Use a temporary JSON file"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.json")
+        self.old_path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = self.path
+        with mock.patch.dict(os.environ, {"HBNB_WRITE_BEHIND": "60"}):
+            self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore the JSON file"""
+        self.storage.force_sync()
+        FileStorage._FileStorage__file_path = self.old_path
+        self.tmp.cleanup()
+
+    def test_save_is_deferred(self):
+        """Test that save() leaves the write to flush()"""
+        state = State(name="Texas")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.storage.flush()
+        with open(self.path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.storage.delete(state)
+
+    def test_force_sync(self):
+        """Test that force_sync() flushes and makes save() synchronous"""
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.storage.force_sync()
+        with open(self.path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.storage.delete(state)
+        self.storage.save()
+        with open(self.path) as f:
+            self.assertNotIn("State." + state.id, json.load(f))
+
+    def test_merge(self):
+        """Test that a flush keeps what another process wrote meanwhile"""
+        texas, utah = State(name="Texas"), State(name="Utah")
+        for state in (texas, utah):
+            self.storage.new(state)
+        self.storage.flush()
+        # another process renames texas, deletes utah and adds nevada
+        nevada = State(name="Nevada")
+        with open(self.path) as f:
+            objs = json.load(f)
+        objs["State." + texas.id].update(
+            name="Tejas", updated_at="2030-01-01T00:00:00.000000")
+        del objs["State." + utah.id]
+        objs["State." + nevada.id] = nevada.to_dict()
+        with open(self.path, "w") as f:
+            json.dump(objs, f)
+        ohio = State(name="Ohio")
+        self.storage.new(ohio)
+        self.storage.flush()
+        with open(self.path) as f:
+            objs = json.load(f)
+        self.assertEqual(objs["State." + texas.id]["name"], "Tejas")
+        self.assertNotIn("State." + utah.id, objs)
+        self.assertIn("State." + nevada.id, objs)
+        self.assertIn("State." + ohio.id, objs)
+        self.assertEqual(self.storage.get(State, texas.id).name, "Tejas")
+        self.assertIsNone(self.storage.get(State, utah.id))
+        for state in (texas, nevada, ohio):
+            self.storage.delete(self.storage.get(State, state.id))
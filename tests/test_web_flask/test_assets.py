@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the TestAssetsDocs, TestManifest and TestAssets classes
+"""
+
+from flask import Flask, render_template_string
+import gzip
+import inspect
+import json
+import os
+import pep8
+import tempfile
+import unittest
+from web_flask import assets
+Assets = assets.Assets
+Manifest = assets.Manifest
+
+
+class TestAssetsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the assets"""
+
+    def test_pep8_conformance_assets(self):
+        """Test that web_flask/assets.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['web_flask/assets.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_assets_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(assets.__doc__) >= 1)
+        for cls in (Manifest, Assets):
+            self.assertTrue(len(cls.__doc__) >= 1)
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                self.assertTrue(len(func.__doc__) >= 1,
+                                "{:s} method needs a docstring".format(name))
+
+
+class AssetsTestCase(unittest.TestCase):
+    """creates a static folder with a style sheet and an image"""
+
+    def setUp(self):
+        """writes the files"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = self.tmp.name
+        os.mkdir(os.path.join(self.folder, "styles"))
+        self.write("styles/main.css", b"body { color: red; }" * 10)
+        self.write("logo.png", b"\x89PNG")
+        self.write("tool.py", b"")
+
+    def tearDown(self):
+        """deletes the folder"""
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        """writes data in the file name of the folder"""
+        with open(os.path.join(self.folder, name), "wb") as f:
+            f.write(data)
+
+
+class TestManifest(AssetsTestCase):
+    """Test the Manifest class"""
+
+    def test_names(self):
+        """Test that the names change with the contents only"""
+        names = Manifest(self.folder).names
+        self.assertEqual(sorted(names), ["logo.png", "styles/main.css"])
+        self.assertRegex(names["styles/main.css"],
+                         r"^styles/main\.[0-9a-f]{12}\.css$")
+        self.assertEqual(Manifest(self.folder).names, names)
+        self.write("styles/main.css", b"body { color: blue; }")
+        self.assertNotEqual(Manifest(self.folder).names["styles/main.css"],
+                            names["styles/main.css"])
+
+    def test_write(self):
+        """Test the manifest, copies and gzip variants written"""
+        manifest = Manifest(self.folder)
+        manifest.write()
+        old = manifest.names["styles/main.css"]
+        path = os.path.join(self.folder, old)
+        with open(path + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()),
+                             b"body { color: red; }" * 10)
+        self.assertFalse(os.path.exists(os.path.join(
+            self.folder, manifest.names["logo.png"] + ".gz")))
+        with open(os.path.join(self.folder, "manifest.json")) as f:
+            self.assertEqual(json.load(f), manifest.names)
+        # the copies are not fingerprinted again, the old ones are removed
+        self.write("styles/main.css", b"body { color: blue; }")
+        manifest = Manifest(self.folder)
+        self.assertEqual(len(manifest.names), 2)
+        manifest.write()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(path + ".gz"))
+
+
+class TestAssets(AssetsTestCase):
+    """Test that the fingerprinted files are served cached forever"""
+
+    def setUp(self):
+        """creates an app serving the folder"""
+        super().setUp()
+        self.app = Flask(__name__, static_folder=self.folder,
+                         static_url_path="/static")
+        Assets(self.app)
+        self.client = self.app.test_client()
+        with self.app.test_request_context():
+            self.url = render_template_string(
+                "{{ asset_url('styles/main.css') }}")
+
+    def test_fingerprinted(self):
+        """Test the headers of a fingerprinted file, gzipped or not"""
+        self.assertRegex(self.url, r"^/static/styles/main\.\w{12}\.css$")
+        response = self.client.get(self.url,
+                                   headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.mimetype, "text/css")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+        self.assertEqual(gzip.decompress(response.data),
+                         b"body { color: red; }" * 10)
+        response = self.client.get(self.url)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertIn("max-age=31536000", response.headers["Cache-Control"])
+        self.assertEqual(response.data, b"body { color: red; }" * 10)
+        response.close()
+
+    def test_plain(self):
+        """Test that the other files are served as usual"""
+        response = self.client.get("/static/styles/main.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response.headers["Cache-Control"])
+        response.close()
+        self.assertEqual(self.client.get("/static/missing.css").status_code,
+                         404)
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the TestPageCacheDocs and TestPageCache classes
+"""
+
+from flask import Flask
+import inspect
+import json
+import models
+from models.city import City
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+from web_flask import page_cache
+PageCache = page_cache.PageCache
+
+
+class TestPageCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PageCache"""
+
+    def test_pep8_conformance_page_cache(self):
+        """Test that web_flask/page_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['web_flask/page_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_page_cache_docstrings(self):
+        """Test for the presence of docstrings"""
+        self.assertTrue(len(page_cache.__doc__) >= 1)
+        self.assertTrue(len(PageCache.__doc__) >= 1)
+        for name, func in inspect.getmembers(PageCache, inspect.isfunction):
+            self.assertTrue(len(func.__doc__) >= 1,
+                            "{:s} method needs a docstring".format(name))
+
+
+class TestPageCache(unittest.TestCase):
+    """Test that the pages are cached until the storage changes"""
+
+    def setUp(self):
+        """creates an app listing the states, counting the renders"""
+        self.renders = 0
+        self.app = Flask(__name__)
+        self.cache = PageCache(self.app, ("State",), size=2)
+
+        @self.app.route('/states')
+        @self.app.route('/states/<name>')
+        def states(name=None):
+            """lists the names of the states"""
+            self.renders += 1
+            return ",".join(sorted(state.name for state in
+                                   models.storage.all(State).values()))
+        self.client = self.app.test_client()
+        self.state = State(name="Cached")
+        self.state.save()
+
+    def tearDown(self):
+        """deletes the state"""
+        state = models.storage.get(State, self.state.id)
+        if state is not None:
+            models.storage.delete(state)
+            models.storage.save()
+        models.storage.close()
+
+    def test_hit_and_invalidation(self):
+        """Test that a write of a class of the pages renders them again"""
+        first = self.client.get('/states')
+        self.assertIn(b"Cached", first.data)
+        self.assertEqual(self.client.get('/states').data, first.data)
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(self.cache.hits, 1)
+        city = City(name="Elsewhere", state_id=self.state.id)
+        city.save()
+        models.storage.delete(city)
+        self.client.get('/states')
+        self.assertEqual(self.renders, 1)
+        self.state.name = "Renamed"
+        self.state.save()
+        self.assertIn(b"Renamed", self.client.get('/states').data)
+        self.assertEqual(self.renders, 2)
+
+    def test_conditional(self):
+        """Test that an up to date page gets a 304"""
+        etag = self.client.get('/states').headers['ETag']
+        response = self.client.get('/states',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.state.name = "Changed"
+        self.state.save()
+        response = self.client.get('/states',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_size(self):
+        """Test that the least recently used pages are dropped"""
+        for path in ('/states/a', '/states/b', '/states/a', '/states/c',
+                     '/states/a', '/states/b'):
+            self.client.get(path)
+        self.assertEqual(self.renders, 4)
+
+    def test_hit_close(self):
+        """Test that closing the storage after a hit reads nothing"""
+        if models.storage_t == 'db':
+            self.skipTest("not testing file storage")
+        self.app.teardown_appcontext(lambda error: models.storage.close())
+        self.client.get('/states')
+        with mock.patch('json.load', wraps=json.load) as load:
+            self.client.get('/states')
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(load.call_count, 0)
+
+    def test_other_process(self):
+        """Test that a write of another process renders the pages again"""
+        self.app.teardown_appcontext(lambda error: models.storage.close())
+        self.assertIn(b"Cached", self.client.get('/states').data)
+        if models.storage_t == 'db':
+            engine = models.storage._DBStorage__engine
+            with engine.begin() as conn:
+                conn.exec_driver_sql(
+                    "UPDATE states SET name = 'Outside', updated_at = "
+                    "'2099-01-01 00:00:00' WHERE id = '{}'".format(
+                        self.state.id))
+        else:
+            path = models.storage._FileStorage__file_path
+            with open(path) as f:
+                objects = json.load(f)
+            objects["State." + self.state.id].update(
+                name="Outside", updated_at="2099-01-01T00:00:00.000000")
+            with open(path, "w") as f:
+                json.dump(objects, f)
+        self.assertIn(b"Outside", self.client.get('/states').data)
+        self.assertEqual(self.renders, 2)
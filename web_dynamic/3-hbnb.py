@@ -7,8 +7,11 @@ from models.amenity import Amenity
 from models.place import Place
 from os import environ
 from flask import Flask, render_template
-import uuid
+from web_flask.assets import Assets
+from web_flask.page_cache import PageCache
 app = Flask(__name__)
+Assets(app)
+PageCache(app, ("State", "City", "Amenity", "Place", "User"))
 # Uncomment the following lines to control whitespace behavior in Jinja2 templates
 # app.jinja_env.trim_blocks = True  # Remove whitespace between template blocks
 # app.jinja_env.lstrip_blocks = True  # Strip whitespace from the start of template blocks
@@ -23,24 +26,16 @@ def close_db(error):
 @app.route('/3-hbnb/', strict_slashes=False)
 def hbnb():
     """ HBNB is alive! """
-    states = storage.all(State).values()
-    states = sorted(states, key=lambda k: k.name)
-    st_ct = []
+    st_ct = storage.state_tree()
 
-    for state in states:
-        st_ct.append([state, sorted(state.cities, key=lambda k: k.name)])
+    amenities = storage.ordered(Amenity, 'name')
 
-    amenities = storage.all(Amenity).values()
-    amenities = sorted(amenities, key=lambda k: k.name)
-
-    places = storage.all(Place).values()
-    places = sorted(places, key=lambda k: k.name)
+    places = storage.ordered(Place, 'name')
 
     return render_template('0-hbnb.html',
                            states=st_ct,
                            amenities=amenities,
-                           places=places,
-                           cache_id=uuid.uuid4())
+                           places=places)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,9 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.page_cache import PageCache
 app = Flask(__name__)
+PageCache(app, ("State",))
 
 
 @app.route('/states_list', strict_slashes=False)
@@ -6,17 +6,22 @@ starts a Flask web application
 from flask import Flask, render_template
 from models import *
 from models import storage
+from web_flask.page_cache import PageCache
 app = Flask(__name__)
+PageCache(app, ("State", "City"))
 
 
 @app.route('/states', strict_slashes=False)
 @app.route('/states/<state_id>', strict_slashes=False)
 def states(state_id=None):
     """display the states and cities listed in alphabetical order"""
-    states = storage.all("State")
-    if state_id is not None:
-        state_id = 'State.' + state_id
-    return render_template('9-states.html', states=states, state_id=state_id)
+    states = storage.state_tree()
+    state = cities = None
+    for pair in states:
+        if pair[0].id == state_id:
+            state, cities = pair
+    return render_template('9-states.html', states=states, state_id=state_id,
+                           state=state, cities=cities)
 
 
 @app.teardown_appcontext
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+"""
+Contains the classes Manifest and Assets, fingerprinting static files by
+the hash of their content
+
+usage: python3 -m web_flask.assets [FOLDER ...]
+writes the manifest.json, the fingerprinted copies and their gzip variants
+of the folders (default web_dynamic/static and web_static/styles), for a
+web server serving them directly
+"""
+
+from flask import make_response, request, send_from_directory, url_for
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import sys
+
+FOLDERS = ("web_dynamic/static", "web_static/styles")
+MANIFEST = "manifest.json"
+# the files served compressed, the others are already
+COMPRESSED = (".css", ".js", ".html", ".svg", ".json", ".txt")
+# a fingerprinted file never changes: one year, immutable
+MAX_AGE = 365 * 24 * 3600
+
+
+def fingerprinted(name, digest):
+    """returns the name of the file name with digest before its extension"""
+    root, ext = os.path.splitext(name)
+    return "{}.{}{}".format(root, digest, ext)
+
+
+class Manifest:
+    """the fingerprinted names of the files of a folder: the name of every
+    file (relative to the folder, with /) followed by the first 12 digits
+    of the sha256 of its content before its extension"""
+
+    def __init__(self, folder):
+        """fingerprints the files of folder, except the python files and
+        what write() generated"""
+        self.folder = folder
+        self.names = {}
+        self.files = {}
+        generated = set(self.__load().values())
+        for directory, dirs, filenames in os.walk(folder):
+            dirs.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, folder).replace(os.sep, "/")
+                if (name == MANIFEST or name in generated or
+                        filename.startswith(".") or
+                        filename.endswith((".py", ".pyc", ".gz"))):
+                    continue
+                with open(path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()[:12]
+                self.names[name] = fingerprinted(name, digest)
+                self.files[self.names[name]] = name
+
+    def __load(self):
+        """returns the manifest written in the folder, if any"""
+        try:
+            with open(os.path.join(self.folder, MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def url(self, name):
+        """returns the fingerprinted name of name, or name if it is not a
+        file of the folder"""
+        return self.names.get(name, name)
+
+    def write(self):
+        """writes manifest.json (name -> fingerprinted name), a copy of
+        every file under its fingerprinted name and the gzip variants of the
+        copies of COMPRESSED files, replacing those of older contents"""
+        for name in set(self.__load().values()) - set(self.files):
+            for stale in (name, name + ".gz"):
+                path = os.path.join(self.folder, stale)
+                if os.path.exists(path):
+                    os.remove(path)
+        for versioned, name in self.files.items():
+            with open(os.path.join(self.folder, name), "rb") as f:
+                data = f.read()
+            path = os.path.join(self.folder, versioned)
+            with open(path, "wb") as f:
+                f.write(data)
+            if name.endswith(COMPRESSED):
+                with open(path + ".gz", "wb") as f:
+                    f.write(gzip.compress(data, 9, mtime=0))
+        with open(os.path.join(self.folder, MANIFEST), "w") as f:
+            json.dump(self.names, f, indent=2, sort_keys=True)
+
+
+class Assets:
+    """serves the static folder of a Flask app under fingerprinted URLs
+
+    asset_url('styles/4-common.css') in the templates gives the URL of
+    styles/4-common.<hash>.css, served with far-future immutable cache
+    headers: a new content gets a new URL, so the browsers and proxies
+    never check the files again. The COMPRESSED files are gzipped once,
+    when the app starts, and served so to the clients accepting it. The
+    other URLs of the static folder are served as usual.
+    """
+
+    def __init__(self, app=None):
+        """serves the static folder of app"""
+        self.manifest = None
+        self.__gzipped = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """fingerprints the static folder of app and replaces its static
+        view"""
+        self.manifest = Manifest(app.static_folder)
+        for name in self.manifest.names:
+            if name.endswith(COMPRESSED):
+                with open(os.path.join(app.static_folder, name), "rb") as f:
+                    self.__gzipped[name] = gzip.compress(f.read(), 9)
+        self.__send_static = app.view_functions['static']
+        app.view_functions['static'] = self.__send
+        app.jinja_env.globals['asset_url'] = self.url
+        app.extensions['assets'] = self
+
+    def url(self, name):
+        """returns the fingerprinted URL of the static file name"""
+        return url_for('static', filename=self.manifest.url(name))
+
+    def __send(self, filename):
+        """serves a static file, from memory gzipped if the client accepts
+        it, cached forever if its name is fingerprinted"""
+        name = self.manifest.files.get(filename)
+        if name is None:
+            return self.__send_static(filename=filename)
+        if name in self.__gzipped and 'gzip' in request.accept_encodings:
+            response = make_response(self.__gzipped[name])
+            response.headers['Content-Encoding'] = 'gzip'
+            response.mimetype = mimetypes.guess_type(name)[0]
+        else:
+            response = send_from_directory(self.manifest.folder, name,
+                                           conditional=False)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = \
+            'public, max-age={}, immutable'.format(MAX_AGE)
+        return response
+
+
+if __name__ == "__main__":
+    for folder in sys.argv[1:] or FOLDERS:
+        manifest = Manifest(folder)
+        manifest.write()
+        print("{}: {} files".format(folder, len(manifest.names)))
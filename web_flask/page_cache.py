@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""
+Contains the class PageCache, caching the pages rendered by a Flask app
+"""
+
+from collections import OrderedDict
+from flask import g, make_response, request
+import hashlib
+from models import storage, storage_t
+from os import getenv
+import threading
+import time
+
+
+class PageCache:
+    """caches the HTML pages rendered by the GET routes of a Flask app
+
+    A page is kept under its path and query string with the version of
+    the storage (storage.version()) of the classes it is rendered from,
+    and served again without calling the view until objects of these
+    classes change. Every page has an ETag: a client sending it back in
+    If-None-Match gets a 304 without a body.
+
+    HBNB_PAGE_CACHE is the number of pages kept (default 128, 0 disables
+    the cache), the least recently used dropped first, and
+    HBNB_PAGE_CACHE_MAX_AGE their maximum age in seconds (no limit by
+    default). The writes of the other processes (the API) are seen: the
+    database engines read the version from the database, and FileStorage
+    is reloaded, if its file changed, before the version is read.
+    """
+
+    def __init__(self, app=None, classes=(), size=None, max_age=None):
+        """caches the pages of app rendered from the objects of classes
+        (classes or names, every class if empty)"""
+        if size is None:
+            size = int(getenv('HBNB_PAGE_CACHE', '128'))
+        if max_age is None and getenv('HBNB_PAGE_CACHE_MAX_AGE'):
+            max_age = float(getenv('HBNB_PAGE_CACHE_MAX_AGE'))
+        self.classes = tuple(classes)
+        self.size = size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.__pages = OrderedDict()
+        self.__lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """looks up the pages of app before its views and stores them after"""
+        app.before_request(self.__lookup)
+        app.after_request(self.__store)
+        app.extensions['page_cache'] = self
+
+    def clear(self):
+        """forgets every page"""
+        with self.__lock:
+            self.__pages.clear()
+
+    def __key(self):
+        """returns the key of the page of the request, or None if it is
+        not cached"""
+        if (self.size <= 0 or request.method not in ('GET', 'HEAD') or
+                request.endpoint in (None, 'static')):
+            return None
+        return request.path, request.query_string
+
+    def __lookup(self):
+        """returns the response of the cached page of the request if it is
+        up to date, or None to call the view"""
+        key = self.__key()
+        if key is None:
+            return None
+        if storage_t != 'db':
+            # reads the file only if another process wrote it since the
+            # end of the previous request
+            storage.reload()
+        version = storage.version(*self.classes)
+        with self.__lock:
+            page = self.__pages.get(key)
+            if page is not None and (page[0] != version or (
+                    self.max_age is not None and
+                    time.monotonic() - page[3] > self.max_age)):
+                del self.__pages[key]
+                page = None
+            if page is None:
+                self.misses += 1
+                g.page_cache_version = version
+                return None
+            self.__pages.move_to_end(key)
+            self.hits += 1
+        g.page_cache_hit = True
+        response = make_response(page[2])
+        response.set_etag(page[1])
+        return response
+
+    def __store(self, response):
+        """stores the page rendered by the view, then answers the
+        conditional requests"""
+        version = g.pop('page_cache_version', None)
+        if not g.pop('page_cache_hit', False):
+            if (version is None or response.status_code != 200 or
+                    response.mimetype != 'text/html' or
+                    response.direct_passthrough):
+                return response
+            self.__put(version, response)
+        # the browsers check that the page is still up to date
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def __put(self, version, response):
+        """stores the page of response, rendered from the storage at
+        version, and gives it its ETag"""
+        key = self.__key()
+        body = response.get_data()
+        etag = hashlib.sha1(body).hexdigest()
+        response.set_etag(etag)
+        with self.__lock:
+            self.__pages[key] = (version, etag, body, time.monotonic())
+            self.__pages.move_to_end(key)
+            while len(self.__pages) > self.size:
+                self.__pages.popitem(last=False)